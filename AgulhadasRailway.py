@@ -1,12 +1,27 @@
 ﻿# Arquivo - Agulhadas.py
 # Faz leitura do Grupo CopiaAgulhadas / processamento / Abre ordens na Binance
 
-import re
+import time
 import asyncio
 from telethon import events
-from config import telegram_client, SOURCE_CHAT_ID, TARGET_CHAT_ID, FILTER_SYMBOLS, ALLOWED_SYMBOLS
+from config import telegram_client, SOURCE_CHAT_ID, TARGET_CHAT_ID, FILTER_SYMBOLS, ALLOWED_SYMBOLS, METRICS_PORT, DEDUPE_TTL, DEDUPE_MAX
 from executorwebsocket import *
+from parser_sinais import interpretar_sinal
+from dedupe_sinais import CacheDedupe, chaves_mensagem
+from gerenciador_streams import GerenciadorStreams
+from cache_mark_price import registrar_stream_mark_price
+from klines_store import registrar_store_klines, aquecer_store
+from filtros_symbol import carregar_filtros, iniciar_refresh_filtros
+from livro_ordens import sincronizar_livro, iniciar_reconciliacao_livro
+from alavancagem import prewarm_config_symbols
+from executor_async import executar_ordem_async, obter_async_client, fechar_async_client
 from structured_logger import log_event
+from tracing import iniciar_trace, finalizar, iniciar_relatorio_latencias
+from metricas import sinais_recebidos, sinais_ignorados, dedupe_mensagens, iniciar_servidor_metricas
+
+# repost / forward / reentrega: descartados antes do parse
+dedupe = CacheDedupe(DEDUPE_MAX, DEDUPE_TTL)
+dedupe_mensagens.definir_coleta(lambda: {("hit",): dedupe.hits, ("miss",): dedupe.misses})
 
 # -------------------------------------------------
 # ESCUTAR MENSAGENS
@@ -14,6 +29,7 @@ from structured_logger import log_event
 def registrar_listener():
     @telegram_client.on(events.NewMessage(chats=SOURCE_CHAT_ID))
     async def forward_message(event):
+        recebido = time.monotonic()
         try:
             # 1️⃣ Validação mínima
             if not event.message or not event.message.text:
@@ -22,10 +38,22 @@ def registrar_listener():
 
             text = event.message.text
 
-            # 2️⃣ INTERPRETAÇÃO DE SINAL
-            sinal = interpretar_mensagem(text)
+            # 🔁 Duplicatas (mesmo id ou mesmo conteúdo dentro do TTL)
+            if dedupe.duplicada(chaves_mensagem(event.chat_id, event.message.id, text)):
+                print("[SKIP] Mensagem duplicada")
+                return
 
-            if sinal:
+            # 2️⃣ INTERPRETAÇÃO DE SINAL
+            trace = iniciar_trace(inicio=recebido)
+            # uma passada: sinal de execução + registro de log/encaminhamento
+            with trace.span("parse"):
+                sinal, parsed = interpretar_sinal(text)
+
+            if not sinal:
+                finalizar(trace)
+            else:
+                sinal["signal_id"] = trace.signal_id
+                sinais_recebidos.inc(sinal["timeframe"])
                 # =========================
                 # 7. LOG
                 # =========================
@@ -36,22 +64,28 @@ def registrar_listener():
                     order_type=sinal["order_type"],
                     timeframe=sinal["timeframe"],
                     price=sinal["price"],
-                    raw_message=text
+                    raw_message=text,
+                    signal_id=trace.signal_id
                         )
                 symbol = sinal["symbol"].upper()
 
                 print(f"[SIGN] {symbol} {sinal['side']} {sinal['order_type']} {sinal['timeframe']}")
 
                 # 3️⃣ FILTRO DE MOEDAS (para execução)
-                if FILTER_SYMBOLS and symbol not in ALLOWED_SYMBOLS:
+                with trace.span("filtro"):
+                    permitido = not FILTER_SYMBOLS or symbol in ALLOWED_SYMBOLS
+
+                if not permitido:
                     print(f"[SKIP] Moeda fora da lista: {symbol}")
                     print("============================================================================================")
+                    sinais_ignorados.inc("moeda_filtrada")
+                    finalizar(trace)
                 else:
-                    await asyncio.to_thread(executar_ordem, sinal)
+                    await executar_ordem_async(sinal)
 
             # 4️⃣ PARSE PADRÃO (LOG / FORWARD)
-            parsed = parse_signal_message(text)
             if not parsed:
+                print("[SKIP] Mensagem fora do padrão")
                 return
 
             # 5️⃣ ENCAMINHAMENTO TELEGRAM
@@ -65,136 +99,6 @@ def registrar_listener():
 
 
 
-# -------------------------------------------------
-# INTERPRETADOR DE MENSAGENS
-# -------------------------------------------------
-def interpretar_mensagem(texto):
-    texto_lower = texto.lower()
-
-    # =========================
-    # 1. Corretora
-    # =========================
-    if texto.startswith("BINANCE:"):
-        exchange = "BINANCE"
-    else:
-        return None  # ignorar MEXC E BYBIT
-
-    # =========================
-    # 2. Símbolo
-    # =========================
-    match_symbol = re.search(r'BINANCE:([A-Z0-9]+)', texto)
-    if not match_symbol:
-        return None
-
-    symbol = match_symbol.group(1)
-
-    # =========================
-    # 3. Preço
-    # =========================
-    match_price = re.search(r'Preço:\s*([^\n]+)', texto)
-    if not match_price:
-        return None
-
-    raw_price = match_price.group(1)
-
-    price_match = re.search(r'\d+(?:\.\d+)?', raw_price)
-    if not price_match:
-        return None
-
-    price = float(price_match.group())
-
-    # =========================
-    # 4. Timeframe
-    # =========================
-    if "15 minutos" in texto_lower:
-        timeframe = "15m"
-        order_type = "MARKET"
-    elif "60 minutos" in texto_lower or "1h" in texto_lower:
-        timeframe = "1h"
-        order_type = "MARKET"
-    elif "4h" in texto_lower:
-        timeframe = "4h"
-        order_type = "LIMIT"
-    else:
-        return None
-
-    # =========================
-    # 5. Tipo de sinal
-    # =========================
-    if "alerta de compra" in texto_lower:
-        side = "LONG"
-
-    elif "agulhada de compra" in texto_lower:
-        side = "LONG"
-        order_type = "LIMIT"
-
-    elif "agulhada santa de compra" in texto_lower:
-        side = "LONG"
-
-    elif "alerta de venda" in texto_lower:
-        side = "SHORT"
-
-    elif "agulhada de venda" in texto_lower:
-        side = "SHORT"
-        order_type = "LIMIT"
-
-    elif "agulhada santa de venda" in texto_lower:
-        side = "SHORT"
-
-    else:
-        return None
-
-    # =========================
-    # 6. Retorno padronizado
-    # =========================
-    return {
-        "exchange": exchange,
-        "symbol": symbol,
-        "side": side,
-        "order_type": order_type,
-        "timeframe": timeframe,
-        "price": price
-    }
-
-# -------------------------------------------------
-# Extrai dados estruturados da mensagem
-# -------------------------------------------------
-def parse_signal_message(text: str):
-    text = text.strip().replace("\r", "")
-
-    pattern = re.compile(
-        r'(?P<exchange>\w+):(?P<symbol>[\w\.]+)\s+deu\s+'
-        r'(?P<signal>.+?)\s+'
-        r'(?:nos?|nas?)\s+'
-        r'(?P<timeframe>\d+\s*(?:minutos?|H))'
-        r'.*?\n+'
-        r'Preço:\s*(?P<price>.+)',
-        re.IGNORECASE | re.DOTALL
-    )
-
-    match = pattern.search(text)
-    if not match:
-        print("[SKIP] Mensagem fora do padrão")
-        return None
-
-    raw_price = match.group("price")
-
-    price_match = re.search(r"\d+(?:\.\d+)?", raw_price)
-    if not price_match:
-        print(f"[SKIP] Preço inválido: {raw_price}")
-        return None
-
-    price = float(price_match.group())
-
-
-    return {
-        "exchange": match.group("exchange").upper(),
-        "symbol": match.group("symbol").replace(".P", "").upper(),
-        "signal": match.group("signal").lower(),
-        "timeframe": match.group("timeframe").lower().replace(" ", ""),
-        "price": price
-    }
-
 # -------------------------------------------------
 # Execução principal (main)
 # -------------------------------------------------
@@ -202,8 +106,13 @@ async def main():
     print("🔄 Iniciando BOT Agulhadas...")
     registrar_listener()
     await telegram_client.start()
+    if USE_BINANCE:
+        await obter_async_client()
     print("✅ Bot conectado e aguardando mensagens do Grupo CopiaAgulhada...")
-    await telegram_client.run_until_disconnected()
+    try:
+        await telegram_client.run_until_disconnected()
+    finally:
+        await fechar_async_client()
 
 # -------------------------------------------------
 # Bootstrap
@@ -211,8 +120,25 @@ async def main():
 if __name__ == "__main__":
     try:
         if USE_BINANCE:
-            sincronizar_estado_inicial()
-            iniciar_listener_ws()
+            carregar_filtros()
+            iniciar_refresh_filtros()
+            # warm restart: journal + delta; sem estado salvo, sincronização completa
+            if not restaurar_estado():
+                sincronizar_estado_inicial()
+                sincronizar_livro()
+            iniciar_reconciliacao_livro()
+            prewarm_config_symbols(ALLOWED_SYMBOLS)
+
+            # um único loop asyncio para user data + mark price + klines
+            streams = GerenciadorStreams()
+            registrar_stream_mark_price(streams)
+            registrar_store_klines(streams, ALLOWED_SYMBOLS, TF_MAP)
+            iniciar_listener_ws(streams)
+            streams.iniciar()
+            aquecer_store(ALLOWED_SYMBOLS, TF_MAP)
+            iniciar_relatorio_latencias()
+            if METRICS_PORT:
+                iniciar_servidor_metricas(METRICS_PORT)
             time.sleep(3)
         else:
             print("🟡 Binance desligada — executor não iniciado")
@@ -0,0 +1,106 @@
+﻿# Arquivo - alavancagem.py
+# Memoriza a alavancagem e o tipo de margem já aplicados em cada moeda.
+# Semeado no startup com futures_symbol_config (GET /fapi/v1/symbolConfig: alavancagem e margem de
+# todas as moedas, com ou sem posição) e pré-aquecido em paralelo para ALLOWED_SYMBOLS.
+# No caminho da ordem só chama futures_change_leverage / futures_change_margin_type se a config mudou.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import binance_client, LEVERAGE, MARGIN_TYPE
+
+ERRO_MARGEM_SEM_MUDANCA = -4046   # "No need to change margin type."
+
+MARGENS = {"cross": "CROSSED", "isolated": "ISOLATED"}
+
+# ==========================================================
+# 📦 CACHE symbol -> {"leverage": int, "margin": str}
+# ==========================================================
+_aplicado = {}
+_lock = threading.Lock()
+
+
+def config_aplicada(symbol):
+    with _lock:
+        return dict(_aplicado.get(symbol, {}))
+
+
+def config_em_dia(symbol):
+    return config_aplicada(symbol) == {"leverage": LEVERAGE, "margin": MARGIN_TYPE}
+
+
+def marcar_config(symbol, **valores):
+    with _lock:
+        _aplicado.setdefault(symbol, {}).update(valores)
+
+
+def semear_config_symbols():
+    """
+    Lê alavancagem/margem atuais de todas as moedas (uma chamada).
+    O positionRisk v3 não traz leverage / marginType e só lista posições abertas.
+    """
+    configs = binance_client.futures_symbol_config()
+
+    for c in configs:
+        valores = {}
+        if c.get("leverage"):
+            valores["leverage"] = int(c["leverage"])
+        if c.get("marginType"):
+            valores["margin"] = MARGENS.get(c["marginType"].lower(), c["marginType"].upper())
+        if valores:
+            marcar_config(c["symbol"], **valores)
+
+# ==========================================================
+# ⚙ APLICAR (somente se diferente)
+# ==========================================================
+def aplicar_margin_type(symbol):
+    try:
+        binance_client.futures_change_margin_type(symbol=symbol, marginType=MARGIN_TYPE)
+    except Exception as e:
+        if getattr(e, "code", None) != ERRO_MARGEM_SEM_MUDANCA:
+            print(f"[ERRO] Margem {symbol}: {e}")
+            return
+    marcar_config(symbol, margin=MARGIN_TYPE)
+
+
+def aplicar_leverage(symbol):
+    try:
+        binance_client.futures_change_leverage(symbol=symbol, leverage=LEVERAGE)
+    except Exception as e:
+        print(f"[ERRO] Alavancagem {symbol}: {e}")
+        return
+    marcar_config(symbol, leverage=LEVERAGE)
+
+
+def garantir_config_symbol(symbol):
+    """
+    Hot path: zero chamadas REST quando a moeda já está com LEVERAGE / MARGIN_TYPE.
+    """
+    atual = config_aplicada(symbol)
+
+    if atual.get("margin") != MARGIN_TYPE:
+        aplicar_margin_type(symbol)
+
+    if atual.get("leverage") != LEVERAGE:
+        aplicar_leverage(symbol)
+
+# ==========================================================
+# 🔥 PRÉ-AQUECIMENTO
+# ==========================================================
+def prewarm_config_symbols(symbols, workers=8):
+    try:
+        semear_config_symbols()
+    except Exception as e:
+        print(f"[ERRO] Semear alavancagem: {e}")
+
+    pendentes = [s for s in symbols if not config_em_dia(s)]
+
+    def _garantir(symbol):
+        try:
+            garantir_config_symbol(symbol)
+        except Exception as e:
+            print(f"[ERRO] Prewarm {symbol}: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_garantir, pendentes))
+
+    print(f"[ALAVANCAGEM] {len(symbols)} moedas verificadas, {len(pendentes)} ajustadas")
@@ -1,5 +1,4 @@
-﻿import re
-import asyncio
+﻿import asyncio
 import requests
 from telethon import events
 from config_web import (
@@ -9,63 +8,11 @@ from config_web import (
     EXECUTOR_URL,
     EXECUTOR_TOKEN
 )
+from parser_sinais import interpretar_mensagem
+from dedupe_sinais import CacheDedupe, chaves_mensagem
 
-# -------------------------------------------------
-# INTERPRETADOR DE MENSAGEM
-# -------------------------------------------------
-def interpretar_mensagem(texto):
-
-    texto_lower = texto.lower()
-
-    if not texto.startswith("BINANCE:"):
-        return None
-
-    match_symbol = re.search(r'BINANCE:([A-Z0-9]+)', texto)
-    if not match_symbol:
-        return None
-
-    symbol = match_symbol.group(1)
-
-    match_price = re.search(r'Preço:\s*([^\n]+)', texto)
-    if not match_price:
-        return None
-
-    raw_price = match_price.group(1)
-    price_match = re.search(r'\d+(?:\.\d+)?', raw_price)
-    if not price_match:
-        return None
-
-    price = float(price_match.group())
-
-    # Timeframe
-    if "15 minutos" in texto_lower:
-        timeframe = "15m"
-        order_type = "MARKET"
-    elif "60 minutos" in texto_lower or "1h" in texto_lower:
-        timeframe = "1h"
-        order_type = "MARKET"
-    elif "4h" in texto_lower:
-        timeframe = "4h"
-        order_type = "LIMIT"
-    else:
-        return None
-
-    # Side
-    if "compra" in texto_lower:
-        side = "LONG"
-    elif "venda" in texto_lower:
-        side = "SHORT"
-    else:
-        return None
-
-    return {
-        "exchange": "BINANCE",
-        "symbol": symbol,
-        "side": side,
-        "order_type": order_type,
-        "timeframe": timeframe,
-        "price": price
-    }
+# repost / forward / reentrega: descartados antes do parse
+dedupe = CacheDedupe()
 
 # -------------------------------------------------
 # ENVIAR PARA EXECUTOR LOCAL
@@ -98,6 +45,10 @@ def registrar_listener():
 
         texto = event.message.text
 
+        if dedupe.duplicada(chaves_mensagem(event.chat_id, event.message.id, texto)):
+            print("[SKIP] Mensagem duplicada")
+            return
+
         sinal = interpretar_mensagem(texto)
 
         if not sinal:
@@ -0,0 +1,212 @@
+﻿# Arquivo - backfill_sinais.py
+# Backfill do histórico do grupo de sinais: pagina telegram_client.iter_messages(SOURCE_CHAT_ID)
+# num intervalo de datas (do mais antigo para o mais novo), interpreta os textos num pool de
+# processos (parser_sinais) e grava um dataset colunar em partes .npz.
+# - memória limitada: lotes de --lote mensagens, no máximo 2 lotes por worker em voo
+# - retomável: estado.json guarda o último message id gravado; rodar de novo continua dali
+# - duplicatas (repost) ficam no dataset: o backtest aplica o mesmo candle_id do executor
+#
+# Colunas (uma linha por sinal de execução):
+#   ts (int64, ms UTC da mensagem)  message_id (int64)  symbol (U20)  side (int8: 1 LONG / -1 SHORT)
+#   limit (bool: LIMIT / MARKET)  timeframe (U3: 15m / 1h / 4h)  price (float64)
+#
+# Uso:
+#   python backfill_sinais.py --desde 2025-01-01 --ate 2026-01-01
+#   python backfill_sinais.py --saida dados/sinais --workers 8 --lote 5000
+#   python backfill_sinais.py --reiniciar                 # ignora o estado e recomeça
+
+import os
+import glob
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from parser_sinais import interpretar_mensagem
+
+SAIDA_PADRAO = os.path.join("dados", "sinais")
+LOTE_PADRAO = 2000
+
+COLUNAS = {
+    "ts": np.int64,
+    "message_id": np.int64,
+    "symbol": "U20",
+    "side": np.int8,
+    "limit": np.bool_,
+    "timeframe": "U3",
+    "price": np.float64,
+}
+
+# ==========================================================
+# 🧮 PARSE (processos do pool)
+# ==========================================================
+def parsear_lote(lote):
+    """
+    [(message_id, ts_ms, texto)] -> colunas numpy só com os sinais de execução.
+    """
+    linhas = {nome: [] for nome in COLUNAS}
+    for message_id, ts, texto in lote:
+        sinal = interpretar_mensagem(texto)
+        if not sinal:
+            continue
+        linhas["ts"].append(ts)
+        linhas["message_id"].append(message_id)
+        linhas["symbol"].append(sinal["symbol"])
+        linhas["side"].append(1 if sinal["side"] == "LONG" else -1)
+        linhas["limit"].append(sinal["order_type"] == "LIMIT")
+        linhas["timeframe"].append(sinal["timeframe"])
+        linhas["price"].append(sinal["price"])
+
+    return {nome: np.array(linhas[nome], dtype=tipo) for nome, tipo in COLUNAS.items()}
+
+# ==========================================================
+# 💾 PARTES / ESTADO
+# ==========================================================
+def _estado_vazio():
+    return {"ultimo_id": 0, "partes": 0, "mensagens": 0, "sinais": 0}
+
+
+def carregar_estado(pasta):
+    caminho = os.path.join(pasta, "estado.json")
+    if not os.path.exists(caminho):
+        return _estado_vazio()
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_atomico(caminho, escrever):
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        escrever(f)
+    os.replace(tmp, caminho)
+
+
+def salvar_estado(pasta, estado):
+    _gravar_atomico(os.path.join(pasta, "estado.json"), lambda f: f.write(json.dumps(estado).encode()))
+
+
+def gravar_parte(pasta, numero, colunas):
+    # parte antes do estado: um kill entre os dois só regrava a mesma parte no resume
+    caminho = os.path.join(pasta, f"parte_{numero:06d}.npz")
+    _gravar_atomico(caminho, lambda f: np.savez_compressed(f, **colunas))
+    return caminho
+
+
+def carregar_dataset(pasta=SAIDA_PADRAO):
+    """
+    Concatena as partes -> {coluna: array}, ordenado por ts.
+    """
+    partes = sorted(glob.glob(os.path.join(pasta, "parte_*.npz")))
+    if not partes:
+        return {nome: np.array([], dtype=tipo) for nome, tipo in COLUNAS.items()}
+
+    blocos = {nome: [] for nome in COLUNAS}
+    for caminho in partes:
+        with np.load(caminho) as parte:
+            for nome in COLUNAS:
+                blocos[nome].append(parte[nome])
+
+    dataset = {nome: np.concatenate(blocos[nome]) for nome in COLUNAS}
+    ordem = np.argsort(dataset["ts"], kind="stable")
+    return {nome: coluna[ordem] for nome, coluna in dataset.items()}
+
+# ==========================================================
+# 📥 BACKFILL
+# ==========================================================
+def _data(texto):
+    return datetime.strptime(texto, "%Y-%m-%d").replace(tzinfo=timezone.utc) if texto else None
+
+
+async def _gravar_proximo(em_voo, pasta, estado, inicio):
+    ultimo_id, n, futuro = em_voo.popleft()
+    colunas = await futuro
+    sinais = len(colunas["ts"])
+
+    if sinais:
+        gravar_parte(pasta, estado["partes"], colunas)
+        estado["partes"] += 1
+
+    estado["ultimo_id"] = ultimo_id
+    estado["mensagens"] += n
+    estado["sinais"] += sinais
+    salvar_estado(pasta, estado)
+
+    decorrido = time.monotonic() - inicio
+    print(
+        f"[BACKFILL] até id {ultimo_id} | {estado['mensagens']} mensagens | {estado['sinais']} sinais | "
+        f"{estado['partes']} partes | {estado['mensagens'] / max(decorrido, 1e-9):,.0f} msgs/s"
+    )
+
+
+async def backfill(args):
+    # config só no processo principal (os workers do pool importam apenas o parser)
+    from config import telegram_client, SOURCE_CHAT_ID
+
+    os.makedirs(args.saida, exist_ok=True)
+    if args.reiniciar:
+        for caminho in glob.glob(os.path.join(args.saida, "parte_*.npz")):
+            os.remove(caminho)
+    estado = _estado_vazio() if args.reiniciar else carregar_estado(args.saida)
+    desde, ate = _data(args.desde), _data(args.ate)
+    chat = args.chat or SOURCE_CHAT_ID
+
+    if estado["ultimo_id"]:
+        print(f"[BACKFILL] Retomando após message id {estado['ultimo_id']} ({estado['partes']} partes gravadas)")
+
+    await telegram_client.start()
+    loop = asyncio.get_running_loop()
+    max_em_voo = 2 * args.workers
+    em_voo = deque()
+    lote = []
+    inicio = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        mensagens = telegram_client.iter_messages(
+            chat,
+            reverse=True,                 # mais antigo -> mais novo: o último id gravado é o ponto de retomada
+            offset_date=desde,
+            min_id=estado["ultimo_id"],
+        )
+        async for msg in mensagens:
+            if ate and msg.date >= ate:
+                break
+            if not msg.text:
+                continue
+
+            lote.append((msg.id, int(msg.date.timestamp() * 1000), msg.text))
+            if len(lote) >= args.lote:
+                em_voo.append((lote[-1][0], len(lote), loop.run_in_executor(pool, parsear_lote, lote)))
+                lote = []
+                if len(em_voo) >= max_em_voo:
+                    await _gravar_proximo(em_voo, args.saida, estado, inicio)
+
+        if lote:
+            em_voo.append((lote[-1][0], len(lote), loop.run_in_executor(pool, parsear_lote, lote)))
+        while em_voo:
+            await _gravar_proximo(em_voo, args.saida, estado, inicio)
+
+    await telegram_client.disconnect()
+    print(f"✅ Backfill concluído: {estado['sinais']} sinais em {estado['partes']} partes ({args.saida})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill do histórico de sinais do Telegram para dataset .npz")
+    parser.add_argument("--desde", help="data inicial (YYYY-MM-DD, UTC); vazio = início do chat")
+    parser.add_argument("--ate", help="data final exclusiva (YYYY-MM-DD, UTC); vazio = agora")
+    parser.add_argument("--chat", type=int, help="chat de origem (padrão: SOURCE_CHAT_ID)")
+    parser.add_argument("--saida", default=SAIDA_PADRAO)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO, help="mensagens por tarefa do pool")
+    parser.add_argument("--reiniciar", action="store_true", help="ignora estado.json e recomeça")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+﻿# Arquivo - backtest.py
+# Backtest da estratégia do executor sobre o histórico de sinais (backfill_sinais.py) e klines 1m locais.
+# Regras reproduzidas do executorwebsocket:
+# - FILTER_SYMBOLS / ALLOWED_SYMBOLS, candle_id (um sinal por symbol/side/timeframe por vela)
+# - posição ou ordem de entrada ativa no symbol/side bloqueia; MAX_POSICOES_ABERTAS / MAX_LONGS / MAX_SHORTS
+#   contam posições + ordens LIMIT pendentes (exposicao_posicoes + exposicao_ordens)
+# - mark price > MAX_PRECO_PERMITIDO -> sinal ignorado (sem marcar a vela)
+# - preço = calcular_mm8 (7 velas fechadas + vela em andamento), qty = MAX_USDT * LEVERAGE / mm8 (step do symbol)
+# - MARKET executa na hora; LIMIT na MM8 (GTC) quando o preço cruza, ou na hora se já estiver a mercado
+# - enviar_tp_parcial: TP1 (TP_PARCIAL_QTY em +TP_PARCIAL_PERCENT) e TP2 (restante em 2x)
+# - enviar_protecao_pos_parcial: stop no lucro (montar_stop_lucro) + trailing (montar_trailing_stop)
+# Cada trade é resolvido com operações numpy sobre o caminho de preços (sem loop por vela);
+# o loop em Python é só por sinal, para a exposição compartilhada.
+#
+# Aproximações:
+# - o executor manda stop + trailing no evento PARTIALLY_FILLED; aqui eles entram quando o TP1 executa
+# - não há stop antes do TP1: a perda máxima é a liquidação (margem isolada: 1/LEVERAGE - manutenção)
+# - dentro de uma vela de 1m o movimento adverso vem primeiro; a ação do sinal é na abertura da vela seguinte
+# - trades / ordens ainda ativos no fim do horizonte (ou dos dados) fecham no último close
+#
+# Klines: dados/klines/<SYMBOL>.npy, float64 (5, n) = open_time (ms), open, high, low, close; lido via mmap.
+#
+# Uso:
+#   python backtest.py --baixar --desde 2025-01-01 --ate 2026-01-01          # klines 1m das ALLOWED_SYMBOLS
+#   python backtest.py                                                       # parâmetros do config_estrategia / .env
+#   python backtest.py --leverage 25 --tp-parcial-percent 0.8 --trades trades.csv
+
+import os
+import csv
+import json
+import time
+import heapq
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+from config_estrategia import ALLOWED_SYMBOLS, SYMBOL_FILTERS, PARAMETROS, parametros_atuais
+from symbol_spec import SymbolSpec
+from backfill_sinais import carregar_dataset, SAIDA_PADRAO as PASTA_SINAIS
+
+PASTA_KLINES = os.path.join("dados", "klines")
+ARQUIVO_FILTROS = os.path.join("cache", "exchange_info.json")   # cache do filtros_symbol
+
+MINUTO_MS = 60_000
+TF_MS = {"15m": 15 * MINUTO_MS, "1h": 60 * MINUTO_MS, "4h": 240 * MINUTO_MS}
+MM_PERIODO = 8             # igual ao klines_store
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE = range(5)
+
+TAXA_MAKER = 0.0002
+TAXA_TAKER = 0.0005
+MARGEM_MANUTENCAO = 0.005
+HORIZONTE_DIAS = 30        # caminho de preço avaliado por sinal (ordem pendente + posição)
+
+# montar_stop_lucro
+STOP_LUCRO = 0.002
+STOP_FOLGA_MARK = 0.001
+
+# ==========================================================
+# 📥 KLINES LOCAIS
+# ==========================================================
+def baixar_klines(symbol, desde_ms, ate_ms, pasta=PASTA_KLINES):
+    """
+    futures_klines 1m paginado (endpoint público) -> <pasta>/<SYMBOL>.npy.
+    """
+    from binance.client import Client
+
+    client = Client()
+    dados = np.empty((5, max(0, (ate_ms - desde_ms) // MINUTO_MS)), dtype=np.float64)
+    n = 0
+    inicio = desde_ms
+
+    while inicio < ate_ms and n < dados.shape[1]:
+        lote = client.futures_klines(
+            symbol=symbol,
+            interval=Client.KLINE_INTERVAL_1MINUTE,
+            startTime=inicio,
+            endTime=ate_ms - 1,
+            limit=1500
+        )
+        if not lote:
+            break
+        lote = lote[:dados.shape[1] - n]
+        dados[:, n:n + len(lote)] = np.array([k[:5] for k in lote], dtype=np.float64).T
+        n += len(lote)
+        inicio = int(lote[-1][0]) + MINUTO_MS
+
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"{symbol}.npy")
+    with open(caminho + ".tmp", "wb") as f:
+        np.save(f, np.ascontiguousarray(dados[:, :n]))
+    os.replace(caminho + ".tmp", caminho)
+    return n
+
+
+def carregar_klines(symbols, pasta=PASTA_KLINES):
+    """
+    {symbol: array (5, n)} em mmap: o SO compartilha as páginas entre processos.
+    """
+    klines = {}
+    for symbol in symbols:
+        caminho = os.path.join(pasta, f"{symbol}.npy")
+        if os.path.exists(caminho):
+            klines[symbol] = np.load(caminho, mmap_mode="r")
+    return klines
+
+
+def carregar_specs(symbols, arquivo_filtros=ARQUIVO_FILTROS):
+    """
+    SymbolSpec por moeda: cache do exchange info (filtros_symbol) e fallback SYMBOL_FILTERS.
+    """
+    indice = {}
+    try:
+        with open(arquivo_filtros, "r", encoding="utf-8") as f:
+            indice = json.load(f)["filtros"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    specs = {}
+    for symbol in symbols:
+        if symbol in indice:
+            specs[symbol] = SymbolSpec(symbol, indice[symbol]["tick"], indice[symbol]["step"])
+        elif symbol in SYMBOL_FILTERS:
+            f = SYMBOL_FILTERS[symbol]
+            specs[symbol] = SymbolSpec(symbol, f["TICK_SIZE"], f["STEP_SIZE"])
+    return specs
+
+# ==========================================================
+# 🧮 PREPARO DOS SINAIS (independe dos parâmetros)
+# ==========================================================
+def _mm8(k, barra, preco, tf_ms):
+    """
+    calcular_mm8 vetorizado: 7 velas fechadas do timeframe + a vela em andamento (preço atual).
+    """
+    vela_por_barra = k[OPEN_TIME] // tf_ms
+    ultima_barra = np.append(np.flatnonzero(np.diff(vela_por_barra)), len(vela_por_barra) - 1)
+    velas = vela_por_barra[ultima_barra]
+    soma = np.concatenate(([0.0], np.cumsum(k[CLOSE][ultima_barra])))
+
+    fechadas = np.searchsorted(velas, k[OPEN_TIME][barra] // tf_ms, side="left")
+    ok = fechadas >= MM_PERIODO - 1
+    j = np.where(ok, fechadas, MM_PERIODO - 1)
+    mm8 = (soma[j] - soma[j - (MM_PERIODO - 1)] + preco) / MM_PERIODO
+    return np.where(ok, mm8, np.nan)
+
+
+def preparar_sinais(dataset, klines, specs, filtrar_symbols=True):
+    """
+    Sinais com barra de ação, preço (mark) e MM8 já calculados, em ordem de ts.
+    Descartes que não dependem dos parâmetros vão para "ignorados".
+    """
+    ignorados = Counter()
+    blocos = []
+
+    for symbol in np.unique(dataset["symbol"]):
+        sel = np.flatnonzero(dataset["symbol"] == symbol)
+        if filtrar_symbols and symbol not in ALLOWED_SYMBOLS:
+            ignorados["moeda_filtrada"] += len(sel)
+            continue
+        if symbol not in klines or symbol not in specs:
+            ignorados["sem_klines" if symbol not in klines else "sem_filtros"] += len(sel)
+            continue
+
+        k = klines[symbol]
+        ts = dataset["ts"][sel]
+
+        # ação na abertura da vela de 1m seguinte ao sinal
+        barra = np.searchsorted(k[OPEN_TIME], ts, side="right")
+        dentro = (barra < k.shape[1]) & (barra > 0)
+        dentro[dentro] &= k[OPEN_TIME][barra[dentro]] - ts[dentro] <= MINUTO_MS
+        ignorados["sem_klines"] += int((~dentro).sum())
+        sel, ts, barra = sel[dentro], ts[dentro], barra[dentro]
+        preco = k[OPEN][barra]
+
+        mm8 = np.full(len(sel), np.nan)
+        for tf, tf_ms in TF_MS.items():
+            m = dataset["timeframe"][sel] == tf
+            if m.any():
+                mm8[m] = _mm8(k, barra[m], preco[m], tf_ms)
+        ok = ~np.isnan(mm8)
+        ignorados["mm8_indisponivel"] += int((~ok).sum())
+
+        spec = specs[symbol]
+        blocos.append({
+            "ts": ts[ok],
+            "symbol": dataset["symbol"][sel[ok]],
+            "side": dataset["side"][sel[ok]],
+            "limit": dataset["limit"][sel[ok]],
+            "timeframe": dataset["timeframe"][sel[ok]],
+            "barra": barra[ok],
+            "preco": preco[ok],
+            "mm8": np.array([spec.preco(x) for x in mm8[ok]]),
+        })
+
+    if not blocos:
+        return {}, ignorados
+
+    sinais = {nome: np.concatenate([b[nome] for b in blocos]) for nome in blocos[0]}
+    ordem = np.argsort(sinais["ts"], kind="stable")
+    sinais = {nome: coluna[ordem] for nome, coluna in sinais.items()}
+    sinais["vela"] = np.zeros(len(ordem), dtype=np.int64)
+    for tf, tf_ms in TF_MS.items():
+        m = sinais["timeframe"] == tf
+        sinais["vela"][m] = sinais["ts"][m] // tf_ms
+    return sinais, ignorados
+
+# ==========================================================
+# 📈 SIMULAÇÃO DE UM TRADE (numpy sobre o caminho de preços)
+# ==========================================================
+def _primeiro(cond):
+    """
+    Índice do primeiro True (len(cond) se nenhum).
+    """
+    i = int(np.argmax(cond)) if cond.size else 0
+    return i if cond.size and cond[i] else cond.size
+
+
+def simular_trade(k, barra, s, limit, mm8, qty, spec, prm, horizonte):
+    """
+    s = 1 LONG / -1 SHORT. Caminho orientado: "a favor" = máxima (LONG) ou -mínima (SHORT),
+    "contra" = mínima (LONG) ou -máxima (SHORT); todo gatilho vira uma comparação vetorizada.
+    """
+    fim = min(k.shape[1], barra + horizonte)
+    if s > 0:
+        a_favor, contra = k[HIGH, barra:fim], k[LOW, barra:fim]
+    else:
+        a_favor, contra = -k[LOW, barra:fim], -k[HIGH, barra:fim]
+    n = fim - barra
+    fim_ts = int(k[OPEN_TIME, fim - 1]) + MINUTO_MS
+    preco = k[OPEN, barra]
+
+    resultado = {"entrada_ts": 0, "saida_ts": fim_ts, "entrada": 0.0, "pnl": 0.0, "taxas": 0.0, "motivo": "nao_executada"}
+
+    # ================= ENTRADA =================
+    if not limit or s * mm8 >= s * preco:
+        # MARKET, ou LIMIT já a mercado (compra acima / venda abaixo): executa no preço atual
+        entrada, taxa_entrada, f, inicio = preco, TAXA_TAKER, 0, 0
+    else:
+        # ordem no livro: executa na vela que cruza a MM8; saídas a partir da seguinte
+        f = _primeiro(contra <= s * mm8)
+        if f == n:
+            return resultado
+        entrada, taxa_entrada, inicio = mm8, TAXA_MAKER, f + 1
+
+    resultado["entrada_ts"] = int(k[OPEN_TIME, barra + f])
+    resultado["entrada"] = entrada
+    a_favor, contra = a_favor[inicio:], contra[inicio:]
+    m = len(a_favor)
+    taxas = entrada * qty * taxa_entrada
+    pernas = []   # (qty, preço de saída, taxa, índice, motivo)
+
+    liquidacao = entrada * (1 - s * (1 / prm["LEVERAGE"] - MARGEM_MANUTENCAO))
+    i_liq = _primeiro(contra <= s * liquidacao)
+
+    # ================= TP1 / TP2 (montar_tp_parcial) =================
+    tp_pct = prm["TP_PARCIAL_PERCENT"]
+    q1 = spec.qtd(qty * prm["TP_PARCIAL_QTY"])
+    tp1 = spec.preco(entrada * (1 + s * tp_pct / 100))
+    tp2 = spec.preco(entrada * (1 + s * tp_pct * 2 / 100))
+    q2 = spec.qtd(qty - q1) if q1 > 0 else 0.0
+    i_tp1 = _primeiro(a_favor >= s * tp1) if q1 > 0 else m
+
+    if i_liq < m and i_liq <= i_tp1:
+        pernas.append((qty, liquidacao, TAXA_TAKER, i_liq, "liquidacao"))
+
+    elif i_tp1 < m:
+        pernas.append((q1, tp1, TAXA_MAKER, i_tp1, "tp1"))
+        restante = spec.qtd(qty - q1)
+
+        if restante > 0:
+            # TP2 está no livro desde a entrada (pode executar na mesma vela do TP1)
+            i_tp2 = i_tp1 + _primeiro(a_favor[i_tp1:] >= s * tp2) if q2 > 0 else m
+
+            # stop no lucro + trailing a partir da vela seguinte ao TP1 (mark ~ TP1)
+            b = i_tp1 + 1
+            if s > 0:
+                stop = min(entrada * (1 + STOP_LUCRO), tp1 * (1 - STOP_FOLGA_MARK))
+            else:
+                stop = max(entrada * (1 - STOP_LUCRO), tp1 * (1 + STOP_FOLGA_MARK))
+            stop = spec.preco(stop)
+            i_stop = b + _primeiro(contra[b:] <= s * stop)
+
+            ativacao = spec.preco(entrada * (1 + s * prm["TRAILING_ACTIVATION_PERCENT"] / 100))
+            callback = prm["TRAILING_CALLBACK_RATE"] / 100
+            melhor = np.maximum.accumulate(a_favor[b:]) if b < m else a_favor[b:]
+            limite = melhor * (1 - s * callback)
+            j = _primeiro((melhor >= s * ativacao) & (contra[b:] <= limite))
+            i_trail = b + j
+            saida_trail = s * limite[j] if j < len(limite) else 0.0
+
+            # empate na mesma vela: adverso primeiro
+            candidatos = [
+                (i_liq, 0, liquidacao, TAXA_TAKER, "liquidacao"),
+                (i_stop, 1, stop, TAXA_TAKER, "stop_lucro"),
+                (i_trail, 2, saida_trail, TAXA_TAKER, "trailing"),
+                (i_tp2, 3, tp2, TAXA_MAKER, "tp2"),
+            ]
+            i, _, saida, taxa, motivo = min(candidatos)
+            if i < m:
+                pernas.append((restante, saida, taxa, i, motivo))
+            else:
+                pernas.append((restante, k[CLOSE, fim - 1], 0.0, m - 1, "aberta"))
+
+    else:
+        pernas.append((qty, k[CLOSE, fim - 1], 0.0, m - 1, "aberta"))
+
+    pnl = 0.0
+    for q, saida, taxa, _, _ in pernas:
+        pnl += s * (saida - entrada) * q
+        taxas += saida * q * taxa
+
+    ultima = max(p[3] for p in pernas)
+    resultado["saida_ts"] = int(k[OPEN_TIME, barra + inicio + ultima]) + MINUTO_MS if m else fim_ts
+    resultado["pnl"] = pnl - taxas
+    resultado["taxas"] = taxas
+    resultado["motivo"] = pernas[-1][4]
+    return resultado
+
+# ==========================================================
+# ▶ EXECUÇÃO (validar_sinal + executar_ordem em ordem de tempo)
+# ==========================================================
+def rodar_backtest(sinais, klines, specs, parametros=None, horizonte_dias=HORIZONTE_DIAS):
+    """
+    -> (trades: {coluna: array}, ignorados: Counter) para um conjunto de parâmetros.
+    """
+    prm = parametros or parametros_atuais()
+    horizonte = int(horizonte_dias * 24 * 60)
+    notional = prm["MAX_USDT"] * prm["LEVERAGE"]
+
+    ativos = {}            # (symbol, side) -> (fim_ts, entrada_ts)
+    encerramentos = []     # heap (fim_ts, symbol, side)
+    lados = Counter()
+    executados = {}
+    ignorados = Counter()
+    trades = []
+
+    for idx in range(len(sinais.get("ts", ()))):
+        ts = int(sinais["ts"][idx])
+        symbol = str(sinais["symbol"][idx])
+        s = int(sinais["side"][idx])
+        side = "LONG" if s > 0 else "SHORT"
+        timeframe = str(sinais["timeframe"][idx])
+
+        while encerramentos and encerramentos[0][0] <= ts:
+            fim_ts, sym, lado = heapq.heappop(encerramentos)
+            if ativos.get((sym, lado), (None,))[0] == fim_ts:
+                del ativos[(sym, lado)]
+                lados[lado] -= 1
+
+        # 🔒 vela
+        chave = (symbol, side, timeframe)
+        vela = int(sinais["vela"][idx])
+        if executados.get(chave) == vela:
+            ignorados["vela_repetida"] += 1
+            continue
+
+        # 📊 posição / exposição
+        ativo = ativos.get((symbol, side))
+        if ativo and ativo[1] and ativo[1] <= ts:
+            ignorados["posicao_existente"] += 1
+            continue
+        total = lados["LONG"] + lados["SHORT"]
+        if (ativo or total >= prm["MAX_POSICOES_ABERTAS"]
+                or (side == "LONG" and lados[side] >= prm["MAX_LONGS"])
+                or (side == "SHORT" and lados[side] >= prm["MAX_SHORTS"])):
+            ignorados["exposicao"] += 1
+            continue
+
+        # 💲 preço permitido
+        if sinais["preco"][idx] > prm["MAX_PRECO_PERMITIDO"]:
+            ignorados["preco"] += 1
+            continue
+
+        spec = specs[symbol]
+        mm8 = float(sinais["mm8"][idx])
+        qty = spec.qtd(notional / mm8)
+        executados[chave] = vela
+        if qty <= 0:
+            ignorados["qty_zero"] += 1
+            continue
+
+        r = simular_trade(klines[symbol], int(sinais["barra"][idx]), s, bool(sinais["limit"][idx]),
+                          mm8, qty, spec, prm, horizonte)
+
+        ativos[(symbol, side)] = (r["saida_ts"], r["entrada_ts"])
+        heapq.heappush(encerramentos, (r["saida_ts"], symbol, side))
+        lados[side] += 1
+
+        trades.append((ts, symbol, s, timeframe, r["entrada_ts"], r["saida_ts"], r["entrada"], qty,
+                       r["pnl"], r["taxas"], r["motivo"]))
+
+    colunas = ("sinal_ts", "symbol", "side", "timeframe", "entrada_ts", "saida_ts", "entrada", "qty", "pnl", "taxas", "motivo")
+    tabela = {nome: np.array([t[i] for t in trades]) for i, nome in enumerate(colunas)}
+    return tabela, ignorados
+
+# ==========================================================
+# 📊 RESUMO
+# ==========================================================
+def resumir(trades, ignorados=None):
+    pnl = trades.get("pnl", np.array([]))
+    entrou = trades["entrada_ts"] > 0 if len(pnl) else np.array([], dtype=bool)
+    pnl_entrou = pnl[entrou] if len(pnl) else pnl
+
+    # curva de capital na ordem de saída
+    if len(pnl):
+        curva = np.cumsum(pnl[np.argsort(trades["saida_ts"], kind="stable")])
+        pico = np.maximum.accumulate(np.maximum(curva, 0.0))
+        drawdown = float((pico - curva).max())
+    else:
+        drawdown = 0.0
+
+    ganhos = pnl_entrou[pnl_entrou > 0].sum() if len(pnl_entrou) else 0.0
+    perdas = -pnl_entrou[pnl_entrou < 0].sum() if len(pnl_entrou) else 0.0
+
+    return {
+        "ordens": int(len(pnl)),
+        "trades": int(entrou.sum()) if len(pnl) else 0,
+        "pnl": float(pnl.sum()) if len(pnl) else 0.0,
+        "drawdown": drawdown,
+        "acerto": float((pnl_entrou > 0).mean()) if len(pnl_entrou) else 0.0,
+        "profit_factor": float(ganhos / perdas) if perdas else float("inf") if ganhos else 0.0,
+        "taxas": float(trades["taxas"].sum()) if len(pnl) else 0.0,
+        "motivos": dict(Counter(trades["motivo"].tolist())) if len(pnl) else {},
+        "ignorados": dict(ignorados or {}),
+    }
+
+
+def gravar_trades(caminho, trades):
+    colunas = list(trades)
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(colunas)
+        for linha in zip(*(trades[c].tolist() for c in colunas)):
+            w.writerow(linha)
+
+# ==========================================================
+# 🖥 CLI
+# ==========================================================
+def _ms(data):
+    return int(datetime.strptime(data, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _opcao(nome):
+    return "--" + nome.lower().replace("_", "-")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest vetorizado da estratégia (MM8 + TP1/TP2 + trailing)")
+    parser.add_argument("--sinais", default=PASTA_SINAIS, help="pasta do backfill_sinais.py")
+    parser.add_argument("--klines", default=PASTA_KLINES)
+    parser.add_argument("--filtros", default=ARQUIVO_FILTROS, help="cache do exchange info (tick / step)")
+    parser.add_argument("--horizonte-dias", type=float, default=HORIZONTE_DIAS)
+    parser.add_argument("--todas", action="store_true", help="não aplica ALLOWED_SYMBOLS (FILTER_SYMBOLS=False)")
+    parser.add_argument("--trades", help="grava os trades em CSV")
+    parser.add_argument("--baixar", action="store_true", help="baixa klines 1m (--desde / --ate) e sai")
+    parser.add_argument("--desde")
+    parser.add_argument("--ate")
+    parser.add_argument("--symbols", help="lista separada por vírgula (padrão: ALLOWED_SYMBOLS)")
+    padrao = parametros_atuais()
+    for nome in PARAMETROS:
+        parser.add_argument(_opcao(nome), dest=nome, type=type(padrao[nome]), default=padrao[nome])
+    args = parser.parse_args()
+
+    symbols = sorted(args.symbols.split(",")) if args.symbols else sorted(ALLOWED_SYMBOLS)
+
+    if args.baixar:
+        if not args.desde or not args.ate:
+            parser.error("--baixar precisa de --desde e --ate")
+        for symbol in symbols:
+            try:
+                n = baixar_klines(symbol, _ms(args.desde), _ms(args.ate), args.klines)
+                print(f"[KLINES] {symbol}: {n} velas")
+            except Exception as e:
+                print(f"[ERRO] Klines {symbol}: {e}")
+        return
+
+    inicio = time.monotonic()
+    dataset = carregar_dataset(args.sinais)
+    todos = sorted(set(np.unique(dataset["symbol"]).tolist()) | set(symbols))
+    klines = carregar_klines(todos, args.klines)
+    specs = carregar_specs(todos, args.filtros)
+    sinais, ignorados_preparo = preparar_sinais(dataset, klines, specs, filtrar_symbols=not args.todas)
+    preparo = time.monotonic() - inicio
+
+    prm = {nome: getattr(args, nome) for nome in PARAMETROS}
+    inicio = time.monotonic()
+    trades, ignorados = rodar_backtest(sinais, klines, specs, prm, args.horizonte_dias)
+    duracao = time.monotonic() - inicio
+    resumo = resumir(trades, ignorados_preparo + ignorados)
+
+    print("")
+    print(f"parâmetros        : {prm}")
+    print(f"dados             : {len(dataset['ts'])} sinais, {len(klines)} moedas com klines  (preparo {preparo:.1f}s)")
+    print(f"simulação         : {duracao:.2f}s")
+    print(f"ordens / trades   : {resumo['ordens']} / {resumo['trades']}")
+    print(f"PnL (USDT)        : {resumo['pnl']:.2f}  (taxas {resumo['taxas']:.2f})")
+    print(f"drawdown máx.     : {resumo['drawdown']:.2f}")
+    print(f"acerto            : {resumo['acerto'] * 100:.1f}%   profit factor {resumo['profit_factor']:.2f}")
+    print(f"saídas            : {resumo['motivos']}")
+    print(f"ignorados         : {resumo['ignorados']}")
+
+    if args.trades:
+        gravar_trades(args.trades, trades)
+        print(f"trades            : {args.trades}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+﻿# Arquivo - benchmarks/bench_decodificacao.py
+# Benchmark da decodificação dos frames do user data stream:
+# json.loads + conversões repetidas nos handlers (anterior) contra decodificador_ws.
+#
+# Uso:
+#   python benchmarks/bench_decodificacao.py                 # corpus sintético (sessão volátil)
+#   python benchmarks/bench_decodificacao.py frames.jsonl    # um frame bruto por linha
+#   python benchmarks/bench_decodificacao.py gravacoes/user_20260101.tsv.gz   # gravação do WS_RECORD_FILE
+
+import os
+import sys
+import json
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decodificador_ws import decodificar, DECODER
+from gravador_ws import ler_gravacao
+
+SYMBOLS = ["XRPUSDT", "ADAUSDT", "TRXUSDT", "DOTUSDT", "SUIUSDT", "ARBUSDT", "OPUSDT", "SEIUSDT"]
+
+# ==========================================================
+# 📦 CORPUS
+# ==========================================================
+def _account_update(rnd, ts):
+    posicoes = []
+    for symbol in rnd.sample(SYMBOLS, rnd.randint(1, len(SYMBOLS))):
+        for ps in ("LONG", "SHORT"):
+            posicoes.append({
+                "s": symbol, "pa": f"{rnd.uniform(-500, 500):.1f}", "ep": f"{rnd.uniform(0.1, 2):.5f}",
+                "bep": "0", "cr": "0", "up": f"{rnd.uniform(-5, 5):.8f}", "mt": "cross", "iw": "0", "ps": ps,
+            })
+    return {"e": "ACCOUNT_UPDATE", "T": ts, "E": ts, "a": {
+        "B": [{"a": "USDT", "wb": "100.0", "cw": "100.0", "bc": "0"}],
+        "P": posicoes, "m": "ORDER"}}
+
+
+def _order_update(rnd, ts):
+    symbol = rnd.choice(SYMBOLS)
+    ps = rnd.choice(("LONG", "SHORT"))
+    return {"e": "ORDER_TRADE_UPDATE", "T": ts, "E": ts, "o": {
+        "s": symbol, "c": "x", "S": rnd.choice(("BUY", "SELL")), "o": "LIMIT", "f": "GTC",
+        "q": "100", "p": "0.5", "ap": f"{rnd.uniform(0.1, 2):.5f}", "sp": "0", "x": "TRADE",
+        "X": rnd.choice(("NEW", "PARTIALLY_FILLED", "FILLED", "CANCELED")), "i": rnd.randint(1, 10**10),
+        "l": "10", "z": f"{rnd.uniform(1, 100):.1f}", "L": "0.5", "n": "0", "N": "USDT", "T": ts,
+        "t": 0, "b": "0", "a": "0", "m": False, "R": False, "wt": "CONTRACT_PRICE", "ot": "LIMIT",
+        "ps": ps, "cp": False, "rp": "0", "pP": False, "si": 0, "ss": 0}}
+
+
+def _ignorado(rnd, ts):
+    return rnd.choice([
+        {"e": "TRADE_LITE", "E": ts, "T": ts, "s": rnd.choice(SYMBOLS), "q": "10", "p": "0.5", "m": False},
+        {"e": "ACCOUNT_CONFIG_UPDATE", "E": ts, "T": ts, "ac": {"s": rnd.choice(SYMBOLS), "l": 50}},
+        {"e": "MARGIN_CALL", "E": ts, "cw": "3.16", "p": []},
+    ])
+
+
+def corpus_sintetico(n=20_000, seed=7):
+    rnd = random.Random(seed)
+    ts = 1_700_000_000_000
+    frames = []
+    for _ in range(n):
+        ts += rnd.randint(1, 500)
+        r = rnd.random()
+        if r < 0.35:
+            evento = _account_update(rnd, ts)
+        elif r < 0.75:
+            evento = _order_update(rnd, ts)
+        else:
+            evento = _ignorado(rnd, ts)
+        frames.append(json.dumps(evento, separators=(",", ":")))
+    return frames
+
+
+def carregar_corpus(caminho):
+    return [frame for _, frame in ler_gravacao(caminho)]
+
+# ==========================================================
+# 🔢 IMPLEMENTAÇÃO ANTERIOR (referência)
+# ==========================================================
+def decodificar_anterior(message):
+    data = json.loads(message)
+    evento = data.get("e")
+    saida = []
+
+    if evento == "ACCOUNT_UPDATE":
+        for pos in data["a"]["P"]:
+            # atualizar_posicoes
+            saida.append((pos["s"], pos["ps"], float(pos["pa"]), float(pos["ep"])))
+
+    elif evento == "ORDER_TRADE_UPDATE":
+        o = data["o"]
+        # tratar_ordem + log + TP (ap / z convertidos em mais de um ponto)
+        saida.append((o["s"], o["ps"], o["X"], float(o.get("ap", 0)), float(o.get("z", 0))))
+        float(o.get("ap", 0))
+        float(o.get("z", 0))
+
+    return saida
+
+
+def main():
+    frames = carregar_corpus(sys.argv[1]) if len(sys.argv) > 1 else corpus_sintetico()
+    total_bytes = sum(len(f) for f in frames)
+
+    def anterior():
+        for f in frames:
+            decodificar_anterior(f)
+
+    def novo():
+        for f in frames:
+            decodificar(f)
+
+    t_anterior = min(timeit.repeat(anterior, number=1, repeat=3))
+    t_novo = min(timeit.repeat(novo, number=1, repeat=3))
+
+    registros = sum(len(decodificar(f)) for f in frames)
+    descartados = sum(1 for f in frames if not decodificar(f))
+
+    print(f"frames            : {len(frames)} ({total_bytes / 1e6:.1f} MB)")
+    print(f"registros         : {registros}  descartados sem parse: {descartados}")
+    print(f"anterior (json)   : {t_anterior:.3f}s  {len(frames) / t_anterior:,.0f} frames/s")
+    print(f"decodificador ({DECODER}): {t_novo:.3f}s  {len(frames) / t_novo:,.0f} frames/s")
+    print(f"speedup           : {t_anterior / t_novo:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+﻿# Arquivo - benchmarks/bench_normalizacao.py
+# Micro-benchmark: normalize_qty / normalize_price antigos (get_precision por string)
+# contra os quantizadores do SymbolSpec. Também conta divergências nas fronteiras de tick.
+#
+# Uso: python benchmarks/bench_normalizacao.py [n_chamadas]
+
+import os
+import sys
+import math
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symbol_spec import SymbolSpec
+
+# ==========================================================
+# 🔢 IMPLEMENTAÇÃO ANTERIOR (referência)
+# ==========================================================
+def get_precision(value): # V1
+    s = f"{value:.10f}".rstrip("0")
+    return len(s.split(".")[1]) if "." in s else 0
+
+def normalize_qty(qty, step):
+    precision = get_precision(step)
+    qty = math.floor(qty / step) * step
+    return float(f"{qty:.{precision}f}")
+
+def normalize_price(price, tick):
+    precision = get_precision(tick)
+    price = math.floor(price / tick) * tick
+    return float(f"{price:.{precision}f}")
+
+# ==========================================================
+# 📊 CASOS
+# ==========================================================
+FILTROS = [
+    ("XRPUSDT", 0.0001, 0.1),
+    ("TRXUSDT", 0.00001, 1.0),
+    ("HOTUSDT", 0.000001, 1.0),
+    ("DOTUSDT", 0.001, 0.1),
+    ("BTCUSDT", 0.1, 0.001),
+]
+
+
+def casos(n, seed=42):
+    rnd = random.Random(seed)
+    saida = []
+    for _ in range(n):
+        symbol, tick, step = rnd.choice(FILTROS)
+        # metade dos preços exatamente em múltiplos do tick (onde o float erra)
+        if rnd.random() < 0.5:
+            price = rnd.randint(1, 50000) * tick
+        else:
+            price = rnd.uniform(tick, 2.0)
+        qty = rnd.uniform(1, 5000)
+        saida.append((symbol, tick, step, price, qty))
+    return saida
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dados = casos(n)
+    specs = {symbol: SymbolSpec(symbol, tick, step) for symbol, tick, step in FILTROS}
+
+    def antigo():
+        for symbol, tick, step, price, qty in dados:
+            normalize_price(price, tick)
+            normalize_qty(qty, step)
+
+    def novo():
+        for symbol, tick, step, price, qty in dados:
+            spec = specs[symbol]
+            spec.preco(price)
+            spec.qtd(qty)
+
+    t_antigo = min(timeit.repeat(antigo, number=1, repeat=3))
+    t_novo = min(timeit.repeat(novo, number=1, repeat=3))
+
+    divergencias = 0
+    exemplo = None
+    for symbol, tick, step, price, qty in dados:
+        a = normalize_price(price, tick)
+        b = specs[symbol].preco(price)
+        if a != b:
+            divergencias += 1
+            exemplo = exemplo or (symbol, price, a, b)
+
+    chamadas = 2 * n
+    print(f"chamadas          : {chamadas}")
+    print(f"antigo (string)   : {t_antigo:.3f}s  {t_antigo / chamadas * 1e9:.0f} ns/chamada")
+    print(f"SymbolSpec        : {t_novo:.3f}s  {t_novo / chamadas * 1e9:.0f} ns/chamada")
+    print(f"speedup           : {t_antigo / t_novo:.2f}x")
+    print(f"preços divergentes: {divergencias} (antigo arredonda para baixo na fronteira do tick)")
+    if exemplo:
+        print(f"  ex.: {exemplo[0]} preço={exemplo[1]!r} antigo={exemplo[2]} spec={exemplo[3]}")
+
+
+if __name__ == "__main__":
+    main()
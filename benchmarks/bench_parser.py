@@ -0,0 +1,191 @@
+﻿# Arquivo - benchmarks/bench_parser.py
+# Corpus golden + benchmark dos parsers de sinal do Telegram:
+# - confere cada implementação contra benchmarks/corpus_sinais.json (divergência -> exit 1)
+# - mede mensagens/s: interpretar_mensagem + parse_signal_message anteriores (duas passadas)
+#   contra parser_sinais.interpretar_sinal (uma passada)
+#
+# Uso:
+#   python benchmarks/bench_parser.py                       # valida + mede (corpus x 2000)
+#   python benchmarks/bench_parser.py --repeticoes 10000
+#   python benchmarks/bench_parser.py --so-validar          # só os goldens (rápido)
+
+import io
+import os
+import re
+import sys
+import json
+import timeit
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser_sinais import interpretar_sinal
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_sinais.json")
+
+
+def carregar_corpus(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)["casos"]
+
+# ==========================================================
+# 🔢 IMPLEMENTAÇÃO ANTERIOR (referência)
+# ==========================================================
+def interpretar_mensagem_anterior(texto):
+    texto_lower = texto.lower()
+
+    if not texto.startswith("BINANCE:"):
+        return None
+
+    match_symbol = re.search(r'BINANCE:([A-Z0-9]+)', texto)
+    if not match_symbol:
+        return None
+    symbol = match_symbol.group(1)
+
+    match_price = re.search(r'Preço:\s*([^\n]+)', texto)
+    if not match_price:
+        return None
+    price_match = re.search(r'\d+(?:\.\d+)?', match_price.group(1))
+    if not price_match:
+        return None
+    price = float(price_match.group())
+
+    if "15 minutos" in texto_lower:
+        timeframe, order_type = "15m", "MARKET"
+    elif "60 minutos" in texto_lower or "1h" in texto_lower:
+        timeframe, order_type = "1h", "MARKET"
+    elif "4h" in texto_lower:
+        timeframe, order_type = "4h", "LIMIT"
+    else:
+        return None
+
+    if "alerta de compra" in texto_lower:
+        side = "LONG"
+    elif "agulhada de compra" in texto_lower:
+        side, order_type = "LONG", "LIMIT"
+    elif "agulhada santa de compra" in texto_lower:
+        side = "LONG"
+    elif "alerta de venda" in texto_lower:
+        side = "SHORT"
+    elif "agulhada de venda" in texto_lower:
+        side, order_type = "SHORT", "LIMIT"
+    elif "agulhada santa de venda" in texto_lower:
+        side = "SHORT"
+    else:
+        return None
+
+    return {"exchange": "BINANCE", "symbol": symbol, "side": side,
+            "order_type": order_type, "timeframe": timeframe, "price": price}
+
+
+def parse_signal_message_anterior(text):
+    text = text.strip().replace("\r", "")
+
+    pattern = re.compile(
+        r'(?P<exchange>\w+):(?P<symbol>[\w\.]+)\s+deu\s+'
+        r'(?P<signal>.+?)\s+'
+        r'(?:nos?|nas?)\s+'
+        r'(?P<timeframe>\d+\s*(?:minutos?|H))'
+        r'.*?\n+'
+        r'Preço:\s*(?P<price>.+)',
+        re.IGNORECASE | re.DOTALL
+    )
+
+    match = pattern.search(text)
+    if not match:
+        print("[SKIP] Mensagem fora do padrão")
+        return None
+
+    raw_price = match.group("price")
+    price_match = re.search(r"\d+(?:\.\d+)?", raw_price)
+    if not price_match:
+        print(f"[SKIP] Preço inválido: {raw_price}")
+        return None
+
+    return {
+        "exchange": match.group("exchange").upper(),
+        "symbol": match.group("symbol").replace(".P", "").upper(),
+        "signal": match.group("signal").lower(),
+        "timeframe": match.group("timeframe").lower().replace(" ", ""),
+        "price": float(price_match.group())
+    }
+
+
+def duas_passadas_anterior(texto):
+    # listener anterior: interpretar_mensagem + parse_signal_message sobre o mesmo texto
+    return interpretar_mensagem_anterior(texto), parse_signal_message_anterior(texto)
+
+
+IMPLEMENTACOES = [
+    # (nome, função, esperado(caso))
+    ("anterior interpretar_mensagem", interpretar_mensagem_anterior, lambda c: c["sinal"]),
+    ("anterior parse_signal_message", parse_signal_message_anterior, lambda c: c["padrao"]),
+    ("anterior (2 passadas)", duas_passadas_anterior, lambda c: (c["sinal"], c["padrao"])),
+    ("parser_sinais (1 passada)", interpretar_sinal, lambda c: (c["sinal"], c["padrao"])),
+]
+
+# ==========================================================
+# ✅ GOLDENS
+# ==========================================================
+def validar(func, esperado, casos):
+    divergencias = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for caso in casos:
+            obtido = func(caso["texto"])
+            if obtido != esperado(caso):
+                divergencias.append((caso["nome"], esperado(caso), obtido))
+    return divergencias
+
+# ==========================================================
+# ⏱ THROUGHPUT
+# ==========================================================
+def medir(func, textos, repeticoes):
+    lote = textos * repeticoes
+
+    def rodar():
+        for texto in lote:
+            func(texto)
+
+    # parse_signal_message anterior imprime [SKIP] nas mensagens fora do padrão
+    with contextlib.redirect_stdout(io.StringIO()):
+        tempo = min(timeit.repeat(rodar, number=1, repeat=3))
+    return len(lote) / tempo, tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Goldens e throughput dos parsers de sinal")
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--repeticoes", type=int, default=2000, help="vezes que o corpus é repetido na medição")
+    parser.add_argument("--so-validar", action="store_true")
+    args = parser.parse_args()
+
+    casos = carregar_corpus(args.corpus)
+    textos = [c["texto"] for c in casos]
+
+    print(f"corpus            : {len(casos)} mensagens ({sum(1 for c in casos if c['sinal'])} sinais válidos)")
+    print("")
+
+    falhou = False
+    for nome, func, esperado in IMPLEMENTACOES:
+        divergencias = validar(func, esperado, casos)
+        status = "OK" if not divergencias else f"{len(divergencias)} divergência(s)"
+        print(f"{nome:<30}: goldens {status}")
+        for caso, esp, obtido in divergencias:
+            falhou = True
+            print(f"    {caso}: esperado {esp}  obtido {obtido}")
+
+    if not args.so_validar:
+        print("")
+        tempos = {}
+        for nome, func, _ in IMPLEMENTACOES:
+            por_segundo, tempo = medir(func, textos, args.repeticoes)
+            tempos[nome] = tempo
+            print(f"{nome:<30}: {tempo:.3f}s  {por_segundo:,.0f} msgs/s  {tempo / len(textos) / args.repeticoes * 1e6:.2f}µs/msg")
+        print(f"speedup           : {tempos['anterior (2 passadas)'] / tempos['parser_sinais (1 passada)']:.2f}x")
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+﻿# Arquivo - benchmarks/bench_sinal_ordem.py
+# Benchmark ponta a ponta contra o mock_binance (sem tocar na corretora):
+# mensagem -> interpretar_mensagem -> executar_ordem -> fill no WS -> enviar_tp_parcial (batchOrders).
+# Um sinal por symbol sintético (vela / posição / exposição não bloqueiam a rajada).
+#
+# Uso:
+#   python benchmarks/bench_sinal_ordem.py                              # 200 sinais, sync, 8 threads
+#   python benchmarks/bench_sinal_ordem.py --modo async --sinais 500
+#   python benchmarks/bench_sinal_ordem.py --latencia-ms 30 --frio      # RTT simulado, caches frios
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_binance import MockBinance, symbols_sinteticos
+
+MENSAGENS = (
+    # (texto, side, tipo)
+    ("BINANCE:{symbol}.P deu Alerta de Compra nos 15 minutos\n\nPreço: 0.5000", "LONG", "MARKET"),
+    ("BINANCE:{symbol}.P deu Alerta de Venda nos 15 minutos\n\nPreço: 0.5000", "SHORT", "MARKET"),
+    ("BINANCE:{symbol}.P deu Agulhada de Compra nos 4H\n\nPreço: 0.5000", "LONG", "LIMIT"),
+)
+
+
+def percentis(valores):
+    if not valores:
+        return "sem amostras"
+    v = sorted(valores)
+    p = lambda q: v[min(len(v) - 1, int(round(q / 100 * (len(v) - 1))))]
+    return f"p50={p(50):7.1f}ms  p95={p(95):7.1f}ms  p99={p(99):7.1f}ms  max={v[-1]:7.1f}ms"
+
+
+def variaveis_telegram():
+    """
+    Telegram obrigatório no config.py; a sessão nunca conecta nos benchmarks.
+    """
+    from telethon.sessions import StringSession
+    from telethon.crypto import AuthKey
+
+    sessao = StringSession()
+    sessao.set_dc(2, "127.0.0.1", 443)
+    sessao.auth_key = AuthKey(bytes(256))
+
+    return {
+        "API_ID": "1",
+        "API_HASH": "mock",
+        "SOURCE_CHAT_ID": "1",
+        "TARGET_CHAT_ID": "2",
+        "TELEGRAM_SESSION_STRING": sessao.save(),
+    }
+
+
+def preparar_ambiente(mock, pasta):
+    """
+    Variáveis do config.py apontando para o mock (antes de importar o bot).
+    """
+    os.environ.update(variaveis_telegram())
+    os.environ.update({
+        "USE_BINANCE": "true",
+        "BINANCE_API_KEY": "mock",
+        "BINANCE_API_SECRET": "mock",
+        "BINANCE_REST_URL": mock.url_rest,
+        "BINANCE_WS_URL": mock.url_ws,
+        "STATE_DIR": os.path.join(pasta, "estado"),
+        "EXCHANGE_INFO_CACHE_FILE": os.path.join(pasta, "exchange_info.json"),
+        "MAX_POSICOES_ABERTAS": str(10 ** 6),
+        "MAX_LONGS": str(10 ** 6),
+        "MAX_SHORTS": str(10 ** 6),
+    })
+
+
+def bootstrap(symbols, frio):
+    """
+    Mesmo startup do AgulhadasRailway (sem Telegram).
+    """
+    from executorwebsocket import TF_MAP, restaurar_estado, sincronizar_estado_inicial, iniciar_listener_ws
+    from filtros_symbol import carregar_filtros
+    from livro_ordens import sincronizar_livro
+    from alavancagem import prewarm_config_symbols
+    from gerenciador_streams import GerenciadorStreams
+    from cache_mark_price import registrar_stream_mark_price, mark_price_cache
+    from klines_store import registrar_store_klines, aquecer_store
+
+    carregar_filtros()
+    if not restaurar_estado():
+        sincronizar_estado_inicial()
+        sincronizar_livro()
+
+    streams = GerenciadorStreams()
+    if not frio:
+        prewarm_config_symbols(symbols)
+        registrar_stream_mark_price(streams)
+        registrar_store_klines(streams, symbols, TF_MAP)
+    iniciar_listener_ws(streams)
+    streams.iniciar()
+
+    if not frio:
+        aquecer_store(symbols, TF_MAP)
+        limite = time.monotonic() + 10
+        while mark_price_cache(symbols[-1]) is None and time.monotonic() < limite:
+            time.sleep(0.05)
+
+    # user data conectado antes da rajada
+    time.sleep(1.0)
+
+
+def gerar_sinais(symbols):
+    sinais = []
+    for i, symbol in enumerate(symbols):
+        texto, side, tipo = MENSAGENS[i % len(MENSAGENS)]
+        sinais.append((texto.format(symbol=symbol), symbol, side))
+    return sinais
+
+
+def rodar_sync(sinais, concorrencia, interpretar, executar_ordem, iniciar_trace):
+    def _um(item):
+        texto, symbol, side = item
+        inicio = time.monotonic()
+        trace = iniciar_trace(inicio=inicio)
+        sinal = interpretar(texto)
+        sinal["signal_id"] = trace.signal_id
+        executar_ordem(sinal)
+        return symbol, side, inicio, time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        return list(pool.map(_um, sinais))
+
+
+def rodar_async(sinais, concorrencia, interpretar, iniciar_trace):
+    from executor_async import executar_ordem_async, obter_async_client, fechar_async_client
+
+    async def _main():
+        await obter_async_client()
+        limite = asyncio.Semaphore(concorrencia)
+
+        async def _um(item):
+            texto, symbol, side = item
+            async with limite:
+                inicio = time.monotonic()
+                trace = iniciar_trace(inicio=inicio)
+                sinal = interpretar(texto)
+                sinal["signal_id"] = trace.signal_id
+                await executar_ordem_async(sinal)
+                return symbol, side, inicio, time.monotonic()
+
+        try:
+            return await asyncio.gather(*(_um(s) for s in sinais))
+        finally:
+            await fechar_async_client()
+
+    return asyncio.run(_main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sinal -> ordem -> fill -> TP contra o mock")
+    parser.add_argument("--sinais", type=int, default=200)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--modo", choices=("sync", "async"), default="sync")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="RTT simulado por request REST")
+    parser.add_argument("--fill-limit", type=float, default=0.05)
+    parser.add_argument("--frio", action="store_true", help="sem prewarm / streams de mercado (REST no caminho)")
+    parser.add_argument("--timeout", type=float, default=15.0, help="espera máxima pelo TP de cada sinal")
+    args = parser.parse_args()
+
+    symbols = symbols_sinteticos(args.sinais)
+    mock = MockBinance(symbols, latencia=args.latencia_ms / 1000, fill_limit=args.fill_limit).iniciar()
+
+    pasta = tempfile.mkdtemp(prefix="bench_agulhadas_")
+    preparar_ambiente(mock, pasta)
+    os.chdir(pasta)   # logs/ do structured_logger fora do repositório
+
+    from parser_sinais import interpretar_mensagem
+    from executorwebsocket import executar_ordem
+    from tracing import iniciar_trace, imprimir_resumo
+
+    inicio_boot = time.monotonic()
+    bootstrap(symbols, args.frio)
+    boot = time.monotonic() - inicio_boot
+    requests_boot = sum(mock.requests.values())
+
+    sinais = gerar_sinais(symbols)
+
+    inicio = time.monotonic()
+    if args.modo == "sync":
+        resultados = rodar_sync(sinais, args.concorrencia, interpretar_mensagem, executar_ordem, iniciar_trace)
+    else:
+        resultados = rodar_async(sinais, args.concorrencia, interpretar_mensagem, iniciar_trace)
+    fim_envio = time.monotonic()
+
+    ate_ack, ate_tp, sem_tp = [], [], 0
+    for symbol, side, t0, t_ack in resultados:
+        ate_ack.append((t_ack - t0) * 1000)
+        t_tp = mock.esperar_batch(symbol, side, timeout=max(0.0, inicio + args.timeout - time.monotonic()))
+        if t_tp is None:
+            sem_tp += 1
+        else:
+            ate_tp.append((t_tp - t0) * 1000)
+    fim = max([mock.batches.get((s, sd), fim_envio) for s, sd, _, _ in resultados] + [fim_envio])
+
+    requests_rajada = sum(mock.requests.values()) - requests_boot
+
+    print("")
+    print(f"modo              : {args.modo} (concorrência {args.concorrencia}) {'frio' if args.frio else 'aquecido'}")
+    print(f"boot              : {boot:.2f}s, {requests_boot} requests REST")
+    print(f"sinais            : {len(sinais)}  com TP: {len(ate_tp)}  sem TP: {sem_tp}")
+    print(f"envio             : {fim_envio - inicio:.2f}s  {len(sinais) / (fim_envio - inicio):,.1f} sinais/s")
+    print(f"até TP            : {fim - inicio:.2f}s  {len(ate_tp) / (fim - inicio):,.1f} sinais/s")
+    print(f"sinal -> ack      : {percentis(ate_ack)}")
+    print(f"sinal -> TP       : {percentis(ate_tp)}")
+    print(f"REST na rajada    : {requests_rajada} ({requests_rajada / len(sinais):.1f} por sinal)")
+    for (metodo, path), n in sorted(mock.requests.items(), key=lambda x: -x[1]):
+        print(f"    {metodo:<6} {path:<28} {n}")
+    print("")
+    imprimir_resumo()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,615 @@
+﻿# Arquivo - benchmarks/mock_binance.py
+# Binance Futures local (offline) para benchmark e regressão do executor.
+# - REST (http.server): só os endpoints que o bot usa (exchangeInfo, premiumIndex, klines,
+#   positionRisk, symbolConfig, openOrders, order, batchOrders, algoOrder, leverage, marginType, listenKey)
+# Como na Binance, tipos condicionais (STOP_MARKET, TRAILING_STOP_MARKET ...) só entram pelo algoOrder:
+# order / batchOrders recusam com -4120.
+# - WS (websockets): /ws/<listenKey> com ORDER_TRADE_UPDATE / ACCOUNT_UPDATE dos fills simulados
+#   e /stream?streams=... com !markPrice@arr@1s e <symbol>@kline_<tf>
+# MARKET executa na hora; LIMIT de entrada executa depois de fill_limit segundos;
+# pernas de proteção (reduceOnly / closePosition) ficam abertas.
+#
+# Uso (servidor avulso):
+#   python benchmarks/mock_binance.py --symbols 50 --porta-rest 8090 --porta-ws 8091
+#   BINANCE_REST_URL=http://127.0.0.1:8090 BINANCE_WS_URL=ws://127.0.0.1:8091 python AgulhadasRailway.py
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+import threading
+from urllib.parse import urlparse, parse_qs, unquote_plus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import websockets
+
+INTERVALOS_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "1d": 86_400_000,
+}
+
+PESO_POR_REQUEST = 1
+
+TIPOS_CONDICIONAIS = {"STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET"}
+
+
+def _ms():
+    return int(time.time() * 1000)
+
+
+def _bool(valor):
+    return str(valor).lower() == "true"
+
+
+class ErroApi(Exception):
+
+    def __init__(self, code, msg, http=400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.http = http
+
+
+class MockBinance:
+
+    def __init__(self, symbols, preco=0.5, porta_rest=0, porta_ws=0, latencia=0.0, fill_limit=0.05, seed=7):
+        self.symbols = list(symbols)
+        self.precos = {s: preco for s in self.symbols}
+        self.porta_rest = porta_rest
+        self.porta_ws = porta_ws
+        self.latencia = latencia          # segundos somados a cada request REST (RTT simulado)
+        self.fill_limit = fill_limit
+        self.rnd = random.Random(seed)
+
+        self.ordens = {}                  # orderId -> ordem (formato REST)
+        self.algos = {}                   # algoId -> algo order (condicionais, ficam abertas)
+        self.posicoes = {}                # (symbol, positionSide) -> [qty, entry]
+        self.configs = {s: {"leverage": 50, "marginType": "CROSSED"} for s in self.symbols}
+        self.listen_keys = set()
+        self.usuarios = set()             # conexões /ws/<listenKey>
+        self.mercado = {}                 # conexão -> streams
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+        # estatísticas / sincronização com o harness
+        self.requests = {}                # (método, path) -> contagem
+        self.batches = {}                 # (symbol, positionSide) -> monotonic do 1º batchOrders
+        self.cond = threading.Condition(self.lock)
+
+        self.loop = None
+        self.http = None
+        self._pronto = threading.Event()
+
+    # ======================================================
+    # 🌐 URLS
+    # ======================================================
+    @property
+    def url_rest(self):
+        return f"http://127.0.0.1:{self.porta_rest}"
+
+    @property
+    def url_ws(self):
+        return f"ws://127.0.0.1:{self.porta_ws}"
+
+    # ======================================================
+    # 📦 DADOS DE MERCADO
+    # ======================================================
+    def _preco(self, symbol):
+        # passeio pequeno em torno do preço base (mantém MM8 ~ mark price)
+        base = self.precos[symbol]
+        return round(base * (1 + self.rnd.uniform(-0.002, 0.002)), 4)
+
+    def exchange_info(self, p):
+        return {
+            "timezone": "UTC",
+            "serverTime": _ms(),
+            "symbols": [
+                {
+                    "symbol": s,
+                    "status": "TRADING",
+                    "contractType": "PERPETUAL",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": "0.0001", "minPrice": "0.0001", "maxPrice": "1000"},
+                        {"filterType": "LOT_SIZE", "stepSize": "1", "minQty": "1", "maxQty": "10000000"},
+                        {"filterType": "MARKET_LOT_SIZE", "stepSize": "1", "minQty": "1", "maxQty": "1000000"},
+                        {"filterType": "MIN_NOTIONAL", "notional": "5"},
+                    ],
+                }
+                for s in self.symbols
+            ],
+        }
+
+    def _mark(self, symbol):
+        return {
+            "symbol": symbol, "markPrice": f"{self._preco(symbol):.4f}", "indexPrice": f"{self.precos[symbol]:.4f}",
+            "lastFundingRate": "0.0001", "nextFundingTime": _ms() + 3_600_000, "time": _ms(),
+        }
+
+    def premium_index(self, p):
+        if "symbol" in p:
+            self._symbol(p["symbol"])
+            return self._mark(p["symbol"])
+        return [self._mark(s) for s in self.symbols]
+
+    def _kline(self, symbol, intervalo, open_time):
+        close = self._preco(symbol)
+        return [open_time, f"{close:.4f}", f"{close * 1.001:.4f}", f"{close * 0.999:.4f}", f"{close:.4f}",
+                "1000", open_time + INTERVALOS_MS[intervalo] - 1, "500", 10, "500", "250", "0"]
+
+    def klines(self, p):
+        symbol = self._symbol(p["symbol"])
+        intervalo = p["interval"]
+        passo = INTERVALOS_MS[intervalo]
+        limite = int(p.get("limit", 500))
+        atual = _ms() // passo * passo
+        return [self._kline(symbol, intervalo, atual - passo * i) for i in reversed(range(limite))]
+
+    def _symbol(self, symbol):
+        if symbol not in self.precos:
+            raise ErroApi(-1121, "Invalid symbol.")
+        return symbol
+
+    # ======================================================
+    # 👤 CONTA
+    # ======================================================
+    def position_risk(self, p):
+        with self.lock:
+            itens = list(self.posicoes.items())
+        saida = []
+        for (symbol, ps), (qty, entry) in itens:
+            if "symbol" in p and p["symbol"] != symbol:
+                continue
+            sinal = -1 if ps == "SHORT" else 1
+            saida.append({
+                "symbol": symbol, "positionSide": ps, "positionAmt": f"{qty * sinal}", "entryPrice": f"{entry}",
+                "markPrice": f"{self.precos[symbol]}", "leverage": "50", "marginType": "cross",
+                "unRealizedProfit": "0", "updateTime": _ms(),
+            })
+        return saida
+
+    def position_risk_v3(self, p):
+        # v3 não traz leverage / marginType (ficam no symbolConfig)
+        return [
+            {k: v for k, v in item.items() if k not in ("leverage", "marginType")}
+            for item in self.position_risk(p)
+        ]
+
+    def symbol_config(self, p):
+        with self.lock:
+            return [
+                {"symbol": s, "marginType": c["marginType"], "isAutoAddMargin": "false",
+                 "leverage": c["leverage"], "maxNotionalValue": "100000"}
+                for s, c in self.configs.items() if p.get("symbol", s) == s
+            ]
+
+    def open_orders(self, p):
+        with self.lock:
+            return [
+                dict(o) for o in self.ordens.values()
+                if o["status"] in ("NEW", "PARTIALLY_FILLED") and p.get("symbol", o["symbol"]) == o["symbol"]
+            ]
+
+    def leverage(self, p):
+        symbol = self._symbol(p["symbol"])
+        with self.lock:
+            self.configs[symbol]["leverage"] = int(p["leverage"])
+        return {"symbol": symbol, "leverage": int(p["leverage"]), "maxNotionalValue": "100000"}
+
+    def margin_type(self, p):
+        symbol = self._symbol(p["symbol"])
+        with self.lock:
+            if self.configs[symbol]["marginType"] == p["marginType"]:
+                raise ErroApi(-4046, "No need to change margin type.")
+            self.configs[symbol]["marginType"] = p["marginType"]
+        return {"code": 200, "msg": "success"}
+
+    def listen_key(self, p):
+        chave = p.get("listenKey") or f"mockListenKey{next(self.ids)}"
+        with self.lock:
+            self.listen_keys.add(chave)
+        return {"listenKey": chave}
+
+    def listen_key_keepalive(self, p):
+        return {}
+
+    def listen_key_delete(self, p):
+        return {}
+
+    # ======================================================
+    # 📝 ORDENS
+    # ======================================================
+    def _nova_ordem(self, p):
+        symbol = self._symbol(p["symbol"])
+        if p.get("type") in TIPOS_CONDICIONAIS:
+            raise ErroApi(-4120, "Order type not supported for this endpoint. Please use the Algo Order API endpoints instead.")
+        oid = next(self.ids)
+        qty = float(p.get("quantity") or 0)
+        if qty <= 0 and not _bool(p.get("closePosition")):
+            raise ErroApi(-4003, "Quantity less than or equal to zero.")
+
+        ordem = {
+            "orderId": oid,
+            "symbol": symbol,
+            "status": "NEW",
+            "clientOrderId": p.get("newClientOrderId") or f"mock{oid}",
+            "price": p.get("price", "0"),
+            "avgPrice": "0",
+            "origQty": f"{qty}",
+            "executedQty": "0",
+            "cumQuote": "0",
+            "timeInForce": p.get("timeInForce", "GTC"),
+            "type": p["type"],
+            "reduceOnly": _bool(p.get("reduceOnly")),
+            "closePosition": _bool(p.get("closePosition")),
+            "side": p["side"],
+            "positionSide": p.get("positionSide", "BOTH"),
+            "stopPrice": p.get("stopPrice", "0"),
+            "activatePrice": p.get("activationPrice", "0"),
+            "priceRate": p.get("callbackRate", "0"),
+            "updateTime": _ms(),
+        }
+
+        with self.lock:
+            self.ordens[oid] = ordem
+        self._emitir_ordem(ordem)
+
+        protecao = ordem["reduceOnly"] or ordem["closePosition"]
+        if ordem["type"] == "MARKET":
+            self._agendar(0, self._executar, oid)
+        elif ordem["type"] == "LIMIT" and not protecao:
+            self._agendar(self.fill_limit, self._executar, oid)
+
+        return dict(ordem)
+
+    def criar_ordem(self, p):
+        return self._nova_ordem(p)
+
+    def batch_orders(self, p):
+        pernas = _ler_batch(p["batchOrders"])
+        agora = time.monotonic()
+        resultado = []
+        for perna in pernas:
+            try:
+                resultado.append(self._nova_ordem(perna))
+            except ErroApi as e:
+                resultado.append({"code": e.code, "msg": e.msg})
+
+        with self.cond:
+            for perna in pernas:
+                self.batches.setdefault((perna.get("symbol"), perna.get("positionSide", "BOTH")), agora)
+            self.cond.notify_all()
+        return resultado
+
+    def criar_algo(self, p):
+        symbol = self._symbol(p["symbol"])
+        if p.get("type") not in TIPOS_CONDICIONAIS or p.get("algoType") != "CONDITIONAL":
+            raise ErroApi(-1116, "Invalid orderType.")
+        cliente = p.get("clientAlgoId") or f"mockalgo{next(self.ids)}"
+
+        with self.lock:
+            if any(a["clientAlgoId"] == cliente and a["algoStatus"] == "NEW" for a in self.algos.values()):
+                raise ErroApi(-4116, "ClientOrderId is duplicated.")
+            algo_id = next(self.ids)
+            algo = {
+                "algoId": algo_id,
+                "clientAlgoId": cliente,
+                "algoType": "CONDITIONAL",
+                "orderType": p["type"],
+                "symbol": symbol,
+                "side": p["side"],
+                "positionSide": p.get("positionSide", "BOTH"),
+                "quantity": p.get("quantity", "0"),
+                "algoStatus": "NEW",
+                "triggerPrice": p.get("triggerPrice", "0"),
+                "activatePrice": p.get("activatePrice", "0"),
+                "callbackRate": p.get("callbackRate", "0"),
+                "workingType": p.get("workingType", "CONTRACT_PRICE"),
+                "createTime": _ms(),
+            }
+            self.algos[algo_id] = algo
+        return dict(algo)
+
+    def consultar_algo(self, p):
+        with self.lock:
+            for a in self.algos.values():
+                if str(a["algoId"]) == p.get("algoId") or a["clientAlgoId"] == p.get("clientAlgoId"):
+                    return dict(a)
+        raise ErroApi(-2013, "Order does not exist.")
+
+    def cancelar_ordem(self, p):
+        with self.lock:
+            ordem = self.ordens.get(int(p.get("orderId", 0)))
+            if not ordem or ordem["status"] not in ("NEW", "PARTIALLY_FILLED"):
+                raise ErroApi(-2011, "Unknown order sent.")
+            ordem["status"] = "CANCELED"
+        self._emitir_ordem(ordem)
+        return dict(ordem)
+
+    def _executar(self, oid):
+        with self.lock:
+            ordem = self.ordens.get(oid)
+            if not ordem or ordem["status"] != "NEW":
+                return
+            symbol, ps = ordem["symbol"], ordem["positionSide"]
+            preco = float(ordem["price"]) if ordem["type"] == "LIMIT" else self._preco(symbol)
+            qty = float(ordem["origQty"])
+
+            entrada = (ps == "LONG" and ordem["side"] == "BUY") or (ps == "SHORT" and ordem["side"] == "SELL")
+            atual_qty, atual_entry = self.posicoes.get((symbol, ps), (0.0, 0.0))
+            if entrada:
+                nova_qty = atual_qty + qty
+                atual_entry = (atual_qty * atual_entry + qty * preco) / nova_qty
+            else:
+                nova_qty = max(0.0, atual_qty - qty)
+            if nova_qty:
+                self.posicoes[(symbol, ps)] = (nova_qty, atual_entry)
+            else:
+                self.posicoes.pop((symbol, ps), None)
+
+            ordem.update(status="FILLED", avgPrice=f"{preco}", executedQty=f"{qty}", updateTime=_ms())
+
+        self._emitir_ordem(ordem)
+        self._emitir({
+            "e": "ACCOUNT_UPDATE", "E": _ms(), "T": _ms(),
+            "a": {
+                "m": "ORDER",
+                "B": [{"a": "USDT", "wb": "1000", "cw": "1000", "bc": "0"}],
+                "P": [{
+                    "s": symbol, "pa": f"{nova_qty * (-1 if ps == 'SHORT' else 1)}", "ep": f"{atual_entry}",
+                    "bep": "0", "cr": "0", "up": "0", "mt": "cross", "iw": "0", "ps": ps,
+                }],
+            },
+        })
+
+    # ======================================================
+    # 📡 USER DATA (eventos)
+    # ======================================================
+    def _emitir_ordem(self, o):
+        self._emitir({
+            "e": "ORDER_TRADE_UPDATE", "E": _ms(), "T": _ms(),
+            "o": {
+                "s": o["symbol"], "c": o["clientOrderId"], "S": o["side"], "o": o["type"], "f": o["timeInForce"],
+                "q": o["origQty"], "p": o["price"], "ap": o["avgPrice"], "sp": o["stopPrice"],
+                "x": "TRADE" if o["status"] in ("FILLED", "PARTIALLY_FILLED") else o["status"], "X": o["status"],
+                "i": o["orderId"], "l": o["executedQty"], "z": o["executedQty"], "L": o["avgPrice"],
+                "T": _ms(), "R": o["reduceOnly"], "cp": o["closePosition"], "ps": o["positionSide"],
+                "wt": "CONTRACT_PRICE", "ot": o["type"], "rp": "0",
+            },
+        })
+
+    def _emitir(self, evento):
+        texto = json.dumps(evento, separators=(",", ":"))
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._enviar_usuarios, texto)
+
+    def _enviar_usuarios(self, texto):
+        for ws in list(self.usuarios):
+            asyncio.ensure_future(_enviar(ws, texto))
+
+    def _agendar(self, atraso, func, *args):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.loop.call_later, atraso, func, *args)
+
+    # ======================================================
+    # 🔌 WEBSOCKET
+    # ======================================================
+    async def _conexao(self, ws, path=None):
+        path = path or getattr(ws, "path", None) or ws.request.path
+
+        if path.startswith("/ws/"):
+            if path[4:] not in self.listen_keys:
+                await ws.close()
+                return
+            self.usuarios.add(ws)
+            try:
+                await ws.wait_closed()
+            finally:
+                self.usuarios.discard(ws)
+            return
+
+        streams = parse_qs(urlparse(path).query).get("streams", [""])[0].split("/")
+        self.mercado[ws] = [s for s in streams if s]
+        try:
+            await ws.wait_closed()
+        finally:
+            self.mercado.pop(ws, None)
+
+    def _frames_mercado(self, streams):
+        por_symbol = {s.lower(): s for s in self.symbols}
+        for stream in streams:
+            if stream.startswith("!markPrice@arr"):
+                dados = [
+                    {"e": "markPriceUpdate", "E": _ms(), "s": s, "p": f"{self._preco(s):.4f}",
+                     "i": f"{self.precos[s]:.4f}", "r": "0.0001", "T": _ms() + 3_600_000}
+                    for s in self.symbols
+                ]
+            elif "@kline_" in stream:
+                nome, intervalo = stream.split("@kline_")
+                symbol = por_symbol.get(nome)
+                if not symbol:
+                    continue
+                passo = INTERVALOS_MS[intervalo]
+                k = self._kline(symbol, intervalo, _ms() // passo * passo)
+                dados = {"e": "kline", "E": _ms(), "s": symbol, "k": {
+                    "t": k[0], "T": k[6], "s": symbol, "i": intervalo, "o": k[1], "c": k[4],
+                    "h": k[2], "l": k[3], "v": k[5], "n": k[8], "x": False,
+                }}
+            else:
+                continue
+            yield json.dumps({"stream": stream, "data": dados}, separators=(",", ":"))
+
+    async def _loop_mercado(self):
+        while True:
+            await asyncio.sleep(1)
+            for ws, streams in list(self.mercado.items()):
+                for texto in self._frames_mercado(streams):
+                    await _enviar(ws, texto)
+
+    async def _main_ws(self):
+        self.loop = asyncio.get_running_loop()
+        async with websockets.serve(self._conexao, "127.0.0.1", self.porta_ws, max_size=None) as servidor:
+            if not self.porta_ws:
+                self.porta_ws = next(iter(servidor.sockets)).getsockname()[1]
+            self._pronto.set()
+            await self._loop_mercado()
+
+    # ======================================================
+    # ▶ INICIAR
+    # ======================================================
+    def iniciar(self):
+        self.http = ThreadingHTTPServer(("127.0.0.1", self.porta_rest), _handler_para(self))
+        self.http.daemon_threads = True
+        self.porta_rest = self.http.server_address[1]
+        threading.Thread(target=self.http.serve_forever, name="mock_rest", daemon=True).start()
+
+        threading.Thread(target=asyncio.run, args=(self._main_ws(),), name="mock_ws", daemon=True).start()
+        if not self._pronto.wait(10):
+            raise RuntimeError("mock WS não iniciou")
+
+        print(f"[MOCK] REST {self.url_rest} | WS {self.url_ws} | {len(self.symbols)} symbols")
+        return self
+
+    def esperar_batch(self, symbol, position_side, timeout=10.0):
+        """
+        Monotonic do primeiro batchOrders (TP) do lado, ou None no timeout.
+        """
+        chave = (symbol, position_side)
+        with self.cond:
+            self.cond.wait_for(lambda: chave in self.batches, timeout)
+            return self.batches.get(chave)
+
+    def contar_request(self, metodo, path):
+        with self.lock:
+            self.requests[(metodo, path)] = self.requests.get((metodo, path), 0) + 1
+            return sum(self.requests.values())
+
+    # rotas: (método, path) -> handler(params)
+    def rotas(self):
+        return {
+            ("GET", "/api/v3/ping"): lambda p: {},
+            ("GET", "/api/v3/time"): lambda p: {"serverTime": _ms()},
+            ("GET", "/fapi/v1/ping"): lambda p: {},
+            ("GET", "/fapi/v1/time"): lambda p: {"serverTime": _ms()},
+            ("GET", "/fapi/v1/exchangeInfo"): self.exchange_info,
+            ("GET", "/fapi/v1/premiumIndex"): self.premium_index,
+            ("GET", "/fapi/v1/klines"): self.klines,
+            ("GET", "/fapi/v2/positionRisk"): self.position_risk,
+            ("GET", "/fapi/v3/positionRisk"): self.position_risk_v3,
+            ("GET", "/fapi/v1/symbolConfig"): self.symbol_config,
+            ("GET", "/fapi/v1/openOrders"): self.open_orders,
+            ("POST", "/fapi/v1/order"): self.criar_ordem,
+            ("DELETE", "/fapi/v1/order"): self.cancelar_ordem,
+            ("POST", "/fapi/v1/batchOrders"): self.batch_orders,
+            ("POST", "/fapi/v1/algoOrder"): self.criar_algo,
+            ("GET", "/fapi/v1/algoOrder"): self.consultar_algo,
+            ("POST", "/fapi/v1/leverage"): self.leverage,
+            ("POST", "/fapi/v1/marginType"): self.margin_type,
+            ("POST", "/fapi/v1/listenKey"): self.listen_key,
+            ("PUT", "/fapi/v1/listenKey"): self.listen_key_keepalive,
+            ("DELETE", "/fapi/v1/listenKey"): self.listen_key_delete,
+        }
+
+
+async def _enviar(ws, texto):
+    try:
+        await ws.send(texto)
+    except Exception:
+        pass
+
+
+def _ler_batch(valor):
+    # python-binance manda a lista já url-encoded (aspas trocadas por %22)
+    for _ in range(3):
+        try:
+            return json.loads(valor)
+        except ValueError:
+            valor = unquote_plus(valor)
+    raise ErroApi(-1130, "Invalid data sent for a parameter.")
+
+# ==========================================================
+# 🌐 HTTP
+# ==========================================================
+def _handler_para(mock):
+    rotas = mock.rotas()
+
+    class Handler(BaseHTTPRequestHandler):
+
+        protocol_version = "HTTP/1.1"
+
+        def _params(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            if tamanho:
+                corpo = self.rfile.read(tamanho).decode()
+                params.update({k: v[-1] for k, v in parse_qs(corpo).items()})
+            return url.path, params
+
+        def _responder(self):
+            path, params = self._params()
+            peso = mock.contar_request(self.command, path) * PESO_POR_REQUEST
+            if mock.latencia:
+                time.sleep(mock.latencia)
+
+            rota = rotas.get((self.command, path))
+            try:
+                if not rota:
+                    raise ErroApi(-5000, f"Path {path} not mocked", http=404)
+                status, corpo = 200, rota(params)
+            except ErroApi as e:
+                status, corpo = e.http, {"code": e.code, "msg": e.msg}
+            except (KeyError, ValueError) as e:
+                status, corpo = 400, {"code": -1102, "msg": f"Mandatory parameter missing or malformed: {e}"}
+
+            dados = json.dumps(corpo).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(dados)))
+            self.send_header("X-MBX-USED-WEIGHT-1M", str(peso % 2400))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _responder
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def symbols_sinteticos(n):
+    return [f"BENCH{i:04d}USDT" for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binance Futures local para benchmarks")
+    parser.add_argument("--symbols", type=int, default=50, help="quantidade de symbols sintéticos")
+    parser.add_argument("--incluir", nargs="*", default=[], help="symbols reais adicionais (ex.: XRPUSDT)")
+    parser.add_argument("--porta-rest", type=int, default=8090)
+    parser.add_argument("--porta-ws", type=int, default=8091)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="RTT simulado por request REST")
+    parser.add_argument("--fill-limit", type=float, default=0.05, help="segundos até executar uma LIMIT de entrada")
+    args = parser.parse_args()
+
+    mock = MockBinance(
+        symbols_sinteticos(args.symbols) + args.incluir,
+        porta_rest=args.porta_rest,
+        porta_ws=args.porta_ws,
+        latencia=args.latencia_ms / 1000,
+        fill_limit=args.fill_limit,
+    ).iniciar()
+
+    print(f"export BINANCE_REST_URL={mock.url_rest}")
+    print(f"export BINANCE_WS_URL={mock.url_ws}")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"[MOCK] {sum(mock.requests.values())} requests | {len(mock.ordens)} ordens | {len(mock.posicoes)} posições")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
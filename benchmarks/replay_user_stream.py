@@ -0,0 +1,294 @@
+﻿# Arquivo - benchmarks/replay_user_stream.py
+# Replay de uma gravação do user data stream (WS_RECORD_FILE) nos handlers reais:
+# on_message -> decodificar -> despacho_ws -> tratar_ordem / atualizar_posicao -> pernas de proteção.
+# As ordens vão para um cliente falso (registra as chamadas, ids determinísticos), sem rede.
+# Reporta throughput, latência por evento (enfileirado -> tratado) e checksums do estado final.
+#
+# Uso:
+#   python benchmarks/replay_user_stream.py gravacoes/user_20260101.tsv.gz                # máxima velocidade
+#   python benchmarks/replay_user_stream.py gravacoes/user_20260101.tsv.gz --velocidade 1 # tempo real
+#   python benchmarks/replay_user_stream.py gravacoes/*.tsv.gz --velocidade 60 --filtros cache/exchange_info.json
+#   python benchmarks/replay_user_stream.py dia.tsv.gz --checksum <sha256>                 # regressão (exit 1 se mudar)
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+import asyncio
+import argparse
+import threading
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gravador_ws import ler_gravacao
+
+RE_SYMBOL = re.compile(r'"s":"([A-Z0-9]+)"')
+
+
+def percentis(valores):
+    if not valores:
+        return "sem amostras"
+    v = sorted(valores)
+    p = lambda q: v[min(len(v) - 1, int(round(q / 100 * (len(v) - 1))))]
+    return f"p50={p(50) * 1e6:8.1f}µs  p95={p(95) * 1e6:8.1f}µs  p99={p(99) * 1e6:8.1f}µs  max={v[-1] * 1e6:8.1f}µs"
+
+# ==========================================================
+# 🧪 CLIENTE DE ORDENS FALSO
+# ==========================================================
+class ClienteOrdensFalso:
+    """
+    Substitui o binance_client nos módulos do executor durante o replay.
+    Chamadas agrupadas por symbol (cada symbol roda num único worker -> ordem estável).
+    """
+
+    def __init__(self, symbols):
+        self.symbols = sorted(symbols)
+        self.precos = {}
+        self.chamadas = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _sem_client_id(params):
+        # newClientOrderId / clientAlgoId das pernas são aleatórios: fora do checksum e do orderId
+        return {k: v for k, v in params.items() if k not in ("newClientOrderId", "clientAlgoId")}
+
+    def _registrar(self, metodo, params):
+        with self._lock:
+            self.chamadas[params.get("symbol", "")].append((metodo, self._sem_client_id(params)))
+
+    def _ordem(self, params):
+        oid = zlib.crc32(json.dumps(self._sem_client_id(params), sort_keys=True, default=str).encode())
+        return dict(params, orderId=oid, status="NEW", clientOrderId=params.get("newClientOrderId", f"replay{oid}"))
+
+    def futures_create_order(self, **params):
+        self._registrar("futures_create_order", params)
+        return self._ordem(params)
+
+    def futures_place_batch_order(self, batchOrders):
+        for p in batchOrders:
+            self._registrar("futures_place_batch_order", p)
+        return [self._ordem(p) for p in batchOrders]
+
+    def futures_create_algo_order(self, **params):
+        self._registrar("futures_create_algo_order", params)
+        oid = self._ordem(params)["orderId"]
+        return dict(params, algoId=oid, algoStatus="NEW")
+
+    def futures_get_algo_order(self, **params):
+        return {}
+
+    def futures_cancel_order(self, **params):
+        self._registrar("futures_cancel_order", params)
+        return dict(params, status="CANCELED")
+
+    def futures_mark_price(self, symbol):
+        # último preço médio visto no replay para o symbol (atualizado no worker do symbol)
+        return {"symbol": symbol, "markPrice": str(self.precos.get(symbol, 0.0))}
+
+    def futures_get_open_orders(self, **params):
+        return []
+
+    def futures_position_information(self, **params):
+        return []
+
+    def futures_exchange_info(self):
+        filtros = [
+            {"filterType": "PRICE_FILTER", "tickSize": "0.0001"},
+            {"filterType": "LOT_SIZE", "stepSize": "1", "minQty": "1", "maxQty": "10000000"},
+            {"filterType": "MARKET_LOT_SIZE", "maxQty": "1000000"},
+            {"filterType": "MIN_NOTIONAL", "notional": "5"},
+        ]
+        return {"symbols": [{"symbol": s, "filters": filtros} for s in self.symbols]}
+
+    def total_chamadas(self):
+        contagem = defaultdict(int)
+        for chamadas in self.chamadas.values():
+            for metodo, _ in chamadas:
+                contagem[metodo] += 1
+        return dict(contagem)
+
+# ==========================================================
+# ⚙ AMBIENTE
+# ==========================================================
+def preparar_ambiente(pasta, filtros):
+    from bench_sinal_ordem import variaveis_telegram
+
+    os.environ.update(variaveis_telegram())
+    os.environ.update({
+        "USE_BINANCE": "false",
+        "STATE_DIR": os.path.join(pasta, "estado"),
+        "MARK_PRICE_MAX_AGE": "0",      # sem cache por relógio de parede: resultado determinístico
+        "WS_RECORD_FILE": "",
+    })
+    if filtros:
+        os.environ["EXCHANGE_INFO_CACHE_FILE"] = os.path.abspath(filtros)
+        os.environ["EXCHANGE_INFO_TTL"] = str(10 ** 12)
+    else:
+        os.environ["EXCHANGE_INFO_CACHE_FILE"] = os.path.join(pasta, "exchange_info.json")
+
+
+def instalar_cliente(cliente):
+    import executorwebsocket
+    import ordens_protecao
+    import cache_mark_price
+    import filtros_symbol
+    import livro_ordens
+    import alavancagem
+    import klines_store
+
+    for modulo in (executorwebsocket, ordens_protecao, cache_mark_price, filtros_symbol,
+                   livro_ordens, alavancagem, klines_store):
+        modulo.binance_client = cliente
+
+# ==========================================================
+# 🔢 ESTADO FINAL
+# ==========================================================
+def checksums(cliente):
+    import executorwebsocket as ew
+    import livro_ordens
+    from exposicao import exposicao_posicoes, exposicao_ordens
+
+    partes = {
+        "posicoes": ew.estado_posicoes,
+        "ordens_mm8": ew.ordens_mm8,
+        "livro": {str(k): v for k, v in livro_ordens._ordens.items()},
+        "exposicao": {"posicoes": exposicao_posicoes.como_dict(), "ordens": exposicao_ordens.como_dict()},
+        "chamadas": cliente.chamadas,
+    }
+
+    resultado = {}
+    total = hashlib.sha256()
+    for nome, valor in partes.items():
+        texto = json.dumps(valor, sort_keys=True, default=str).encode()
+        resultado[nome] = hashlib.sha256(texto).hexdigest()
+        total.update(texto)
+    resultado["total"] = total.hexdigest()
+    return resultado
+
+# ==========================================================
+# ▶ REPLAY
+# ==========================================================
+def main():
+    parser = argparse.ArgumentParser(description="Replay do user data stream gravado nos handlers do executor")
+    parser.add_argument("arquivos", nargs="+", help="gravações (WS_RECORD_FILE), em ordem")
+    parser.add_argument("--velocidade", type=float, default=0.0, help="1 = tempo real, N = N vezes, 0 = máxima")
+    parser.add_argument("--filtros", help="cache de filtros (cache/exchange_info.json) para tick/step reais")
+    parser.add_argument("--checksum", help="checksum total esperado (falha se diferente)")
+    args = parser.parse_args()
+
+    frames = []
+    for arquivo in args.arquivos:
+        frames.extend(ler_gravacao(arquivo))
+    if not frames:
+        print("Nenhum frame na gravação")
+        return 1
+
+    symbols = {s for _, frame in frames for s in RE_SYMBOL.findall(frame)}
+    total_bytes = sum(len(f) for _, f in frames)
+
+    pasta = tempfile.mkdtemp(prefix="replay_agulhadas_")
+    preparar_ambiente(pasta, args.filtros)
+    os.chdir(pasta)   # logs/ do structured_logger fora do repositório
+
+    import executorwebsocket as ew
+    from decodificador_ws import EventoOrdem
+    from filtros_symbol import carregar_filtros
+
+    cliente = ClienteOrdensFalso(symbols)
+    instalar_cliente(cliente)
+    carregar_filtros()
+
+    # ==================================================
+    # ⏱ MEDIÇÃO: enfileirado -> tratado, por evento
+    # ==================================================
+    despacho = ew.despacho_ws
+    handler = despacho.handler
+    tentar_despachar = despacho.tentar_despachar
+    esperar_vaga = despacho._esperar_vaga
+    latencias = []
+    duracoes = []
+    lock = threading.Lock()
+
+    def tentar_despachar_medido(symbol, item):
+        return tentar_despachar(symbol, (time.perf_counter(), item))
+
+    def esperar_vaga_medido(symbol, item):
+        esperar_vaga(symbol, (time.perf_counter(), item))
+
+    def handler_medido(par):
+        enfileirado, item = par
+        if type(item) is EventoOrdem and item.avg_price:
+            cliente.precos[item.symbol] = item.avg_price
+        inicio = time.perf_counter()
+        handler(item)
+        fim = time.perf_counter()
+        with lock:
+            latencias.append(fim - enfileirado)
+            duracoes.append(fim - inicio)
+
+    despacho.tentar_despachar = tentar_despachar_medido
+    despacho._esperar_vaga = esperar_vaga_medido
+    despacho.handler = handler_medido
+    despacho.iniciar()
+
+    # ==================================================
+    # 📡 FRAMES
+    # ==================================================
+    custo_on_message = []
+    ts0 = frames[0][0]
+    inicio = time.perf_counter()
+
+    for ts, frame in frames:
+        if args.velocidade and ts:
+            atraso = (ts - ts0) / args.velocidade - (time.perf_counter() - inicio)
+            if atraso > 0:
+                time.sleep(atraso)
+        t = time.perf_counter()
+        pendente = ew.on_message("replay", frame)
+        if pendente is not None:
+            # fila cheia: o gerenciador_streams aguardaria esta coroutine antes do próximo frame
+            asyncio.run(pendente)
+        custo_on_message.append(time.perf_counter() - t)
+
+    for fila in despacho.filas:
+        fila.join()
+    duracao = time.perf_counter() - inicio
+
+    # ==================================================
+    # 📊 RELATÓRIO
+    # ==================================================
+    metricas = despacho.metricas()
+    eventos = metricas["processados"] + metricas["erros"]
+    gravado = frames[-1][0] - ts0 if ts0 else 0.0
+
+    print("")
+    print(f"frames            : {len(frames)} ({total_bytes / 1e6:.1f} MB), {len(symbols)} symbols, {gravado / 3600:.1f}h gravadas")
+    print(f"eventos           : {eventos} (erros {metricas['erros']}, bloqueios de fila {metricas['bloqueios']})")
+    print(f"velocidade        : {'máxima' if not args.velocidade else f'{args.velocidade:g}x'}  {duracao:.2f}s")
+    print(f"throughput        : {len(frames) / duracao:,.0f} frames/s  {eventos / duracao:,.0f} eventos/s")
+    print(f"on_message        : {percentis(custo_on_message)}")
+    print(f"handler           : {percentis(duracoes)}")
+    print(f"enfileirado->fim  : {percentis(latencias)}")
+    print(f"cliente de ordens : {cliente.total_chamadas()}")
+    print(f"posições finais   : {len(ew.estado_posicoes)}")
+
+    soma = checksums(cliente)
+    print("")
+    for nome, valor in soma.items():
+        print(f"checksum {nome:<10}: {valor}")
+
+    if args.checksum and args.checksum != soma["total"]:
+        print(f"\n[FALHA] checksum total diferente do esperado {args.checksum}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
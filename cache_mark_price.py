@@ -0,0 +1,76 @@
+﻿# Arquivo - cache_mark_price.py
+# Cache de mark price de todas as moedas, alimentado pelo stream !markPrice@arr da Binance Futures
+# (assinado no gerenciador_streams).
+# Evita um REST (futures_mark_price) por sinal: o executor lê o preço da memória.
+# Se o dado estiver velho (MARK_PRICE_MAX_AGE) ou ausente, cai para o REST e atualiza o cache.
+
+import time
+import threading
+from config import binance_client, MARK_PRICE_MAX_AGE
+from decodificador_ws import loads
+
+# ==========================================================
+# 📦 CACHE (symbol -> (preço, instante monotônico))
+# ==========================================================
+_mark_prices = {}
+_lock = threading.Lock()
+
+
+def atualizar_mark_price(symbol, price, instante=None):
+    if instante is None:
+        instante = time.monotonic()
+    with _lock:
+        _mark_prices[symbol] = (price, instante)
+
+
+def mark_price_cache(symbol, max_age=MARK_PRICE_MAX_AGE):
+    """
+    Retorna o mark price em cache ou None se ausente/velho.
+    """
+    with _lock:
+        item = _mark_prices.get(symbol)
+
+    if not item:
+        return None
+
+    price, instante = item
+    if time.monotonic() - instante > max_age:
+        return None
+
+    return price
+
+
+def obter_mark_price(symbol):
+    """
+    Mark price com limite de idade.
+    Prioridade:
+    1. cache do stream (se dentro de MARK_PRICE_MAX_AGE)
+    2. Binance REST (fallback) -> atualiza o cache
+    """
+    price = mark_price_cache(symbol)
+    if price is not None:
+        return price
+
+    price = float(binance_client.futures_mark_price(symbol=symbol)["markPrice"])
+    atualizar_mark_price(symbol, price)
+    return price
+
+# ==========================================================
+# 📡 STREAM !markPrice@arr
+# ==========================================================
+def processar_mark_prices(itens):
+    agora = time.monotonic()
+    with _lock:
+        for item in itens:
+            _mark_prices[item["s"]] = (float(item["p"]), agora)
+
+
+STREAM_MARK_PRICE = "!markPrice@arr@1s"
+
+
+def processar_frame_mark_price(stream, texto):
+    processar_mark_prices(loads(texto))
+
+
+def registrar_stream_mark_price(gerenciador):
+    gerenciador.assinar([STREAM_MARK_PRICE], processar_frame_mark_price, nome="mark_price")
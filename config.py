@@ -13,6 +13,7 @@ from telethon.sessions import StringSession
 from telethon import TelegramClient, events 
 from binance.client import Client
 from dotenv import load_dotenv
+from metricas import instrumentar_client
 
 # -------------------------------------------------
 # Carrega variáveis de ambiente (.env local)
@@ -36,6 +37,19 @@ TARGET_CHAT_ID = int(os.environ.get("TARGET_CHAT_ID"))
 # Binance
 BINANCE_API_KEY = os.environ.get("BINANCE_API_KEY")
 BINANCE_API_SECRET = os.environ.get("BINANCE_API_SECRET")
+BINANCE_REST_URL = os.getenv("BINANCE_REST_URL", "") # ex.: http://127.0.0.1:8090 (benchmarks/mock_binance.py); vazio = Binance real
+
+
+def apontar_rest(cls):
+    """
+    Redireciona Client / AsyncClient para BINANCE_REST_URL (antes de instanciar:
+    o construtor já faz o ping no API_URL).
+    """
+    if BINANCE_REST_URL:
+        cls.API_URL = f"{BINANCE_REST_URL}/api"
+        cls.FUTURES_URL = f"{BINANCE_REST_URL}/fapi"
+        cls.FUTURES_DATA_URL = f"{BINANCE_REST_URL}/futures/data"
+    return cls
 
 DRY_RUN = False      # True = simula | False = envia ordem real
 FILTER_SYMBOLS = True  # True = filtra | False = envia tudo
@@ -48,11 +62,12 @@ if USE_BINANCE:
     if not BINANCE_API_KEY or not BINANCE_API_SECRET:
         raise RuntimeError("Chaves da Binance não definidas")
 
-    binance_client = Client(
+    binance_client = apontar_rest(Client)(
         BINANCE_API_KEY,
         BINANCE_API_SECRET,
         {"timeout": 30}
     )
+    instrumentar_client(binance_client)   # chamadas REST / peso usado no /metrics
 
 else:
     print("🟡 Binance desabilitada (modo Telegram apenas)")
@@ -90,125 +105,46 @@ telegram_client = TelegramClient(
 
 
 # -------------------------------------------------
-# PARÂMETROS DA ESTRATÉGIA (CONFIGURÁVEIS)
-# -------------------------------------------------
-
-LEVERAGE = int(os.getenv("LEVERAGE", 50))
-MAX_USDT = float(os.getenv("MAX_USDT", 1.5))
-MAX_PRECO_PERMITIDO = float(os.getenv("MAX_PRECO_PERMITIDO", 2.10)) # seleciona apenas moedas baratas
-MAX_POSICOES_ABERTAS = int(os.getenv("MAX_POSICOES_ABERTAS", 8))
-MAX_SHORTS = int(os.getenv("MAX_SHORTS", 5))
-MAX_LONGS = int(os.getenv("MAX_LONGS", 3))
-MARGIN_TYPE = os.getenv("MARGIN_TYPE", "CROSSED")
-HEDGE_MODE = os.getenv("HEDGE_MODE", "true").lower() == "true"
-
-# SL e TP
-TP_PARCIAL_PERCENT = float(os.getenv("TP_PARCIAL_PERCENT", 1.0))  # multiplicado pela alavancagem (1.0 com 25X = 25%)
-TP_PARCIAL_QTY = float(os.getenv("TP_PARCIAL_QTY", 0.5)) # retirada parcial de moedas (0.5 = 50%)
-
-
-# Trailing
-TRAILING_CALLBACK_RATE = float(os.getenv("TRAILING_CALLBACK_RATE", 1.0)) # percentual (1.0 = 1%)
-TRAILING_ACTIVATION_PERCENT = float(os.getenv("TRAILING_ACTIVATION_PERCENT", 5.0)) # 1% de variação do preço (equivale a 25% considerando 25x)
-
-ALLOWED_SYMBOLS = {
-    "1INCHUSDT", "ADAUSDT", "ALGOUSDT", "ALICEUSDT", "APEUSDT", "APTUSDT", "ARBUSDT", 
-    "ARPAUSDT", "ARUSDT", "ATAUSDT", "ATOMUSDT", "AXSUSDT", 
-    "BANDUSDT", "BATUSDT", "CELOUSDT", "CHZUSDT", "COTIUSDT", "CYBERUSDT",
-    "DOTUSDT", "DUSKUSDT", "DYDXUSDT", "ENAUSDT", "ENJUSDT",
-    "FETUSDT", "FILUSDT", "FOLKSUSDT", "GALAUSDT", "GMTUSDT", "GRTUSDT",
-    "HBARUSDT", "HOTUSDT", "ICPUSDT", "ICXUSDT", "IMXUSDT", "IOTXUSDT",
-    "JASMYUSDT", "JTOUSDT", "JUPUSDT", "KAVAUSDT", "KNCUSDT",
-    "LDOUSDT", "LPTUSDT", "LQTYUSDT", "LRCUSDT",
-    "MASKUSDT", "MTLUSDT", "NEARUSDT", "OGNUSDT", "ONDOUSDT", "ONEUSDT", "OPUSDT",
-    "PENDLEUSDT", "PEOPLEUSDT", "QTUMUSDT",
-    "RLCUSDT", "RSRUSDT", "RUNEUSDT", "SANDUSDT", "SEIUSDT", "SFPUSDT",
-    "SKLUSDT", "SNXUSDT", "STORJUSDT", "SUIUSDT", "SUSHIUSDT",
-    "THETAUSDT", "TONUSDT", "TRXUSDT",
-    "VETUSDT", "WLFIUSDT", "WOOUSDT", "XLMUSDT",
-    "XRPUSDT", "XTZUSDT", "ZILUSDT", "ZRXUSDT"
-
-#    "ASTERUSDT", "CHZUSDT", "DOGEUSDT", "ENAUSDT", "FHEUSDT", "FOLKSUSDT", "JASMYUSDT",
-#    "HUSDT", "LITUSDT", "JASMYUSDT", "UNIUSDT", "XMRUSDT", "XRPUSDT", "WLFIUSDT"
-}
-
-SYMBOL_FILTERS = {
-    "BTCUSDT": {'TICK_SIZE': '0.10', 'STEP_SIZE': '0.001'},
-    "ETHUSDT": {'TICK_SIZE': '0.01', 'STEP_SIZE': '0.001'},
-    "BCHUSDT": {'TICK_SIZE': '0.01', 'STEP_SIZE': '0.001'},
-    "XRPUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "LTCUSDT": {'TICK_SIZE': '0.01', 'STEP_SIZE': '0.001'},
-    "TRXUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "ETCUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.01'},
-    "LINKUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.01'},
-    "XLMUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "ADAUSDT": {'TICK_SIZE': '0.00010', 'STEP_SIZE': '1'},
-    "XMRUSDT": {'TICK_SIZE': '0.01', 'STEP_SIZE': '0.001'},
-    "DASHUSDT": {'TICK_SIZE': '0.01', 'STEP_SIZE': '0.001'},
-    "XTZUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "BNBUSDT": {'TICK_SIZE': '0.010', 'STEP_SIZE': '0.01'},
-    "VETUSDT": {'TICK_SIZE': '0.000001', 'STEP_SIZE': '1'},
-    "NEOUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.01'},
-    "THETAUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "ZILUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "KNCUSDT": {'TICK_SIZE': '0.00010', 'STEP_SIZE': '1'},
-    "ZRXUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "SXPUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "KAVAUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "BANDUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "RLCUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '0.1'},
-    "SNXUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "DOTUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "TRBUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "RUNEUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "SUSHIUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "EGLDUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "SOLUSDT": {'TICK_SIZE': '0.0100', 'STEP_SIZE': '0.01'},
-    "ICXUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "STORJUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "UNIUSDT": {'TICK_SIZE': '0.0010', 'STEP_SIZE': '1'},
-    "ENJUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "FLMUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "NEARUSDT": {'TICK_SIZE': '0.0010', 'STEP_SIZE': '1'},
-    "FILUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "RSRUSDT": {'TICK_SIZE': '0.000001', 'STEP_SIZE': '1'},
-    "BELUSDT": {'TICK_SIZE': '0.00010', 'STEP_SIZE': '1'},
-    "ZENUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "SKLUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "GRTUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "1INCHUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "CHZUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "SANDUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "ANKRUSDT": {'TICK_SIZE': '0.000001', 'STEP_SIZE': '1'},
-    "SFPUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "ALICEUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "HBARUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "ONEUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "HOTUSDT": {'TICK_SIZE': '0.000001', 'STEP_SIZE': '1'},
-    "MTLUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "OGNUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "GTCUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "MASKUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "ATAUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "DYDXUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "CELOUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "LPTUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "ENSUSDT": {'TICK_SIZE': '0.001', 'STEP_SIZE': '0.1'},
-    "PEOPLEUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "IMXUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "GMTUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "APEUSDT": {'TICK_SIZE': '0.0001', 'STEP_SIZE': '1'},
-    "WOOUSDT": {'TICK_SIZE': '0.00001', 'STEP_SIZE': '1'},
-    "JASMYUSDT": {'TICK_SIZE': '0.000001', 'STEP_SIZE': '1'},
-    "OPUSDT": {'TICK_SIZE': '0.0001000', 'STEP_SIZE': '0.1'},
-    "ICPUSDT": {'TICK_SIZE': '0.001000', 'STEP_SIZE': '1'},
-    "FETUSDT": {'TICK_SIZE': '0.0001000', 'STEP_SIZE': '1'},
-    "LQTYUSDT": {'TICK_SIZE': '0.000100', 'STEP_SIZE': '0.1'},
-    "ARBUSDT": {'TICK_SIZE': '0.000100', 'STEP_SIZE': '0.1'},
-    "SUIUSDT": {'TICK_SIZE': '0.000100', 'STEP_SIZE': '0.1'},
-    "CYBERUSDT": {'TICK_SIZE': '0.000100', 'STEP_SIZE': '0.1'},
-    "TIAUSDT": {'TICK_SIZE': '0.0001000', 'STEP_SIZE': '1'},
-    "JTOUSDT": {'TICK_SIZE': '0.000100', 'STEP_SIZE': '1'},
-    "JUPUSDT": {'TICK_SIZE': '0.0001000', 'STEP_SIZE': '1'},
-    "TONUSDT": {'TICK_SIZE': '0.0001000', 'STEP_SIZE': '0.1'},
-}
\ No newline at end of file
+# PARÂMETROS DA ESTRATÉGIA (config_estrategia.py, compartilhado com o backtest)
+# -------------------------------------------------
+from config_estrategia import (
+    LEVERAGE,
+    MAX_USDT,
+    MAX_PRECO_PERMITIDO,
+    MAX_POSICOES_ABERTAS,
+    MAX_SHORTS,
+    MAX_LONGS,
+    MARGIN_TYPE,
+    HEDGE_MODE,
+    TP_PARCIAL_PERCENT,
+    TP_PARCIAL_QTY,
+    TRAILING_CALLBACK_RATE,
+    TRAILING_ACTIVATION_PERCENT,
+    ALLOWED_SYMBOLS,
+    SYMBOL_FILTERS
+)
+
+# -------------------------------------------------
+# STREAMS / CACHES DE MERCADO
+# -------------------------------------------------
+BINANCE_WS_URL = os.getenv("BINANCE_WS_URL", "wss://fstream.binance.com")
+MARK_PRICE_MAX_AGE = float(os.getenv("MARK_PRICE_MAX_AGE", 5.0)) # segundos até o mark price do stream ser considerado velho
+EXCHANGE_INFO_CACHE_FILE = os.getenv("EXCHANGE_INFO_CACHE_FILE", os.path.join("cache", "exchange_info.json"))
+EXCHANGE_INFO_TTL = float(os.getenv("EXCHANGE_INFO_TTL", 6 * 3600)) # segundos entre refresh dos filtros (tick/step)
+LIVRO_ORDENS_RECONCILIAR = float(os.getenv("LIVRO_ORDENS_RECONCILIAR", 300)) # segundos entre reconciliações do livro de ordens local
+WS_WORKERS = int(os.getenv("WS_WORKERS", 4)) # workers que tratam os eventos do user data stream (shard por symbol)
+WS_FILA_MAX = int(os.getenv("WS_FILA_MAX", 1000)) # eventos por fila antes de segurar o socket (backpressure)
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0)) # porta do /metrics (Prometheus) no AgulhadasRailway; 0 = desligado
+WS_RECORD_FILE = os.getenv("WS_RECORD_FILE", "") # grava os frames do user data stream (aceita strftime, ex.: gravacoes/user_%Y%m%d.tsv.gz); vazio = desligado
+
+# -------------------------------------------------
+# SINAIS DO TELEGRAM
+# -------------------------------------------------
+DEDUPE_TTL = float(os.getenv("DEDUPE_TTL", 600)) # segundos em que repost / forward da mesma mensagem é descartado (abaixo da vela de 15m)
+DEDUPE_MAX = int(os.getenv("DEDUPE_MAX", 4096)) # chaves no cache de duplicatas
+
+# -------------------------------------------------
+# ESTADO PERSISTENTE (warm restart)
+# -------------------------------------------------
+STATE_DIR = os.getenv("STATE_DIR", os.path.join("cache", "estado")) # no Railway apontar para um volume montado
+STATE_SNAPSHOT_A_CADA = int(os.getenv("STATE_SNAPSHOT_A_CADA", 1000)) # registros no journal antes de compactar em snapshot
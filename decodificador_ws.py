@@ -0,0 +1,81 @@
+﻿# Arquivo - decodificador_ws.py
+# Decodificação rápida dos frames do user data stream.
+# - orjson quando instalado (fallback json da stdlib)
+# - descarta tipos de evento não tratados antes de qualquer parse
+# - converte ACCOUNT_UPDATE / ORDER_TRADE_UPDATE uma única vez em registros tipados
+
+import json
+from collections import namedtuple
+
+try:
+    import orjson
+    loads = orjson.loads
+    DECODER = "orjson"
+except ImportError:
+    loads = json.loads
+    DECODER = "json"
+
+# ==========================================================
+# 📦 REGISTROS
+# ==========================================================
+EventoPosicao = namedtuple("EventoPosicao", "symbol side qty entry")
+
+EventoOrdem = namedtuple(
+    "EventoOrdem",
+    "symbol side lado status tipo order_id client_id avg_price executed_qty reduce_only close_position"
+)
+
+# ==========================================================
+# 🔎 FILTRO ANTECIPADO (sem parse)
+# ==========================================================
+MARCA_ACCOUNT = '"e":"ACCOUNT_UPDATE"'
+MARCA_ORDEM = '"e":"ORDER_TRADE_UPDATE"'
+MARCA_EXPIRADO = '"e":"listenKeyExpired"'
+
+
+def _texto(message):
+    return message.decode() if isinstance(message, (bytes, bytearray)) else message
+
+
+def listen_key_expirado(message):
+    return MARCA_EXPIRADO in _texto(message)
+
+# ==========================================================
+# 🔢 CONVERSÃO
+# ==========================================================
+def _posicoes(a):
+    return [
+        EventoPosicao(p["s"], p["ps"], float(p["pa"]), float(p["ep"]))
+        for p in a["P"]
+    ]
+
+
+def _ordem(o):
+    return EventoOrdem(
+        o["s"],
+        o["ps"],
+        o["S"],
+        o["X"],
+        o["o"],
+        o["i"],
+        o.get("c", ""),
+        float(o.get("ap", 0)),
+        float(o.get("z", 0)),
+        o.get("R", False),
+        o.get("cp", False),
+    )
+
+
+def decodificar(message):
+    """
+    Retorna a lista de registros do frame ([] para eventos não tratados).
+    """
+    texto = _texto(message)
+
+    if MARCA_ORDEM in texto:
+        return [_ordem(loads(texto)["o"])]
+
+    if MARCA_ACCOUNT in texto:
+        return _posicoes(loads(texto)["a"])
+
+    return []
@@ -0,0 +1,68 @@
+﻿# Arquivo - dedupe_sinais.py
+# Cache limitado com TTL de mensagens já vistas no grupo de sinais (repost, forward, reentrega no reconnect).
+# Chaves: (chat, message id) e hash do conteúdo normalizado; qualquer uma já vista dentro do TTL
+# descarta a mensagem antes do parse, do trace e de qualquer chamada à corretora.
+# Cheio, descarta as chaves mais antigas. O TTL fica abaixo da vela de 15m: o mesmo texto na vela seguinte é sinal novo.
+
+import time
+import threading
+from collections import OrderedDict
+
+TTL_PADRAO = 600.0        # segundos
+TAMANHO_PADRAO = 4096     # chaves (duas por mensagem)
+
+
+def normalizar(texto):
+    return " ".join(texto.lower().split())
+
+
+def chaves_mensagem(chat_id, message_id, texto):
+    return (("id", chat_id, message_id), ("texto", hash(normalizar(texto))))
+
+
+class CacheDedupe:
+
+    def __init__(self, tamanho_max=TAMANHO_PADRAO, ttl=TTL_PADRAO):
+        self.tamanho_max = tamanho_max
+        self.ttl = ttl
+        self._expira = OrderedDict()   # chave -> monotonic de expiração (ordem de inserção = ordem de expiração)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def duplicada(self, chaves):
+        """
+        True se alguma chave já foi vista dentro do TTL.
+        Chaves novas (ou expiradas) entram no cache; as vigentes não renovam o TTL,
+        senão um canal que reposta a cada poucos minutos nunca sairia do cache.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            while self._expira:
+                chave, expira = next(iter(self._expira.items()))
+                if expira > agora:
+                    break
+                del self._expira[chave]
+
+            duplicada = False
+            for chave in chaves:
+                if chave in self._expira:
+                    duplicada = True
+                else:
+                    self._expira[chave] = agora + self.ttl
+
+            while len(self._expira) > self.tamanho_max:
+                self._expira.popitem(last=False)
+
+            if duplicada:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return duplicada
+
+    def __len__(self):
+        return len(self._expira)
+
+    def metricas(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tamanho": len(self._expira)}
@@ -0,0 +1,120 @@
+﻿# Arquivo - despacho_eventos.py
+# Desacopla a thread do websocket do tratamento dos eventos.
+# A thread do socket só decodifica e enfileira; um pool de workers processa.
+# Filas limitadas e particionadas por symbol (mesmo symbol -> mesmo worker -> ordem preservada).
+# Fila cheia bloqueia o produtor (backpressure) e é contabilizada nas métricas.
+# No event loop do gerenciador_streams use despachar_async: a espera vai para uma thread
+# e só o socket que produziu fica parado (os outros streams e os pings seguem).
+
+import time
+import zlib
+import queue
+import asyncio
+import threading
+
+
+class DespachoEventos:
+
+    def __init__(self, n_workers, tamanho_fila, handler, nome="ws"):
+        self.n_workers = n_workers
+        self.handler = handler
+        self.nome = nome
+        self.filas = [queue.Queue(maxsize=tamanho_fila) for _ in range(n_workers)]
+        self.iniciado = False
+        self._lock = threading.Lock()
+
+        # métricas
+        self.enfileirados = 0
+        self.processados = 0
+        self.erros = 0
+        self.bloqueios = 0
+        self.tempo_bloqueado = 0.0
+        self.max_profundidade = 0
+
+    def iniciar(self):
+        with self._lock:
+            if self.iniciado:
+                return
+            self.iniciado = True
+
+        for i in range(self.n_workers):
+            threading.Thread(
+                target=self._worker,
+                args=(i,),
+                name=f"{self.nome}_worker_{i}",
+                daemon=True
+            ).start()
+
+    def shard(self, symbol):
+        return zlib.crc32(symbol.encode()) % self.n_workers
+
+    def tentar_despachar(self, symbol, item):
+        """
+        Enfileira sem bloquear. False se a fila do shard estiver cheia.
+        """
+        fila = self.filas[self.shard(symbol)]
+        try:
+            fila.put_nowait(item)
+        except queue.Full:
+            return False
+        self._contabilizar(fila)
+        return True
+
+    def despachar(self, symbol, item):
+        # threads comuns (ressincronização, reconciliação): podem bloquear
+        if not self.tentar_despachar(symbol, item):
+            self._esperar_vaga(symbol, item)
+
+    async def despachar_async(self, symbol, item):
+        # event loop: a espera roda numa thread, o loop segue atendendo os outros streams
+        if not self.tentar_despachar(symbol, item):
+            await asyncio.to_thread(self._esperar_vaga, symbol, item)
+
+    def _esperar_vaga(self, symbol, item):
+        # backpressure: segura o produtor até o worker do shard liberar espaço
+        fila = self.filas[self.shard(symbol)]
+        inicio = time.monotonic()
+        fila.put(item)
+        espera = time.monotonic() - inicio
+        with self._lock:
+            self.bloqueios += 1
+            self.tempo_bloqueado += espera
+        print(f"[{self.nome.upper()}] Fila {self.shard(symbol)} cheia — socket bloqueado {espera * 1000:.0f}ms")
+        self._contabilizar(fila)
+
+    def _contabilizar(self, fila):
+        profundidade = fila.qsize()
+        with self._lock:
+            self.enfileirados += 1
+            if profundidade > self.max_profundidade:
+                self.max_profundidade = profundidade
+
+    def _worker(self, i):
+        fila = self.filas[i]
+        while True:
+            item = fila.get()
+            try:
+                self.handler(item)
+                with self._lock:
+                    self.processados += 1
+            except Exception as e:
+                with self._lock:
+                    self.erros += 1
+                print(f"[ERRO] {self.nome} worker {i}: {e}")
+            finally:
+                fila.task_done()
+
+    def profundidades(self):
+        return [f.qsize() for f in self.filas]
+
+    def metricas(self):
+        with self._lock:
+            return {
+                "enfileirados": self.enfileirados,
+                "processados": self.processados,
+                "erros": self.erros,
+                "bloqueios": self.bloqueios,
+                "tempo_bloqueado": self.tempo_bloqueado,
+                "max_profundidade": self.max_profundidade,
+                "profundidades": self.profundidades(),
+            }
@@ -0,0 +1,285 @@
+﻿# Arquivo - executor_async.py
+# Caminho asyncio nativo do executar_ordem para o loop do Telethon (AgulhadasRailway).
+# Usa um AsyncClient da Binance compartilhado (uma sessão aiohttp, conexões keep-alive)
+# em vez de asyncio.to_thread + Client síncrono. O executor síncrono segue para o Flask.
+
+import asyncio
+from datetime import datetime
+from contextlib import asynccontextmanager
+from binance import AsyncClient
+from config import (
+    BINANCE_API_KEY,
+    BINANCE_API_SECRET,
+    MAX_PRECO_PERMITIDO,
+    MARGIN_TYPE,
+    LEVERAGE,
+    USE_BINANCE,
+    DRY_RUN,
+    apontar_rest
+)
+from cache_mark_price import mark_price_cache, atualizar_mark_price
+from klines_store import mm8_store
+from filtros_symbol import filtros_symbol
+from alavancagem import config_aplicada, config_em_dia, marcar_config, ERRO_MARGEM_SEM_MUDANCA
+from executorwebsocket import (
+    TF_MAP,
+    marcar_sinal_executado,
+    validar_sinal,
+    montar_ordem_entrada,
+    registrar_ordem_entrada,
+    obter_spec,
+    symbol_locks
+)
+from tracing import trace_do_sinal, marcar_envio, marcar_aceito, finalizar
+from metricas import sinais_ignorados, ordens_enviadas, ordens_erro, instrumentar_client
+
+# ==========================================================
+# 🔌 CLIENTE ASYNC COMPARTILHADO
+# ==========================================================
+_async_client = None
+_lock_client = None
+
+
+
+async def obter_async_client():
+    global _async_client, _lock_client
+
+    if _async_client:
+        return _async_client
+
+    if _lock_client is None:
+        _lock_client = asyncio.Lock()
+
+    async with _lock_client:
+        if not _async_client:
+            _async_client = await apontar_rest(AsyncClient).create(
+                BINANCE_API_KEY,
+                BINANCE_API_SECRET,
+                requests_params={"timeout": 30}
+            )
+            instrumentar_client(_async_client)
+            print("[ASYNC] Cliente Binance async conectado")
+
+    return _async_client
+
+
+async def fechar_async_client():
+    global _async_client
+
+    if _async_client:
+        await _async_client.close_connection()
+        _async_client = None
+
+# ==========================================================
+# 💲 LEITURAS (cache primeiro, REST async no fallback)
+# ==========================================================
+async def preco_atual_async(symbol):
+    price = mark_price_cache(symbol)
+    if price is not None:
+        return price
+
+    client = await obter_async_client()
+    price = float((await client.futures_mark_price(symbol=symbol))["markPrice"])
+    atualizar_mark_price(symbol, price)
+    return price
+
+
+async def preco_permitido_async(symbol):
+    try:
+        price = await preco_atual_async(symbol)
+        if price <= MAX_PRECO_PERMITIDO:
+            return True, price
+        print(f"[SKIP] {symbol} ignorado — preço alto: {price}")
+        return False, price
+    except Exception as e:
+        print(f"[ERROR] Falha ao consultar preço de {symbol}: {e}")
+        return False, None
+
+
+async def obter_spec_async(symbol):
+    if filtros_symbol(symbol):
+        return obter_spec(symbol)
+    # miss: fallback estático / refresh do índice (download grande) fora do loop
+    return await asyncio.to_thread(obter_spec, symbol)
+
+
+async def calcular_mm8_async(symbol, timeframe):
+    mm8 = mm8_store(symbol, timeframe)
+
+    if mm8 is None:
+        client = await obter_async_client()
+        klines = await client.futures_klines(
+            symbol=symbol,
+            interval=TF_MAP[timeframe],
+            limit=9
+        )
+        closes = [float(k[4]) for k in klines]
+        mm8 = sum(closes[-8:]) / 8
+
+    spec = await obter_spec_async(symbol)
+    return spec.preco(mm8)
+
+
+async def garantir_config_symbol_async(symbol):
+    atual = config_aplicada(symbol)
+    client = None
+
+    if atual.get("margin") != MARGIN_TYPE:
+        client = await obter_async_client()
+        try:
+            await client.futures_change_margin_type(symbol=symbol, marginType=MARGIN_TYPE)
+            marcar_config(symbol, margin=MARGIN_TYPE)
+        except Exception as e:
+            if getattr(e, "code", None) == ERRO_MARGEM_SEM_MUDANCA:
+                marcar_config(symbol, margin=MARGIN_TYPE)
+            else:
+                print(f"[ERRO] Margem {symbol}: {e}")
+
+    if atual.get("leverage") != LEVERAGE:
+        client = client or await obter_async_client()
+        try:
+            await client.futures_change_leverage(symbol=symbol, leverage=LEVERAGE)
+            marcar_config(symbol, leverage=LEVERAGE)
+        except Exception as e:
+            print(f"[ERRO] Alavancagem {symbol}: {e}")
+
+# ==========================================================
+# ⚡ PRÉ-TRADE CONCORRENTE
+# ==========================================================
+async def coletar_pre_trade_async(symbol, timeframe, completo=True, trace=None):
+    """
+    Mesma lógica do coletar_pre_trade síncrono: leituras em memória inline,
+    as que precisam de REST viram tasks concorrentes no loop e são canceladas
+    se o preço reprovar. Retorna o snapshot ou None.
+    """
+    leituras = [("preco", preco_permitido_async, mark_price_cache(symbol) is not None, (symbol,))]
+    if completo:
+        leituras += [
+            ("config", garantir_config_symbol_async, config_em_dia(symbol), (symbol,)),
+            ("filtros", obter_spec_async, filtros_symbol(symbol) is not None, (symbol,)),
+            ("mm8", calcular_mm8_async, mm8_store(symbol, timeframe) is not None, (symbol, timeframe)),
+        ]
+    if trace:
+        leituras = [(nome, trace.medido_async(nome, func), m, args) for nome, func, m, args in leituras]
+
+    resultados = {}
+
+    # preço em cache: decide antes de disparar qualquer REST
+    nome, func, em_memoria, args = leituras[0]
+    if em_memoria:
+        resultados[nome] = await func(*args)
+        if not resultados[nome][0]:
+            return None
+
+    tasks = {
+        nome: asyncio.create_task(func(*args))
+        for nome, func, em_memoria, args in leituras
+        if not em_memoria
+    }
+
+    try:
+        for nome, func, em_memoria, args in leituras[1:]:
+            if em_memoria:
+                resultados[nome] = await func(*args)
+
+        if "preco" in tasks:
+            resultados["preco"] = await tasks.pop("preco")
+            if not resultados["preco"][0]:
+                return None
+
+        for nome, task in tasks.items():
+            resultados[nome] = await task
+
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    snapshot = {"mark_price": resultados["preco"][1]}
+    if completo:
+        snapshot["spec"] = resultados["filtros"]
+        snapshot["price"] = resultados["mm8"]
+    return snapshot
+
+# ==========================================================
+# 🔒 LOCK POR SYMBOL (o mesmo dos workers do WS)
+# ==========================================================
+@asynccontextmanager
+async def lock_symbol(symbol):
+    """
+    symbol_locks[symbol] do executorwebsocket sem bloquear o loop: entrada nova e
+    tratamento de fill do mesmo symbol seguem serializados. Livre -> pega na hora;
+    ocupado -> espera numa thread.
+    """
+    lock = symbol_locks[symbol]
+    if not lock.acquire(blocking=False):
+        espera = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+        try:
+            await asyncio.shield(espera)
+        except asyncio.CancelledError:
+            # a thread ainda vai pegar o lock: solta assim que pegar
+            espera.add_done_callback(lambda _: lock.release())
+            raise
+    try:
+        yield
+    finally:
+        lock.release()
+
+# ==========================================================
+# 📌 EXECUTOR ASYNC
+# ==========================================================
+async def executar_ordem_async(sinal: dict):
+    symbol = sinal["symbol"]
+    side = sinal["side"]
+    timeframe = sinal["timeframe"]
+
+    trace = trace_do_sinal(sinal)
+
+    try:
+        async with lock_symbol(symbol):
+
+            # 🔒 VELA / POSIÇÃO / EXPOSIÇÃO (local)
+            with trace.span("validacao"):
+                validado = validar_sinal(symbol, side, timeframe)
+            if not validado:
+                return
+            vela, chave = validado
+
+            # ⚡ PRÉ-TRADE: preço + alavancagem/margem + filtros + MM8
+            simulado = not USE_BINANCE or DRY_RUN
+            with trace.span("pre_trade"):
+                snapshot = await coletar_pre_trade_async(symbol, timeframe, completo=not simulado, trace=trace)
+            if not snapshot:
+                print(f"[SKIP] Preço não permitido")
+                sinais_ignorados.inc("preco")
+                return
+
+            if simulado:
+                print("[SIMULADO]")
+                sinais_ignorados.inc("simulado")
+                return
+
+            price = snapshot["price"]
+            params = montar_ordem_entrada(symbol, side, sinal["order_type"], price, trace.signal_id)
+
+            # 🚀 ENVIO DA ORDEM
+            try:
+                client = await obter_async_client()
+                marcar_envio(trace, sinal["order_type"])
+                with trace.span("envio"):
+                    order = await client.futures_create_order(**params)
+                marcar_aceito(trace)
+                ordens_enviadas.inc(sinal["order_type"])
+                # journal (write + flush, fsync no snapshot) fora do loop
+                await asyncio.to_thread(registrar_ordem_entrada, order, sinal, params, price, vela)
+
+            except Exception as e:
+                ordens_erro.inc()
+                print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [ERROR] {e}")
+
+            # 🔐 MARCAR COMO EXECUTADO
+            await asyncio.to_thread(marcar_sinal_executado, chave, vela)
+
+    finally:
+        # ordem aceita: o trace termina no evento do WS (tratar_ordem)
+        if not trace.aceito:
+            finalizar(trace)
@@ -14,16 +14,29 @@ Executor de ordens Binance (Futures) - Estratégia:
 
 """
 
-import math
 import time
 import requests
 import threading
-import websocket
-import json
 from binance.client import Client
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from structured_logger import log_event
+from cache_mark_price import obter_mark_price, mark_price_cache
+from klines_store import mm8_store
+from filtros_symbol import filtros_symbol, atualizar_por_falta, versao_filtros
+from symbol_spec import SymbolSpec, quantizar
+from livro_ordens import aplicar_evento_ordem, registrar_ordem_enviada, contagem_ordens_entrada, semear_livro, ordem_de_entrada
+from exposicao import exposicao_posicoes, exposicao_ordens
+from alavancagem import garantir_config_symbol, config_em_dia
+from ordens_protecao import enviar_pernas
+from despacho_eventos import DespachoEventos
+from decodificador_ws import decodificar, EventoOrdem, EventoPosicao
+from supervisor_ws import SupervisorUserStream
+from journal_estado import JournalEstado
+from gravador_ws import GravadorFrames
+from tracing import trace_do_sinal, marcar_envio, marcar_aceito, confirmar_ws, finalizar
+from metricas import sinais_ignorados, ordens_enviadas, ordens_erro, estado_tamanho, fila_profundidade, fila_eventos
 from config import (
     binance_client,
     MAX_USDT,
@@ -32,14 +45,18 @@ from config import (
     MAX_POSICOES_ABERTAS,
     MAX_LONGS,
     MAX_SHORTS,
-    MARGIN_TYPE,
     DRY_RUN,
     USE_BINANCE,
     TRAILING_CALLBACK_RATE,
     TRAILING_ACTIVATION_PERCENT,
     TP_PARCIAL_PERCENT,
     TP_PARCIAL_QTY,
-    SYMBOL_FILTERS
+    SYMBOL_FILTERS,
+    WS_WORKERS,
+    WS_FILA_MAX,
+    STATE_DIR,
+    STATE_SNAPSHOT_A_CADA,
+    WS_RECORD_FILE
 )
 
 # ==========================================================
@@ -50,169 +67,175 @@ estado_posicoes = {}
 estado_ordens = {}
 ordens_mm8 = {}
 
+# journal das mutações (restaurado no boot por restaurar_estado)
+journal = JournalEstado(STATE_DIR, {
+    "posicoes": estado_posicoes,
+    "sinais": executed_signals,
+    "mm8": ordens_mm8,
+}, STATE_SNAPSHOT_A_CADA)
+
+# ==========================================================
+# 🔢 MUTAÇÕES DE POSIÇÃO (mantêm exposicao_posicoes e o journal em dia)
+# ==========================================================
+_lock_posicoes = threading.Lock()
+
+def registrar_posicao(symbol, side, dados):
+    # também usado depois de alterar os dados da posição no lugar (grava no journal)
+    with _lock_posicoes:
+        chave = f"{symbol}_{side}"
+        if chave not in estado_posicoes:
+            exposicao_posicoes.somar(symbol, side, 1)
+        estado_posicoes[chave] = dados
+        journal.registrar("posicoes", chave, dados)
+
+def remover_posicao(symbol, side):
+    with _lock_posicoes:
+        chave = f"{symbol}_{side}"
+        if estado_posicoes.pop(chave, None) is not None:
+            exposicao_posicoes.somar(symbol, side, -1)
+            journal.remover("posicoes", chave)
+
+# ==========================================================
+# 🔢 MUTAÇÕES DE SINAIS / ORDENS MM8
+# ==========================================================
+def marcar_sinal_executado(chave, vela):
+    executed_signals[chave] = vela
+    journal.registrar("sinais", chave, vela)
+
+def registrar_ordem_mm8(chave, dados):
+    ordens_mm8[chave] = dados
+    journal.registrar("mm8", chave, dados)
+
+def remover_ordem_mm8(chave):
+    if ordens_mm8.pop(chave, None) is not None:
+        journal.remover("mm8", chave)
+
 # ==========================================================
 # 🔐 LOCK POR SYMBOL (evita execução concorrente)
 # ==========================================================
 symbol_locks = defaultdict(threading.Lock)
 
 # ==========================================================
-# 📦 CACHE RUNTIME DE FILTROS (evita chamadas repetidas)
+# 📦 FILTROS POR SYMBOL (índice do exchange info)
 # ==========================================================
-_runtime_filters = {}
-
 def get_symbol_filters(symbol):
     """
     Retorna (tick_size, step_size)
     Prioridade:
-    1. config.SYMBOL_FILTERS
-    2. cache runtime
-    3. Binance (fallback único)
+    1. índice do exchange info (filtros_symbol, carregado no startup)
+    2. config.SYMBOL_FILTERS (fallback estático)
+    3. refresh do índice (moeda nova listada depois da carga), limitado por symbol
     """
 
-    # 1️⃣ CONFIG
+    # 1️⃣ ÍNDICE
+    f = filtros_symbol(symbol)
+    if f:
+        return f["tick"], f["step"]
+
+    # 2️⃣ CONFIG
     if symbol in SYMBOL_FILTERS:
         tick = float(SYMBOL_FILTERS[symbol]["TICK_SIZE"])
         step = float(SYMBOL_FILTERS[symbol]["STEP_SIZE"])
         return tick, step
 
-    # 2️⃣ CACHE
-    if symbol in _runtime_filters:
-        return _runtime_filters[symbol]
-
     # 3️⃣ BINANCE
-    info = binance_client.futures_exchange_info()
-
-    for s in info["symbols"]:
-        if s["symbol"] == symbol:
-            tick = None
-            step = None
-
-            for f in s["filters"]:
-                if f["filterType"] == "PRICE_FILTER":
-                    tick = float(f["tickSize"])
-                if f["filterType"] == "LOT_SIZE":
-                    step = float(f["stepSize"])
+    atualizar_por_falta(symbol)
 
-            if tick and step:
-                _runtime_filters[symbol] = (tick, step)
-                return tick, step
+    f = filtros_symbol(symbol)
+    if f:
+        return f["tick"], f["step"]
 
     raise Exception(f"Filtros não encontrados para {symbol}")
 
 # ==========================================================
-# 📡 WEBSOCKET USER DATA STREAM
+# 📡 WEBSOCKET USER DATA STREAM (supervisor_ws)
 # ==========================================================
-def iniciar_user_stream():
-    try:
-        resp = binance_client.futures_stream_get_listen_key()
-
-        # compatível com qualquer versão da lib
-        listen_key = resp["listenKey"] if isinstance(resp, dict) else resp
-
-        print(f"[WS] listenKey obtido")
-
-        threading.Thread(
-            target=renovar_listen_key,
-            args=(listen_key,),
-            daemon=True
-        ).start()
-
-        threading.Thread(
-            target=rodar_ws,
-            args=(listen_key,),
-            daemon=True
-        ).start()
-
-    except Exception as e:
-        print(f"[ERRO] WebSocket: {e}")
-
-def iniciar_listener_ws():
-    threading.Thread(
-        target=iniciar_user_stream,
-        daemon=True
-    ).start()
-
-def rodar_ws(listen_key):
-    url = f"wss://fstream.binance.com/ws/{listen_key}"
-
-    ws = websocket.WebSocketApp(
-        url,
-        on_message=on_message,
-        on_error=lambda ws, err: print("[WS ERRO]", err),
-        on_close=lambda ws: print("[WS] fechado"),
+def iniciar_user_stream(gerenciador):
+    # listenKey / keepalive / resync no supervisor; conexão e backoff no gerenciador_streams
+    supervisor = SupervisorUserStream(
+        on_frame=on_message,
+        on_reconectado=ressincronizar_estado
     )
+    supervisor.registrar(gerenciador)
+    return supervisor
 
-    while True:
-        try:
-            ws.run_forever()
-        except Exception as e:
-            print("Reconectando WS", e)
-
-        print("[WS] Reconectando em 5s...")
-        time.sleep(5)
+def iniciar_listener_ws(gerenciador):
+    despacho_ws.iniciar()
+    return iniciar_user_stream(gerenciador)
 
 
 # ==========================================================
 # 🔢 Atualização de posição pelo WebSocket
 # ==========================================================
-def atualizar_posicoes(account_data):
+def atualizar_posicoes(posicoes):
 
-    for pos in account_data["P"]:
-        symbol = pos["s"]
-        side = pos["ps"]
-        qty = float(pos["pa"])
-        entry = float(pos["ep"])
+    for pos in posicoes:
+        atualizar_posicao(pos)
 
-        chave = f"{symbol}_{side}"
+def atualizar_posicao(pos):
+    # pos: EventoPosicao (decodificador_ws), campos já convertidos
+    symbol = pos.symbol
+    side = pos.side
+    qty = pos.qty
+    entry = pos.entry
 
-        # posição fechada
-        if qty == 0:
-            estado_posicoes.pop(chave, None)
-            continue
+    chave = f"{symbol}_{side}"
 
-        estado_anterior = estado_posicoes.get(chave)
+    # posição fechada
+    if qty == 0:
+        remover_posicao(symbol, side)
+        return
 
-        # posição nova detectada
-        if not estado_anterior:
-            print(f"[EVENTO] Nova posição confirmada {symbol} {entry}")
+    estado_anterior = estado_posicoes.get(chave)
 
-            enviar_tp_parcial(symbol, side, abs(qty), entry)
+    # posição nova detectada
+    if not estado_anterior:
+        print(f"[EVENTO] Nova posição confirmada {symbol} {entry}")
 
-            estado_posicoes[chave] = {
-                "qty": abs(qty),
-                "entry": entry,
-                "tp_enviado": True,
-                "trailing_enviado": False
-            }
-            # LOG
-            log_event(
-                event_type="TP_SENT",
-                symbol=symbol,
-                side=side,
-                price=avg_price,
-                qty=executed_qty
-            )
+        enviar_tp_parcial(symbol, side, abs(qty), entry)
 
+        registrar_posicao(symbol, side, {
+            "qty": abs(qty),
+            "entry": entry,
+            "tp_enviado": True,
+            "trailing_enviado": False
+        })
+        # LOG
+        log_event(
+            event_type="TP_SENT",
+            symbol=symbol,
+            side=side,
+            price=entry,
+            qty=abs(qty)
+        )
 
-        else:
-            # apenas atualizar dados
-            estado_posicoes[chave]["qty"] = abs(qty)
-            estado_posicoes[chave]["entry"] = entry
+    else:
+        # apenas atualizar dados
+        estado_anterior["qty"] = abs(qty)
+        estado_anterior["entry"] = entry
+        registrar_posicao(symbol, side, estado_anterior)
 
 # ==========================================================
 # 🔢 Tratamento de ordens (sem consultar posição)
 # ==========================================================
 def tratar_ordem(order_data):
 
-    symbol = order_data["s"]
-    side = order_data["ps"]
-    status = order_data["X"]
-    avg_price = float(order_data.get("ap", 0))
-    executed_qty = float(order_data.get("z", 0))
-    order_id = order_data["i"]
+    # order_data: EventoOrdem (decodificador_ws), campos já convertidos
+    symbol = order_data.symbol
+    side = order_data.side
+    status = order_data.status
+    avg_price = order_data.avg_price
+    executed_qty = order_data.executed_qty
+    order_id = order_data.order_id
 
     chave = f"{symbol}_{side}"
 
+    # livro local de ordens de entrada
+    aplicar_evento_ordem(order_data)
+
+    # latência envio -> evento no WS (client_id = signal_id das ordens deste processo)
+    confirmar_ws(order_data.client_id, status)
+
     # Entrada executada
     if status == "FILLED" and chave not in estado_posicoes:
         with symbol_locks[symbol]:
@@ -221,7 +244,7 @@ def tratar_ordem(order_data):
             # remover do controle MM8
             for k in list(ordens_mm8.keys()):
                 if k.startswith(f"{symbol}_{side}_"):
-                    ordens_mm8.pop(k, None)
+                    remover_ordem_mm8(k)
 
             # LOG
             log_event(
@@ -230,16 +253,17 @@ def tratar_ordem(order_data):
                 side=side,
                 price=avg_price,
                 qty=executed_qty,
-                order_id=order_data["i"],
-                status=status
+                order_id=order_id,
+                status=status,
+                signal_id=order_data.client_id
             )
 
-            estado_posicoes[chave] = {
+            registrar_posicao(symbol, side, {
                 "qty": abs(executed_qty),
                 "entry": avg_price,
                 "tp_enviado": True,
                 "trailing_enviado": False
-            }
+            })
 
             # Enviar TP parcial
             enviar_tp_parcial(symbol, side, executed_qty, avg_price)
@@ -270,8 +294,7 @@ def tratar_ordem(order_data):
 
         if not pos.get("trailing_enviado"):
             print(f"[EVENTO] Parcial executada {symbol}")
-            mover_stop_para_lucro(symbol, side, pos["entry"], pos["qty"])
-            enviar_trailing_stop(symbol, side, pos["entry"], pos["qty"])
+            enviar_protecao_pos_parcial(symbol, side, pos["entry"], pos["qty"])
             # LOG
             log_event(
                 event_type="TRAILING_SENT",
@@ -280,21 +303,52 @@ def tratar_ordem(order_data):
             )
 
             pos["trailing_enviado"] = True
+            registrar_posicao(symbol, side, pos)
 
 # ==========================================================
 # 🔢 Listener principal
 # ==========================================================
-def on_message(ws, message):
+def processar_evento_ws(evento):
+    # roda nos workers do despacho (um shard por symbol)
+    if type(evento) is EventoPosicao:
+        atualizar_posicao(evento)
+
+    elif type(evento) is EventoOrdem:
+        tratar_ordem(evento)
+
+despacho_ws = DespachoEventos(WS_WORKERS, WS_FILA_MAX, processar_evento_ws)
+
+# /metrics: lidos só na coleta (nada no caminho do evento)
+fila_profundidade.definir_coleta(lambda: {(str(i),): p for i, p in enumerate(despacho_ws.profundidades())})
+fila_eventos.definir_coleta(lambda: {
+    (k,): v for k, v in despacho_ws.metricas().items()
+    if k in ("enfileirados", "processados", "erros", "bloqueios")
+})
+estado_tamanho.definir_coleta(lambda: {
+    ("posicoes",): len(estado_posicoes),
+    ("sinais",): len(executed_signals),
+    ("ordens_mm8",): len(ordens_mm8),
+})
+
+# frames brutos para replay (benchmarks/replay_user_stream.py)
+gravador_ws = GravadorFrames(WS_RECORD_FILE) if WS_RECORD_FILE else None
 
-    data = json.loads(message)
+def on_message(stream, message):
 
-    evento = data.get("e")
+    if gravador_ws:
+        gravador_ws.gravar(message)
 
-    if evento == "ACCOUNT_UPDATE":
-        atualizar_posicoes(data["a"])
+    # loop do gerenciador_streams: só decodifica e enfileira por symbol, sem bloquear
+    # (eventos não tratados são descartados antes do parse)
+    eventos = decodificar(message)
+    for i, evento in enumerate(eventos):
+        if not despacho_ws.tentar_despachar(evento.symbol, evento):
+            # fila cheia: o restante do frame espera fora do loop, na ordem
+            return _despachar_restante(eventos[i:])
 
-    elif evento == "ORDER_TRADE_UPDATE":
-        tratar_ordem(data["o"])
+async def _despachar_restante(eventos):
+    for evento in eventos:
+        await despacho_ws.despachar_async(evento.symbol, evento)
 
 # ==========================================================
 # 🔢 Sincronizar estado
@@ -316,12 +370,136 @@ def sincronizar_estado_inicial():
         entry = float(p["entryPrice"])
         side = "LONG" if qty > 0 else "SHORT"
 
-        estado_posicoes[f"{symbol}_{side}"] = {
+        registrar_posicao(symbol, side, {
             "qty": abs(qty),
             "entry": entry,
             "tp_enviado": True,
             "trailing_enviado": False
-        }
+        })
+# ==========================================================
+# 💾 Warm restart (journal + delta)
+# ==========================================================
+def restaurar_estado():
+    """
+    Snapshot + journal de volta para a memória e delta contra a corretora
+    (ressincronizar_estado) no lugar da sincronização completa.
+    Retorna False sem estado salvo (cold start).
+    """
+    estado = journal.carregar()
+
+    if not any(estado.values()):
+        return False
+
+    with _lock_posicoes:
+        for chave, dados in estado["posicoes"].items():
+            symbol, side = chave.split("_")
+            if chave not in estado_posicoes:
+                exposicao_posicoes.somar(symbol, side, 1)
+            estado_posicoes[chave] = dados
+
+    # só a vela corrente ainda bloqueia sinal repetido
+    executed_signals.update({
+        chave: vela
+        for chave, vela in estado["sinais"].items()
+        if vela == candle_id(chave.rsplit("_", 1)[1])
+    })
+    ordens_mm8.update(estado["mm8"])
+
+    print(
+        f"[RESTORE] {len(estado_posicoes)} posições | {len(executed_signals)} sinais na vela | "
+        f"{len(ordens_mm8)} ordens MM8"
+    )
+
+    # fills perdidos durante o restart são reinjetados no despacho
+    despacho_ws.iniciar()
+    ressincronizar_estado()
+    return True
+
+# ==========================================================
+# 🔄 Ressincronização após reconexão do stream
+# ==========================================================
+def ressincronizar_estado():
+    """
+    Delta entre a corretora e a memória depois de uma queda do stream.
+    Só posições (positionRisk) e ordens abertas; fills perdidos são
+    reinjetados no despacho (mesmo shard do symbol) como eventos de ordem.
+    """
+    inicio = time.monotonic()
+    try:
+        positions = binance_client.futures_position_information()
+        open_orders = binance_client.futures_get_open_orders()
+    except Exception as e:
+        print(f"[ERRO] Resync: {e}")
+        return
+
+    semear_livro(open_orders, inicio)
+
+    # lados que já têm ordens de saída (TP / stop / trailing) na corretora
+    com_protecao = {
+        (o["symbol"], o.get("positionSide"))
+        for o in open_orders
+        if not ordem_de_entrada(o["side"], o.get("positionSide"), o.get("reduceOnly", False), o.get("closePosition", False))
+    }
+
+    remotas = {}
+    for p in positions:
+        qty = float(p["positionAmt"])
+        if qty == 0:
+            continue
+        side = p.get("positionSide")
+        if side not in ("LONG", "SHORT"):
+            side = "LONG" if qty > 0 else "SHORT"
+        remotas[(p["symbol"], side)] = (abs(qty), float(p["entryPrice"]))
+
+    novas = fechadas = reduzidas = 0
+
+    # posições fechadas enquanto o stream esteve fora
+    for chave in list(estado_posicoes.keys()):
+        symbol, side = chave.split("_")
+        if (symbol, side) not in remotas:
+            despacho_ws.despachar(symbol, EventoPosicao(symbol, side, 0.0, 0.0))
+            fechadas += 1
+
+    for (symbol, side), (qty, entry) in remotas.items():
+        local = estado_posicoes.get(f"{symbol}_{side}")
+
+        if not local:
+            if (symbol, side) in com_protecao:
+                # TP já existe: só volta a acompanhar a posição
+                registrar_posicao(symbol, side, {
+                    "qty": qty,
+                    "entry": entry,
+                    "tp_enviado": True,
+                    "trailing_enviado": False
+                })
+            else:
+                # entrada executada sem o evento -> replay do fill (envia TP)
+                despacho_ws.despachar(symbol, EventoOrdem(
+                    symbol, side, "BUY" if side == "LONG" else "SELL", "FILLED", "RESYNC",
+                    None, "RESYNC", entry, qty, False, False
+                ))
+            novas += 1
+
+        elif qty < local["qty"] and not local.get("trailing_enviado"):
+            # TP1 executado sem o evento -> replay do parcial (stop + trailing)
+            local["qty"] = qty
+            registrar_posicao(symbol, side, local)
+            despacho_ws.despachar(symbol, EventoOrdem(
+                symbol, side, lado_fechamento(side), "PARTIALLY_FILLED", "RESYNC",
+                None, "RESYNC", entry, qty, False, False
+            ))
+            reduzidas += 1
+
+        elif local["qty"] != qty or local["entry"] != entry:
+            local["qty"] = qty
+            local["entry"] = entry
+            registrar_posicao(symbol, side, local)
+
+    print(
+        f"[RESYNC] {len(remotas)} posições | novas={novas} fechadas={fechadas} "
+        f"parciais={reduzidas} | {len(open_orders)} ordens | {time.monotonic() - inicio:.2f}s"
+    )
+
 # ==========================================================
 # 🔢 Sincronizar MM8
 # ==========================================================
@@ -336,21 +514,30 @@ def sincronizar_ordens_mm8():
             # você precisa saber timeframe (ver nota abaixo)
 
 # ==========================================================
-# 🔢 NORMALIZAÇÃO
+# 🔢 NORMALIZAÇÃO (SymbolSpec montado uma vez por moeda)
 # ==========================================================
-def get_precision(value): # V1
-    s = f"{value:.10f}".rstrip("0")
-    return len(s.split(".")[1]) if "." in s else 0
+_specs = {}
+_specs_versao = None
+
+def obter_spec(symbol):
+    global _specs, _specs_versao
+
+    # recarga do exchange info -> descarta specs antigos
+    versao = versao_filtros()
+    if versao != _specs_versao:
+        _specs, _specs_versao = {}, versao
+
+    spec = _specs.get(symbol)
+    if spec is None:
+        tick, step = get_symbol_filters(symbol)
+        spec = _specs[symbol] = SymbolSpec(symbol, tick, step)
+    return spec
 
 def normalize_qty(qty, step):
-    precision = get_precision(step)
-    qty = math.floor(qty / step) * step
-    return float(f"{qty:.{precision}f}")
+    return quantizar(qty, step)
 
 def normalize_price(price, tick):
-    precision = get_precision(tick)
-    price = math.floor(price / tick) * tick
-    return float(f"{price:.{precision}f}")
+    return quantizar(price, tick)
 
 # ==========================================================
 # 💰 QUANTIDADE
@@ -358,8 +545,7 @@ def normalize_price(price, tick):
 def calcular_quantidade(symbol, price):
     notional = MAX_USDT * LEVERAGE
     qty_bruta = notional / price
-    tick, step = get_symbol_filters(symbol)
-    qty = normalize_qty(qty_bruta, step)
+    qty = obter_spec(symbol).qtd(qty_bruta)
 #    print(f"[QTY] Notional={notional:.4f} Qty={qty:.4f}")
     return qty
 
@@ -367,7 +553,8 @@ def calcular_quantidade(symbol, price):
 # 💲 PREÇO ATUAL
 # ==========================================================
 def preco_atual(symbol):
-    return float(binance_client.futures_mark_price(symbol=symbol)["markPrice"])
+    # cache do stream !markPrice@arr (REST apenas se o dado estiver velho)
+    return obter_mark_price(symbol)
 
 # ==========================================================
 # PREÇO PERMITIDO
@@ -395,163 +582,69 @@ TF_MAP = {
 
 
 def calcular_mm8(symbol, timeframe):
-    klines = binance_client.futures_klines(
-        symbol=symbol,
-        interval=TF_MAP[timeframe],
-        limit=9
-    )
-
-    closes = [float(k[4]) for k in klines]
-    mm8 = sum(closes[-8:]) / 8
+    # ring buffer alimentado pelo stream de klines (O(1))
+    mm8 = mm8_store(symbol, timeframe)
 
-    tick, _ = get_symbol_filters(symbol)
-    mm8n = normalize_price(mm8, tick)
+    # fallback: buffer ainda não aquecido / moeda fora do store
+    if mm8 is None:
+        klines = binance_client.futures_klines(
+            symbol=symbol,
+            interval=TF_MAP[timeframe],
+            limit=9
+        )
 
-    return mm8n
+        closes = [float(k[4]) for k in klines]
+        mm8 = sum(closes[-8:]) / 8
 
-# ==========================================================
-# ⚙ CONFIGURAÇÕES BINANCE
-# ==========================================================
-def set_leverage(symbol):
-    try:
-        binance_client.futures_change_leverage(symbol=symbol, leverage=LEVERAGE)
-    except Exception:
-        pass
+    return obter_spec(symbol).preco(mm8)
 
-def set_margin_type(symbol):
-    try:
-        binance_client.futures_change_margin_type(symbol=symbol, marginType=MARGIN_TYPE)
-    except Exception:
-        pass
 # ==========================================================
 # ⚙ CONTAR POSICOES (LONG / SHORT / TOTAL)
 # ==========================================================
 def contar_posicoes_local():
-
-    resultado = {
-        "total": 0,
-        "long": 0,
-        "short": 0,
-        "por_symbol": {}
-    }
-
-    for chave, pos in estado_posicoes.items():
-        symbol, side = chave.split("_")
-
-        if symbol not in resultado["por_symbol"]:
-            resultado["por_symbol"][symbol] = {"long":0,"short":0}
-
-        resultado["total"] += 1
-
-        if side == "LONG":
-            resultado["long"] += 1
-            resultado["por_symbol"][symbol]["long"] += 1
-        else:
-            resultado["short"] += 1
-            resultado["por_symbol"][symbol]["short"] += 1
-
-    return resultado
+    return exposicao_posicoes.como_dict()
 
 
 def contar_ordens_entrada():
 
 #    Conta apenas ordens que realmente ABREM posição. (Ignora TP / SL / Trailing.)
+#    Lê o livro local mantido pelos eventos ORDER_TRADE_UPDATE (sem REST).
 
-    resultado = {
-        "total": 0,
-        "long": 0,
-        "short": 0,
-        "por_symbol": {}
-    }
-
-    try:
-        open_orders = binance_client.futures_get_open_orders()
-
-        for o in open_orders:
-
-            # Apenas ordens ativas
-            if o["status"] not in ("NEW", "PARTIALLY_FILLED"):
-                continue
-
-            # Ignorar ordens de saída
-            if o.get("reduceOnly"):
-                continue
-
-            symbol = o["symbol"]
-            pos_side = o.get("positionSide")
-
-            if symbol not in resultado["por_symbol"]:
-                resultado["por_symbol"][symbol] = {"long": 0, "short": 0}
-
-            if pos_side == "LONG":
-                resultado["long"] += 1
-                resultado["por_symbol"][symbol]["long"] += 1
-            elif pos_side == "SHORT":
-                resultado["short"] += 1
-                resultado["por_symbol"][symbol]["short"] += 1
-
-            resultado["total"] += 1
-
-        return resultado
-
-    except Exception as e:
-        print(f"[ERRO] contar_ordens_entrada: {e}")
-        return resultado
+    return contagem_ordens_entrada()
 
 def contar_estado_atual():
 
-#    Consolida: posições abertas e ordens de entrada abertas
-
-    pos = contar_posicoes_local()
-    ords = contar_ordens_entrada()
+#    Consolida: posições abertas e ordens de entrada abertas (apenas diagnóstico)
 
-    resultado = {
-        "total": pos["total"] + ords["total"],
-        "long": pos["long"] + ords["long"],
-        "short": pos["short"] + ords["short"],
-        "por_symbol": {}
+    return {
+        "total": exposicao_posicoes.total + exposicao_ordens.total,
+        "long": exposicao_posicoes.long + exposicao_ordens.long,
+        "short": exposicao_posicoes.short + exposicao_ordens.short,
     }
 
-    symbols = set(list(pos["por_symbol"].keys()) + list(ords["por_symbol"].keys()))
-
-    for s in symbols:
-        resultado["por_symbol"][s] = {
-            "long": pos["por_symbol"].get(s, {}).get("long", 0) +
-                    ords["por_symbol"].get(s, {}).get("long", 0),
-
-            "short": pos["por_symbol"].get(s, {}).get("short", 0) +
-                     ords["por_symbol"].get(s, {}).get("short", 0)
-        }
-
-    return resultado
-
 def pode_abrir_nova_ordem(symbol, side):
 
-    estado = contar_estado_atual()
+    # leituras O(1) dos contadores de posições + ordens de entrada
+    total = exposicao_posicoes.total + exposicao_ordens.total
+    lado = exposicao_posicoes.lado(side) + exposicao_ordens.lado(side)
 
-    print(f"[DEBUG] TOTAL={estado['total']} LONG={estado['long']} SHORT={estado['short']}")
+    print(f"[DEBUG] TOTAL={total} {side}={lado}")
 
-    if estado["total"] >= MAX_POSICOES_ABERTAS:
+    if total >= MAX_POSICOES_ABERTAS:
         print("[SKIP] Limite total atingido")
         return False
 
-    if side == "LONG" and estado["long"] >= MAX_LONGS:
+    if side == "LONG" and lado >= MAX_LONGS:
         print("[SKIP] Limite LONG atingido")
         return False
 
-    if side == "SHORT" and estado["short"] >= MAX_SHORTS:
+    if side == "SHORT" and lado >= MAX_SHORTS:
         print("[SKIP] Limite SHORT atingido")
         return False
 
     # trava por símbolo
-    sym_data = estado["por_symbol"].get(symbol, {"long": 0, "short": 0})
-
-    if side == "LONG" and sym_data["long"] > 0:
-        print(f"[SKIP] Já existe LONG ativo em {symbol}")
-        return False
-
-    if side == "SHORT" and sym_data["short"] > 0:
-        print(f"[SKIP] Já existe SHORT ativo em {symbol}")
+    if exposicao_posicoes.do_symbol(symbol, side) + exposicao_ordens.do_symbol(symbol, side) > 0:
+        print(f"[SKIP] Já existe {side} ativo em {symbol}")
         return False
 
     return True
@@ -561,14 +654,6 @@ def ja_existe_posicao(symbol, side):
     return chave in estado_posicoes
 
 
-def renovar_listen_key(listen_key):
-    while True:
-        try:
-            binance_client.futures_stream_keepalive(listen_key)
-        except Exception as e:
-            print(f"[ERRO] keepalive: {e}")
-        time.sleep(1800)
-
 # ==========================================================
 # 📌 EXECUTOR PRINCIPAL
 # ==========================================================
@@ -581,218 +666,328 @@ def candle_id(timeframe):
     if timeframe == "4h":
         return f"{now.year}{now.month}{now.day}{now.hour//4}"
 
-def executar_ordem(sinal: dict):
-    symbol = sinal["symbol"]
-    side = sinal["side"]
-    timeframe = sinal["timeframe"]
-    order_type = sinal["order_type"]
-
-    with symbol_locks[symbol]:
-
-        # ==================================================
-        # 🔒 CONTROLE POR PREÇO
-        # ==================================================
-        permitido, _ = preco_permitido(symbol)
-        if not permitido:
-            print(f"[SKIP] Preço não permitido")
-            return
+def validar_sinal(symbol, side, timeframe):
+    """
+    Controles locais (sem REST): vela, posição existente e limites de exposição.
+    Retorna (vela, chave) se o sinal pode seguir, senão None.
+    """
 
-        # ==================================================
-        # 🔒 CONTROLE POR VELA
-        # ==================================================
-        vela = candle_id(timeframe)
-        chave = f"{symbol}_{side}_{timeframe}"
+    # ==================================================
+    # 🔒 CONTROLE POR VELA
+    # ==================================================
+    vela = candle_id(timeframe)
+    chave = f"{symbol}_{side}_{timeframe}"
+
+    if executed_signals.get(chave) == vela:
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Sinal já executado nesta vela.")
+        sinais_ignorados.inc("vela_repetida")
+        return None
+
+    # ==================================================
+    # 📊 CONTROLE DE POSIÇÕES E ORDENS
+    # ==================================================
+    if ja_existe_posicao(symbol, side):
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Já existe posição neste lado")
+        print("============================================================================================")
+        sinais_ignorados.inc("posicao_existente")
+        return None
+
+    if not pode_abrir_nova_ordem(symbol, side):
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Não pode abrir nova ordem [QUANTIDADE DE POSIÇÃO EXCEDIDA]")
+        print("============================================================================================")
+        sinais_ignorados.inc("exposicao")
+        return None
+
+    return vela, chave
+
+def montar_ordem_entrada(symbol, side, order_type, price, signal_id=None):
+    qty = calcular_quantidade(symbol, price)
+
+    params = dict(
+        symbol=symbol,
+        side="BUY" if side == "LONG" else "SELL",
+        positionSide=side,
+        type=order_type,
+        quantity=qty
+    )
 
-        if executed_signals.get(chave) == vela:
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Sinal já executado nesta vela.")
-            return
+    # o evento do WS volta com o mesmo id (tracing)
+    if signal_id:
+        params["newClientOrderId"] = signal_id
 
-        # ==================================================
-        # 📊 CONTROLE DE POSIÇÕES E ORDENS
-        # ==================================================
-        if ja_existe_posicao(symbol, side):
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Já existe posição neste lado")
-            print("============================================================================================")
-            return
+    if order_type == "LIMIT":
+        params["price"] = price
+        params["timeInForce"] = "GTC"
 
-        if not pode_abrir_nova_ordem(symbol, side):
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [SKIP] Não pode abrir nova ordem [QUANTIDADE DE POSIÇÃO EXCEDIDA]")
-            print("============================================================================================")
-            return
+    return params
 
-        # ==================================================
-        # 💰 CÁLCULOS
-        # ==================================================
-        if not USE_BINANCE or DRY_RUN:
-            print("[SIMULADO]")
-            return
+def registrar_ordem_entrada(order, sinal, params, price, vela):
+    symbol = sinal["symbol"]
+    side = sinal["side"]
+    timeframe = sinal["timeframe"]
+    order_type = sinal["order_type"]
 
-        set_margin_type(symbol)
-        set_leverage(symbol)
+    registrar_ordem_enviada(order)
+    print(f"[ORDEM] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {symbol} {side} QTY={params['quantity']} PRICE_MM8={price}")
 
-        tick, step = get_symbol_filters(symbol)
-        price = calcular_mm8(symbol, timeframe)
-        price = normalize_price(price, tick)
-        qty = calcular_quantidade(symbol, price)
-        qty = normalize_qty(qty, step)
+    if order_type == "LIMIT":
+        chave_mm8 = f"{symbol}_{side}_{timeframe}"
 
-        params = dict(
-            symbol=symbol,
-            side="BUY" if side == "LONG" else "SELL",
-            positionSide=side,
-            type=order_type,
-            quantity=qty
-        )
+        registrar_ordem_mm8(chave_mm8, {
+            "order_id": order["orderId"],
+            "price": price,
+            "vela_origem": vela,
+            "candles_passados": 0
+        })
 
-        if order_type == "LIMIT":
-            client_id = f"MM8_{symbol}_{side}_{timeframe}_{vela}"
-            params["price"] = price
-            params["timeInForce"] = "GTC"
+    # LOG
+    log_event(
+        event_type="ORDER_SENT",
+        symbol=symbol,
+        side=side,
+        order_type=order_type,
+        price=price,
+        qty=params["quantity"],
+        order_id=order.get("orderId"),
+        status="NEW",
+        signal_id=sinal.get("signal_id")
+    )
 
-        # ================================
-        # 🚀 ENVIO DA ORDEM
-        # ================================
-        try:
-            order = binance_client.futures_create_order(**params)
-            print(f"[ORDEM] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {symbol} {side} QTY={qty} PRICE_MM8={price}")
+# ==========================================================
+# ⚡ PRÉ-TRADE CONCORRENTE
+# ==========================================================
+_pool_pre_trade = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pre_trade")
 
-            if order_type == "LIMIT":
-                chave_mm8 = f"{symbol}_{side}_{timeframe}"
+def _leituras_pre_trade(symbol, timeframe, completo):
+    """
+    (nome, função, args, já_em_memória) de cada leitura do pré-trade.
+    """
+    leituras = [("preco", preco_permitido, (symbol,), mark_price_cache(symbol) is not None)]
+    if completo:
+        leituras += [
+            ("config", garantir_config_symbol, (symbol,), config_em_dia(symbol)),
+            ("filtros", obter_spec, (symbol,), filtros_symbol(symbol) is not None),
+            ("mm8", calcular_mm8, (symbol, timeframe), mm8_store(symbol, timeframe) is not None),
+        ]
+    return leituras
+
+def coletar_pre_trade(symbol, timeframe, completo=True, trace=None):
+    """
+    Executa as leituras independentes do pré-trade em paralelo.
+    O que já está em memória roda inline; só as leituras que precisam de REST
+    vão para o pool. Se o preço reprovar, as pendentes são canceladas.
+    Retorna o snapshot {"mark_price", "spec", "price"} ou None.
+    """
+    leituras = _leituras_pre_trade(symbol, timeframe, completo)
+    if trace:
+        leituras = [(nome, trace.medido(nome, func), args, m) for nome, func, args, m in leituras]
+    resultados = {}
+
+    # preço em cache: decide antes de disparar qualquer REST
+    nome, func, args, em_memoria = leituras[0]
+    if em_memoria:
+        resultados[nome] = func(*args)
+        if not resultados[nome][0]:
+            return None
+
+    futuros = {
+        nome: _pool_pre_trade.submit(func, *args)
+        for nome, func, args, em_memoria in leituras
+        if not em_memoria
+    }
 
-                ordens_mm8[chave_mm8] = {
-                    "order_id": order["orderId"],
-                    "price": price,
-                    "vela_origem": vela,
-                    "candles_passados": 0
-                }
+    try:
+        for nome, func, args, em_memoria in leituras[1:]:
+            if em_memoria:
+                resultados[nome] = func(*args)
 
-            # LOG
-            log_event(
-                event_type="ORDER_SENT",
-                symbol=symbol,
-                side=side,
-                order_type=order_type,
-                price=price,
-                qty=qty,
-                order_id=order.get("orderId"),
-                status="NEW"
-            )
+        if "preco" in futuros:
+            resultados["preco"] = futuros.pop("preco").result()
+            if not resultados["preco"][0]:
+                return None
 
-        except Exception as e:
-            print(f"[ERROR] {e}")
+        for nome, fut in futuros.items():
+            resultados[nome] = fut.result()
 
+    finally:
+        for fut in futuros.values():
+            fut.cancel()
 
-        # ================================
-        # 🔐 MARCAR COMO EXECUTADO
-        # ================================
-        executed_signals[chave] = vela
+    snapshot = {"mark_price": resultados["preco"][1]}
+    if completo:
+        snapshot["spec"] = resultados["filtros"]
+        snapshot["price"] = resultados["mm8"]
+    return snapshot
 
 # ==========================================================
-# 🎯 TP PARCIAL
+# 📌 EXECUÇÃO
 # ==========================================================
-def enviar_tp_parcial(symbol, side, qty, entry):
-    try:
-        # ================================
-        # OBTER FILTROS UMA VEZ
-        # ================================
-        tick, step = get_symbol_filters(symbol)
-
-        # ================================
-        # TP1
-        # ================================
-        tp_qty = qty * TP_PARCIAL_QTY
+def executar_ordem(sinal: dict):
+    symbol = sinal["symbol"]
+    side = sinal["side"]
+    timeframe = sinal["timeframe"]
+    order_type = sinal["order_type"]
 
-        if tp_qty <= 0:
-            print("[SKIP] TP qty ficou zero")
-            return
+    trace = trace_do_sinal(sinal)
 
-        tp_qty = normalize_qty(tp_qty, step)
+    try:
+        with symbol_locks[symbol]:
 
-        if side == "LONG":
-            tp_price = entry * (1 + TP_PARCIAL_PERCENT/100)
-            close_side = "SELL"
-        else:
-            tp_price = entry * (1 - TP_PARCIAL_PERCENT/100)
-            close_side = "BUY"
+            # ==================================================
+            # 🔒 VELA / POSIÇÃO / EXPOSIÇÃO (local, sem REST)
+            # ==================================================
+            with trace.span("validacao"):
+                validado = validar_sinal(symbol, side, timeframe)
+            if not validado:
+                return
+            vela, chave = validado
+
+            # ==================================================
+            # ⚡ PRÉ-TRADE: preço + alavancagem/margem + filtros + MM8
+            # ==================================================
+            simulado = not USE_BINANCE or DRY_RUN
+            with trace.span("pre_trade"):
+                snapshot = coletar_pre_trade(symbol, timeframe, completo=not simulado, trace=trace)
+            if not snapshot:
+                print(f"[SKIP] Preço não permitido")
+                sinais_ignorados.inc("preco")
+                return
+
+            if simulado:
+                print("[SIMULADO]")
+                sinais_ignorados.inc("simulado")
+                return
+
+            price = snapshot["price"]
+            params = montar_ordem_entrada(symbol, side, order_type, price, trace.signal_id)
+
+            # ================================
+            # 🚀 ENVIO DA ORDEM
+            # ================================
+            try:
+                marcar_envio(trace, order_type)
+                with trace.span("envio"):
+                    order = binance_client.futures_create_order(**params)
+                marcar_aceito(trace)
+                ordens_enviadas.inc(order_type)
+                registrar_ordem_entrada(order, sinal, params, price, vela)
+
+            except Exception as e:
+                ordens_erro.inc()
+                print(f"[ERROR] {e}")
+
+
+            # ================================
+            # 🔐 MARCAR COMO EXECUTADO
+            # ================================
+            marcar_sinal_executado(chave, vela)
+
+    finally:
+        # ordem aceita: o trace termina no evento do WS (tratar_ordem)
+        if not trace.aceito:
+            finalizar(trace)
+
+# ==========================================================
+# 🧱 MONTAGEM DAS PERNAS DE PROTEÇÃO
+# ==========================================================
+def lado_fechamento(side):
+    return "SELL" if side == "LONG" else "BUY"
+
+def montar_tp_parcial(symbol, side, qty, entry):
+    """
+    TP1 (TP_PARCIAL_QTY da posição em +TP_PARCIAL_PERCENT) e TP2 (restante em 2x).
+    """
+    spec = obter_spec(symbol)
+    close_side = lado_fechamento(side)
+    sinal = 1 if side == "LONG" else -1
 
-        tp_price = normalize_price(tp_price, tick)
+    tp_qty = spec.qtd(qty * TP_PARCIAL_QTY)
+    if tp_qty <= 0:
+        print("[SKIP] TP qty ficou zero")
+        return []
 
-        binance_client.futures_create_order(
+    pernas = [dict(
+        _rotulo="TP1",
+        symbol=symbol,
+        side=close_side,
+        positionSide=side,
+        type="LIMIT",
+        price=spec.preco(entry * (1 + sinal * TP_PARCIAL_PERCENT / 100)),
+        quantity=tp_qty,
+        timeInForce="GTC"
+    )]
+
+    tp2_qty = spec.qtd(qty - tp_qty)
+    if tp2_qty > 0:
+        pernas.append(dict(
+            _rotulo="TP2",
             symbol=symbol,
             side=close_side,
             positionSide=side,
             type="LIMIT",
-            price=tp_price,
-            quantity=tp_qty,
+            price=spec.preco(entry * (1 + sinal * TP_PARCIAL_PERCENT * 2 / 100)),
+            quantity=tp2_qty,
             timeInForce="GTC"
-        )
-
-        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [TP1] {symbol} Parcial enviado {tp_price} qty {tp_qty}")
+        ))
 
-        # ================================
-        # TP2
-        # ================================
-        restante = qty - tp_qty
-        tp2_qty = restante
+    return pernas
 
-        if tp2_qty <= 0:
-            return
+def montar_trailing_stop(symbol, side, qty, entry):
+    spec = obter_spec(symbol)
+    sinal = 1 if side == "LONG" else -1
 
-        tp2_qty = normalize_qty(tp2_qty, step)
+    return dict(
+        _rotulo="TRAIL",
+        symbol=symbol,
+        side=lado_fechamento(side),
+        positionSide=side,
+        type="TRAILING_STOP_MARKET",
+        quantity=spec.qtd(qty),
+        activatePrice=spec.preco(entry * (1 + sinal * TRAILING_ACTIVATION_PERCENT / 100)),   # algoOrder
+        callbackRate=TRAILING_CALLBACK_RATE,
+        workingType="MARK_PRICE"
+    )
 
-        if side == "LONG":
-            tp2_price = entry * (1 + TP_PARCIAL_PERCENT * 2 / 100)
-        else:
-            tp2_price = entry * (1 - TP_PARCIAL_PERCENT * 2 / 100)
+def montar_stop_lucro(symbol, side, entry_price, qty_restante):
+    mark_price = preco_atual(symbol)
 
-        tp2_price = normalize_price(tp2_price, tick)
+    if side == "LONG":
+        stop_price = entry_price * 1.002  # 10% lucro no LONG com 50X de alavancagem
+        stop_price = min(stop_price, mark_price * 0.999)
+    else:
+        stop_price = entry_price * 0.998  # 10% lucro no SHORT
+        stop_price = max(stop_price, mark_price * 1.001)
 
-        if tp2_qty > 0:
-            binance_client.futures_create_order(
-                symbol=symbol,
-                side=close_side,
-                positionSide=side,
-                type="LIMIT",
-                price=tp2_price,
-                quantity=tp2_qty,
-                timeInForce="GTC"
-            )
+    spec = obter_spec(symbol)
 
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [TP2] {symbol} Parcial enviado {tp2_price} qty={tp2_qty}")
+    return dict(
+        _rotulo="STOP LUCRO",
+        symbol=symbol,
+        side=lado_fechamento(side),
+        positionSide=side,
+        type="STOP_MARKET",
+        triggerPrice=spec.preco(stop_price),   # algoOrder (stopPrice no /order)
+        quantity=spec.qtd(qty_restante),
+        workingType="MARK_PRICE",
+    )
 
+# ==========================================================
+# 🎯 TP PARCIAL (TP1 + TP2 em um único batchOrders)
+# ==========================================================
+def enviar_tp_parcial(symbol, side, qty, entry):
+    try:
+        pernas = montar_tp_parcial(symbol, side, qty, entry)
+        if pernas:
+            return enviar_pernas(pernas)
     except Exception as e:
         print(f"[ERRO] TP: {e}")
 
-
 # ==========================================================
 # 🔁 TRAILING STOP
 # ==========================================================
 def enviar_trailing_stop(symbol, side, qty, entry):
     try:
-        if side == "LONG":
-            activation = entry * (1 + TRAILING_ACTIVATION_PERCENT/100)
-            close_side = "SELL"
-        else:
-            activation = entry * (1 - TRAILING_ACTIVATION_PERCENT/100)
-            close_side = "BUY"
-
-        tick, step = get_symbol_filters(symbol)
-        activation = normalize_price(activation, tick)
-        qty = normalize_qty(qty, step)
-
-        binance_client.futures_create_order(
-            symbol=symbol,
-            side=close_side,
-            positionSide=side,
-            type="TRAILING_STOP_MARKET",
-            quantity=qty,
-            activationPrice=activation,
-            callbackRate=TRAILING_CALLBACK_RATE,
-            workingType="MARK_PRICE"
-        )
-
-        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [TRAIL] {symbol} Enviado {activation} qty {qty}")
-
+        return enviar_pernas([montar_trailing_stop(symbol, side, qty, entry)])
     except Exception as e:
         print(f"[ERRO] Trailing: {e}")
 
@@ -801,35 +996,18 @@ def enviar_trailing_stop(symbol, side, qty, entry):
 # ==========================================================
 def mover_stop_para_lucro(symbol, side, entry_price, qty_restante):
     try:
-        mark_price = float(client.futures_mark_price(symbol=symbol)["markPrice"])
-
-        if side == "LONG":
-            stop_price = entry_price * 1.002  # 10% lucro no LONG com 50X de alavancagem
-            stop_price = min(stop_price, mark_price * 0.999)
-            close_side = "SELL"
-        else:
-            stop_price = entry_price * 0.998  # 10% lucro no SHORT
-            stop_price = max(stop_price, mark_price * 1.001)
-            close_side = "BUY"
-
-        tick = get_tick_size(symbol)
-        step = get_step_size(symbol)
-
-        stop_price = normalize_price(stop_price, tick)
-        qty_restante = normalize_qty(qty_restante, step)
-
-        binance_client.futures_create_order(
-            symbol=symbol,
-            side=close_side,
-            positionSide=side,
-            type="STOP_MARKET",
-            stopPrice=stop_price,
-            quantity=qty_restante,
-            workingType="MARK_PRICE",
-        )
-
-        print(f"[STOP LUCRO] {symbol} novo stop em {stop_price}")
-
+        return enviar_pernas([montar_stop_lucro(symbol, side, entry_price, qty_restante)])
     except Exception as e:
         print(f"[ERRO STOP LUCRO]: {e}")
 
+# ==========================================================
+# 🛡 STOP + TRAILING após TP1 (algoOrder, em paralelo)
+# ==========================================================
+def enviar_protecao_pos_parcial(symbol, side, entry, qty):
+    try:
+        return enviar_pernas([
+            montar_stop_lucro(symbol, side, entry, qty),
+            montar_trailing_stop(symbol, side, qty, entry),
+        ])
+    except Exception as e:
+        print(f"[ERRO] Proteção pós-parcial: {e}")
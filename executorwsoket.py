@@ -1,6 +1,7 @@
-﻿from flask import Flask, request, jsonify
+﻿from flask import Flask, request, jsonify, Response
 from config import binance_client, DRY_RUN
-from executor_ordens import executar_ordem  # sua lógica existente
+from executorwebsocket import executar_ordem  # executor síncrono (o Telethon usa executor_async)
+from metricas import gerar_texto, sinais_recebidos, CONTENT_TYPE
 
 app = Flask(__name__)
 
@@ -11,16 +12,21 @@ def executar():
     side = data.get("side")
     timeframe = data.get("timeframe")
     order_type = data.get("order_type")
+    sinais_recebidos.inc(timeframe)
 
     if DRY_RUN:
         print(f"[DRY_RUN] Ordem recebida: {symbol} {side} {order_type}")
         return jsonify({"status": "dry_run"})
 
     try:
-        result = executar_ordem(symbol, side, timeframe, order_type)
+        result = executar_ordem(data)
         return jsonify({"status": "ok", "result": result})
     except Exception as e:
         return jsonify({"status": "error", "msg": str(e)}), 500
 
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(gerar_texto(), content_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     app.run(port=5000)
@@ -0,0 +1,73 @@
+﻿# Arquivo - exposicao.py
+# Contadores de exposição (total / long / short / por symbol) mantidos incrementalmente.
+# Posições (estado_posicoes) e ordens de entrada (livro_ordens) usam um contador cada;
+# pode_abrir_nova_ordem responde com leituras O(1), sem varrer estados nem montar dicts.
+
+import threading
+
+
+class ContadorExposicao:
+    """
+    Contagem incremental por lado e por symbol.
+    """
+
+    __slots__ = ("total", "long", "short", "por_symbol", "lock")
+
+    def __init__(self):
+        self.total = 0
+        self.long = 0
+        self.short = 0
+        self.por_symbol = {}   # symbol -> [long, short]
+        self.lock = threading.Lock()
+
+    def somar(self, symbol, side, delta):
+        with self.lock:
+            sym = self.por_symbol.get(symbol)
+            if sym is None:
+                sym = self.por_symbol[symbol] = [0, 0]
+
+            self.total += delta
+            if side == "LONG":
+                self.long += delta
+                sym[0] += delta
+            elif side == "SHORT":
+                self.short += delta
+                sym[1] += delta
+
+            if not sym[0] and not sym[1]:
+                del self.por_symbol[symbol]
+
+    def limpar(self):
+        with self.lock:
+            self.total = 0
+            self.long = 0
+            self.short = 0
+            self.por_symbol = {}
+
+    def lado(self, side):
+        return self.long if side == "LONG" else self.short
+
+    def do_symbol(self, symbol, side):
+        sym = self.por_symbol.get(symbol)
+        if not sym:
+            return 0
+        return sym[0] if side == "LONG" else sym[1]
+
+    def como_dict(self):
+        with self.lock:
+            return {
+                "total": self.total,
+                "long": self.long,
+                "short": self.short,
+                "por_symbol": {
+                    s: {"long": v[0], "short": v[1]}
+                    for s, v in self.por_symbol.items()
+                },
+            }
+
+
+# ==========================================================
+# 📦 CONTADORES GLOBAIS
+# ==========================================================
+exposicao_posicoes = ContadorExposicao()
+exposicao_ordens = ContadorExposicao()
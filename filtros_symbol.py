@@ -0,0 +1,178 @@
+﻿# Arquivo - filtros_symbol.py
+# Índice de filtros de todas as moedas (PRICE_FILTER, LOT_SIZE, MARKET_LOT_SIZE, MIN_NOTIONAL).
+# Carregado uma vez no startup (arquivo local se ainda válido, senão futures_exchange_info),
+# salvo em disco para warm start rápido e atualizado em background a cada EXCHANGE_INFO_TTL.
+# Moeda ausente do índice dispara no máximo um refresh a cada FALTA_TTL (cache negativo por symbol).
+
+import os
+import json
+import time
+import threading
+from config import binance_client, EXCHANGE_INFO_CACHE_FILE, EXCHANGE_INFO_TTL
+
+# ==========================================================
+# 📦 ÍNDICE symbol -> filtros
+# ==========================================================
+_filtros = {}
+_atualizado_em = 0.0
+_versao = 0          # muda a cada recarga (invalida os SymbolSpec montados)
+_lock_refresh = threading.Lock()
+
+FALTA_TTL = 300.0    # segundos sem novo download para uma moeda que não estava no exchange info
+_faltas = {}         # symbol -> monotonic do último refresh que não a encontrou
+
+
+def indexar_exchange_info(info):
+    """
+    Converte o payload do futures_exchange_info em {symbol: filtros}.
+    """
+    indice = {}
+
+    for s in info["symbols"]:
+        f = {
+            "tick": None,
+            "step": None,
+            "min_qty": None,
+            "max_qty": None,
+            "market_max_qty": None,
+            "min_notional": None,
+        }
+
+        for flt in s["filters"]:
+            tipo = flt["filterType"]
+            if tipo == "PRICE_FILTER":
+                f["tick"] = float(flt["tickSize"])
+            elif tipo == "LOT_SIZE":
+                f["step"] = float(flt["stepSize"])
+                f["min_qty"] = float(flt["minQty"])
+                f["max_qty"] = float(flt["maxQty"])
+            elif tipo == "MARKET_LOT_SIZE":
+                f["market_max_qty"] = float(flt["maxQty"])
+            elif tipo == "MIN_NOTIONAL":
+                f["min_notional"] = float(flt.get("notional", flt.get("minNotional", 0)))
+
+        if f["tick"] and f["step"]:
+            indice[s["symbol"]] = f
+
+    return indice
+
+# ==========================================================
+# 💾 ARQUIVO LOCAL
+# ==========================================================
+def _ler_cache():
+    try:
+        with open(EXCHANGE_INFO_CACHE_FILE, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+        return dados["filtros"], dados["atualizado_em"]
+    except (OSError, ValueError, KeyError):
+        return None, 0.0
+
+
+def _salvar_cache(indice, atualizado_em):
+    pasta = os.path.dirname(EXCHANGE_INFO_CACHE_FILE)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    tmp = EXCHANGE_INFO_CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"atualizado_em": atualizado_em, "filtros": indice}, f)
+    os.replace(tmp, EXCHANGE_INFO_CACHE_FILE)
+
+# ==========================================================
+# 🔄 CARGA / REFRESH
+# ==========================================================
+def atualizar_filtros():
+    """
+    Baixa o exchange info, reindexa e salva em disco.
+    Single-flight: chamadas concorrentes esperam a que já está em andamento.
+    """
+    global _filtros, _atualizado_em, _versao
+
+    inicio = _atualizado_em
+    with _lock_refresh:
+        if _atualizado_em != inicio:
+            return  # outra thread acabou de atualizar
+
+        indice = indexar_exchange_info(binance_client.futures_exchange_info())
+        agora = time.time()
+
+        _filtros = indice
+        _atualizado_em = agora
+        _versao += 1
+
+        try:
+            _salvar_cache(indice, agora)
+        except OSError as e:
+            print(f"[ERRO] Salvar cache de filtros: {e}")
+
+    print(f"[FILTROS] {len(indice)} moedas indexadas")
+
+
+def atualizar_por_falta(symbol):
+    """
+    Refresh disparado por uma moeda fora do índice (listada depois da carga).
+    Se o último refresh por essa moeda foi há menos de FALTA_TTL, não baixa de novo.
+    """
+    if symbol in _filtros:
+        return
+    falta = _faltas.get(symbol)
+    if falta is not None and time.monotonic() - falta < FALTA_TTL:
+        return
+
+    atualizar_filtros()
+
+    if symbol in _filtros:
+        _faltas.pop(symbol, None)
+    else:
+        _faltas[symbol] = time.monotonic()
+        print(f"[FILTROS] {symbol} fora do exchange info — sem novo refresh por {FALTA_TTL:.0f}s")
+
+
+def carregar_filtros():
+    """
+    Startup: usa o arquivo local se ainda dentro do TTL, senão vai à Binance.
+    """
+    global _filtros, _atualizado_em
+
+    indice, atualizado_em = _ler_cache()
+    if indice and time.time() - atualizado_em < EXCHANGE_INFO_TTL:
+        _filtros = indice
+        _atualizado_em = atualizado_em
+        print(f"[FILTROS] {len(indice)} moedas carregadas do cache local")
+        return
+
+    try:
+        atualizar_filtros()
+    except Exception as e:
+        print(f"[ERRO] Carregar filtros: {e}")
+        # cache vencido ainda é melhor que nada
+        if indice:
+            _filtros = indice
+            _atualizado_em = atualizado_em
+
+
+def _loop_refresh():
+    while True:
+        espera = max(60.0, _atualizado_em + EXCHANGE_INFO_TTL - time.time())
+        time.sleep(espera)
+        try:
+            atualizar_filtros()
+        except Exception as e:
+            print(f"[ERRO] Refresh filtros: {e}")
+
+
+def iniciar_refresh_filtros():
+    threading.Thread(
+        target=_loop_refresh,
+        daemon=True
+    ).start()
+
+# ==========================================================
+# 🔎 CONSULTA
+# ==========================================================
+def filtros_symbol(symbol):
+    return _filtros.get(symbol)
+
+
+def versao_filtros():
+    return _versao
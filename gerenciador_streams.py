@@ -0,0 +1,197 @@
+﻿# Arquivo - gerenciador_streams.py
+# Gerenciador asyncio único para todos os websockets da Binance Futures.
+# Um event loop (thread própria) mantém as conexões combinadas (/stream?streams=a/b/c):
+# user data, !markPrice@arr e <symbol>@kline_<tf> de todas as ALLOWED_SYMBOLS x TF_MAP.
+# As assinaturas são divididas em conexões de até MAX_STREAMS_POR_CONEXAO streams
+# e cada frame é roteado para o callback do seu stream.
+# Callbacks rodam no loop e não podem bloquear: um callback que precisa esperar
+# (fila cheia) retorna uma coroutine, aguardada antes do próximo frame daquela conexão.
+
+import json
+import time
+import random
+import asyncio
+import threading
+import websockets
+from config import BINANCE_WS_URL
+from decodificador_ws import loads
+from metricas import ws_frames
+
+MAX_STREAMS_POR_CONEXAO = 200
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+CONEXAO_ESTAVEL = 60.0
+
+PREFIXO_COMBINADO = '{"stream":"'
+CHAVE_DATA = '"data":'
+
+
+def separar_frame(texto):
+    """
+    Frame combinado {"stream": ..., "data": ...} -> (stream, texto do data)
+    sem parse completo (a Binance sempre manda "stream" antes de "data").
+    """
+    if texto.startswith(PREFIXO_COMBINADO):
+        fim = texto.index('"', len(PREFIXO_COMBINADO))
+        inicio_data = texto.index(CHAVE_DATA, fim) + len(CHAVE_DATA)
+        return texto[len(PREFIXO_COMBINADO):fim], texto[inicio_data:-1]
+
+    # fallback: ordem de chaves diferente
+    dados = loads(texto)
+    return dados["stream"], json.dumps(dados["data"], separators=(",", ":"))
+
+
+class Grupo:
+    """
+    Uma conexão websocket e os streams dela.
+    - fixo: lista de streams conhecida (mark price / klines)
+    - dinâmico: obter_streams() é chamado a cada (re)conexão (user data -> listenKey)
+    """
+
+    def __init__(self, nome, streams=None, obter_streams=None, on_conectado=None, combinado=True):
+        self.nome = nome
+        self.streams = streams or []
+        self.obter_streams = obter_streams
+        self.on_conectado = on_conectado
+        self.combinado = combinado
+        self.ws = None
+        self.loop = None
+        self.conexoes = 0
+        self.frames = 0
+
+    def url(self, streams):
+        if self.combinado:
+            return f"{BINANCE_WS_URL}/stream?streams={'/'.join(streams)}"
+        return f"{BINANCE_WS_URL}/ws/{streams[0]}"
+
+    def reconectar(self):
+        """
+        Thread-safe: fecha a conexão atual (o loop reconecta sozinho).
+        """
+        if self.ws and self.loop:
+            asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
+
+
+class GerenciadorStreams:
+
+    def __init__(self, max_streams=MAX_STREAMS_POR_CONEXAO):
+        self.max_streams = max_streams
+        self.rotas = {}        # stream -> callback(stream, texto)
+        self.grupos = []
+        self.loop = None
+
+    # ======================================================
+    # 📝 ASSINATURAS
+    # ======================================================
+    def assinar(self, streams, callback, nome="mercado", on_conectado=None):
+        """
+        Streams fixos, divididos em conexões de até max_streams.
+        on_conectado(streams da conexão) roda no loop a cada (re)conexão: não pode bloquear.
+        """
+        streams = list(streams)
+        for s in streams:
+            self.rotas[s] = callback
+
+        for i in range(0, len(streams), self.max_streams):
+            parte = streams[i:i + self.max_streams]
+            self.grupos.append(Grupo(
+                f"{nome}_{i // self.max_streams}",
+                parte,
+                on_conectado=(lambda parte=parte: on_conectado(parte)) if on_conectado else None
+            ))
+
+    def assinar_dinamico(self, obter_stream, callback, on_conectado=None, nome="user"):
+        """
+        Um stream cujo nome muda (listenKey). obter_stream() é bloqueante (REST)
+        e roda fora do loop a cada reconexão.
+        """
+        grupo = Grupo(nome, on_conectado=on_conectado, combinado=False)
+
+        def _obter():
+            stream = obter_stream()
+            self.rotas[stream] = callback
+            return [stream]
+
+        grupo.obter_streams = _obter
+        self.grupos.append(grupo)
+        return grupo
+
+    # ======================================================
+    # 📡 CONEXÕES
+    # ======================================================
+    def _rotear(self, grupo, streams, texto):
+        if grupo.combinado:
+            stream, dados = separar_frame(texto)
+        else:
+            stream, dados = streams[0], texto
+
+        callback = self.rotas.get(stream)
+        if callback:
+            return callback(stream, dados)
+
+    async def _rodar_grupo(self, grupo):
+        grupo.loop = asyncio.get_running_loop()
+        tentativas = 0
+
+        while True:
+            inicio = time.monotonic()
+            try:
+                streams = grupo.streams
+                if grupo.obter_streams:
+                    streams = await asyncio.to_thread(grupo.obter_streams)
+
+                async with websockets.connect(
+                    grupo.url(streams),
+                    ping_interval=60,
+                    ping_timeout=20,
+                    max_size=None
+                ) as ws:
+                    grupo.ws = ws
+                    grupo.conexoes += 1
+                    print(f"[STREAMS] {grupo.nome}: {len(streams)} streams conectados")
+
+                    if grupo.on_conectado:
+                        grupo.on_conectado()
+
+                    async for texto in ws:
+                        grupo.frames += 1
+                        try:
+                            pendente = self._rotear(grupo, streams, texto)
+                            if pendente is not None:
+                                # backpressure só nesta conexão
+                                await pendente
+                        except Exception as e:
+                            print(f"[ERRO] {grupo.nome} frame: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ERRO] {grupo.nome}: {e}")
+            finally:
+                grupo.ws = None
+
+            if time.monotonic() - inicio > CONEXAO_ESTAVEL:
+                tentativas = 0
+
+            espera = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** min(tentativas, 10)) * random.uniform(0.5, 1.5)
+            tentativas += 1
+            print(f"[STREAMS] {grupo.nome}: reconectando em {espera:.1f}s...")
+            await asyncio.sleep(espera)
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        await asyncio.gather(*(self._rodar_grupo(g) for g in self.grupos))
+
+    def iniciar(self):
+        threading.Thread(
+            target=asyncio.run,
+            args=(self._main(),),
+            name="gerenciador_streams",
+            daemon=True
+        ).start()
+        ws_frames.definir_coleta(lambda: {(nome,): n for nome, n in self.frames_por_grupo().items()})
+        total = sum(len(g.streams) for g in self.grupos)
+        print(f"[STREAMS] {len(self.grupos)} conexões / {total} streams fixos")
+
+    def frames_por_grupo(self):
+        return {g.nome: g.frames for g in self.grupos}
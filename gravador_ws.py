@@ -0,0 +1,91 @@
+﻿# Arquivo - gravador_ws.py
+# Gravação dos frames brutos do user data stream para replay (benchmarks/replay_user_stream.py).
+# Uma linha por frame: "<epoch em segundos>\t<frame>", gzip (multi-membro: reinícios fazem append).
+# O caminho aceita strftime (ex.: gravacoes/user_%Y%m%d.tsv.gz) -> um arquivo por dia.
+# on_message só enfileira; compressão e disco ficam numa thread própria.
+
+import os
+import gzip
+import time
+import queue
+import threading
+
+INTERVALO_FLUSH = 5.0      # segundos entre flushes (o que estiver no buffer sobrevive a um kill)
+
+
+class GravadorFrames:
+
+    def __init__(self, padrao, intervalo_flush=INTERVALO_FLUSH):
+        self.padrao = padrao
+        self.intervalo_flush = intervalo_flush
+        self.fila = queue.SimpleQueue()
+        self.gravados = 0
+        threading.Thread(target=self._loop, name="gravador_ws", daemon=True).start()
+        print(f"[GRAVADOR] Frames do user data stream -> {padrao}")
+
+    def gravar(self, message):
+        if isinstance(message, (bytes, bytearray)):
+            message = message.decode()
+        self.fila.put((time.time(), message))
+
+    def _abrir(self, caminho):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        return gzip.open(caminho, "at", encoding="utf-8")
+
+    def _loop(self):
+        arquivo = None
+        caminho = None
+        ultimo_flush = time.monotonic()
+
+        while True:
+            try:
+                ts, frame = self.fila.get(timeout=self.intervalo_flush)
+            except queue.Empty:
+                ts = frame = None
+
+            try:
+                if frame is not None:
+                    atual = time.strftime(self.padrao, time.localtime(ts))
+                    if atual != caminho:
+                        if arquivo:
+                            arquivo.close()
+                        caminho = atual
+                        arquivo = self._abrir(caminho)
+
+                    arquivo.write(f"{ts:.3f}\t{frame}\n")
+                    self.gravados += 1
+
+                if arquivo and time.monotonic() - ultimo_flush >= self.intervalo_flush:
+                    arquivo.flush()
+                    ultimo_flush = time.monotonic()
+
+            except OSError as e:
+                print(f"[ERRO] Gravador WS: {e}")
+                arquivo = caminho = None
+
+
+def ler_gravacao(caminho):
+    """
+    (ts, frame) de uma gravação (.gz ou texto; linhas sem ts viram ts=0).
+    Um fim truncado (processo morto antes do flush) encerra a leitura.
+    """
+    abrir = gzip.open if caminho.endswith(".gz") else open
+    with abrir(caminho, "rt", encoding="utf-8") as f:
+        try:
+            for linha in f:
+                linha = linha.rstrip("\n")
+                if not linha:
+                    continue
+                ts, sep, frame = linha.partition("\t")
+                if not sep:
+                    yield 0.0, ts
+                    continue
+                try:
+                    yield float(ts), frame
+                except ValueError:
+                    # frames.jsonl antigos com outro campo antes do frame
+                    yield 0.0, linha.split("\t")[-1]
+        except (EOFError, gzip.BadGzipFile) as e:
+            print(f"[GRAVADOR] {caminho}: fim truncado ignorado ({e})")
@@ -0,0 +1,214 @@
+﻿# Arquivo - journal_estado.py
+# Journal append-only das mutações de estado do executor + snapshots compactos.
+# - cada mutação vira um registro (seq, op, tabela, chave, valor) no fim do journal
+# - a cada STATE_SNAPSHOT_A_CADA registros o estado inteiro vai para um snapshot
+#   (gravação atômica tmp + replace) e o journal é truncado
+# - no boot: snapshot + replay do journal (registros com seq > seq do snapshot)
+# msgpack quando instalado (fallback JSON lines). Os registros são idempotentes
+# (set / del da chave inteira), então repetir um registro no replay não muda o resultado.
+
+import os
+import json
+import time
+import threading
+
+try:
+    import msgpack
+    FORMATO = "msgpack"
+except ImportError:
+    msgpack = None
+    FORMATO = "json"
+
+OP_SET = "s"
+OP_DEL = "d"
+
+EXTENSOES = {
+    "msgpack": ("snapshot.msgpack", "journal.msgpack"),
+    "json": ("snapshot.json", "journal.jsonl"),
+}
+
+# ==========================================================
+# 🔢 CODIFICAÇÃO
+# ==========================================================
+def _codificar(obj):
+    if msgpack:
+        return msgpack.packb(obj, use_bin_type=True)
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+
+def _ler_registros(caminho):
+    """
+    Registros do journal em ordem. Um registro truncado no fim
+    (processo morto no meio da escrita) encerra a leitura.
+    """
+    try:
+        f = open(caminho, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        if msgpack:
+            unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+            try:
+                for registro in unpacker:
+                    yield registro
+            except (ValueError, msgpack.UnpackException) as e:
+                print(f"[JOURNAL] Fim do journal corrompido ignorado: {e}")
+        else:
+            for linha in f:
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    print("[JOURNAL] Fim do journal corrompido ignorado")
+                    return
+
+
+class JournalEstado:
+
+    def __init__(self, pasta, tabelas, snapshot_a_cada=1000):
+        """
+        tabelas: {nome: dict vivo}. O dono do dict muta primeiro e anota depois
+        (o snapshot copia os dicts vivos, o replay reaplica o que vier depois dele).
+        """
+        self.pasta = pasta
+        self.tabelas = tabelas
+        self.snapshot_a_cada = snapshot_a_cada
+        nome_snapshot, nome_journal = EXTENSOES[FORMATO]
+        self.caminho_snapshot = os.path.join(pasta, nome_snapshot)
+        self.caminho_journal = os.path.join(pasta, nome_journal)
+
+        self.seq = 0
+        self.desde_snapshot = 0
+        self.ativo = False
+        self._arquivo = None
+        self._lock = threading.Lock()
+
+    # ======================================================
+    # 📝 ANOTAÇÕES
+    # ======================================================
+    def _anotar(self, op, tabela, chave, valor):
+        if not self.ativo:
+            return
+
+        with self._lock:
+            self.seq += 1
+            try:
+                self._arquivo.write(_codificar([self.seq, op, tabela, chave, valor]))
+                self._arquivo.flush()
+            except (OSError, TypeError, ValueError) as e:
+                print(f"[ERRO] Journal {tabela} {chave}: {e}")
+                return
+
+            self.desde_snapshot += 1
+            if self.desde_snapshot >= self.snapshot_a_cada:
+                self._compactar()
+
+    def registrar(self, tabela, chave, valor):
+        self._anotar(OP_SET, tabela, chave, valor)
+
+    def remover(self, tabela, chave):
+        self._anotar(OP_DEL, tabela, chave, None)
+
+    # ======================================================
+    # 📸 SNAPSHOT
+    # ======================================================
+    def _copiar_tabelas(self):
+        copia = {}
+        for nome, tabela in self.tabelas.items():
+            copia[nome] = {
+                k: dict(v) if isinstance(v, dict) else v
+                for k, v in dict(tabela).items()
+            }
+        return copia
+
+    def _gravar_snapshot(self, tabelas):
+        # chamado com self._lock
+        inicio = time.monotonic()
+        estado = {"seq": self.seq, "salvo_em": time.time(), "tabelas": tabelas}
+
+        tmp = self.caminho_snapshot + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_codificar(estado))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.caminho_snapshot)
+
+        # snapshot no disco: o journal pode recomeçar vazio
+        if self._arquivo:
+            self._arquivo.close()
+        self._arquivo = open(self.caminho_journal, "wb")
+        self.desde_snapshot = 0
+
+        print(
+            f"[JOURNAL] Snapshot seq={self.seq} "
+            f"({', '.join(f'{n}={len(t)}' for n, t in estado['tabelas'].items())}) "
+            f"{(time.monotonic() - inicio) * 1000:.1f}ms"
+        )
+
+    def _compactar(self):
+        self._gravar_snapshot(self._copiar_tabelas())
+
+    def compactar(self):
+        with self._lock:
+            self._compactar()
+
+    # ======================================================
+    # 🔄 CARGA (boot)
+    # ======================================================
+    def _ler_snapshot(self):
+        try:
+            with open(self.caminho_snapshot, "rb") as f:
+                dados = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            if msgpack:
+                return msgpack.unpackb(dados, raw=False, strict_map_key=False)
+            return json.loads(dados)
+        except ValueError as e:
+            print(f"[ERRO] Snapshot ilegível ({e}) — usando só o journal")
+            return None
+
+    def carregar(self):
+        """
+        Snapshot + replay do journal. Retorna {nome: {chave: valor}}
+        (sem tocar nos dicts vivos). O estado carregado vira o snapshot novo
+        e o journal recomeça vazio (descarta um fim truncado).
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        inicio = time.monotonic()
+
+        estado = {nome: {} for nome in self.tabelas}
+        seq_snapshot = 0
+
+        snapshot = self._ler_snapshot()
+        if snapshot:
+            seq_snapshot = snapshot["seq"]
+            for nome, tabela in snapshot["tabelas"].items():
+                if nome in estado:
+                    estado[nome].update(tabela)
+
+        seq = seq_snapshot
+        aplicados = 0
+        for seq_reg, op, tabela, chave, valor in _ler_registros(self.caminho_journal):
+            if seq_reg <= seq_snapshot or tabela not in estado:
+                continue
+            if op == OP_SET:
+                estado[tabela][chave] = valor
+            else:
+                estado[tabela].pop(chave, None)
+            seq = max(seq, seq_reg)
+            aplicados += 1
+
+        print(
+            f"[JOURNAL] {FORMATO}: snapshot seq={seq_snapshot} + {aplicados} registros "
+            f"em {(time.monotonic() - inicio) * 1000:.1f}ms"
+        )
+
+        with self._lock:
+            self.seq = seq
+            self._gravar_snapshot(estado)
+            self.ativo = True
+
+        return estado
@@ -0,0 +1,245 @@
+﻿# Arquivo - klines_store.py
+# Guarda os últimos fechamentos de cada moeda/timeframe em ring buffers de tamanho fixo.
+# Alimentado pelos streams <symbol>@kline_<intervalo> (gerenciador_streams), aquecido no startup (REST)
+# e reaquecido a cada reconexão da conexão de klines (velas perdidas durante a queda).
+# A MM8 vira leitura O(1) de uma soma corrente, sem futures_klines por sinal.
+# Buffer parado (stream travado / reconectando) ou com buraco entre velas não serve a MM8:
+# mm8_store devolve None e o executor cai no futures_klines.
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import binance_client
+from decodificador_ws import loads
+
+MM_PERIODO = 8
+
+UNIDADES_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def intervalo_ms(intervalo):
+    # "15m" -> 900000
+    return int(intervalo[:-1]) * UNIDADES_MS[intervalo[-1]]
+
+# ==========================================================
+# 🔁 RING BUFFER DE FECHAMENTOS
+# ==========================================================
+class KlineBuffer:
+    """
+    Últimos `tamanho` fechamentos de uma moeda/timeframe.
+    O slot mais recente é o candle em andamento (igual ao futures_klines),
+    atualizado a cada evento até o próximo open_time.
+    `contiguos` conta as velas finais sem buraco (open_time anterior + passo).
+    """
+
+    __slots__ = ("tamanho", "passo", "closes", "open_times", "idx", "count", "contiguos", "soma", "lock")
+
+    def __init__(self, tamanho=MM_PERIODO, passo=None):
+        self.tamanho = tamanho
+        self.passo = passo          # ms por vela (None = sem checagem de atraso / buraco)
+        self.closes = [0.0] * tamanho
+        self.open_times = [0] * tamanho
+        self.idx = -1
+        self.count = 0
+        self.contiguos = 0
+        self.soma = 0.0
+        self.lock = threading.Lock()
+
+    def atualizar(self, open_time, close):
+        with self.lock:
+            if self.count and open_time == self.open_times[self.idx]:
+                # mesmo candle -> só troca o fechamento
+                self.soma += close - self.closes[self.idx]
+                self.closes[self.idx] = close
+                return
+
+            if self.count and open_time < self.open_times[self.idx]:
+                return  # evento atrasado
+
+            # novo candle -> avança o ring
+            if self.count and self.passo and open_time != self.open_times[self.idx] + self.passo:
+                self.contiguos = 0   # velas perdidas (reconexão): janela com buraco
+            self.contiguos = min(self.contiguos + 1, self.tamanho)
+
+            self.idx = (self.idx + 1) % self.tamanho
+            if self.count == self.tamanho:
+                self.soma -= self.closes[self.idx]
+            else:
+                self.count += 1
+
+            self.closes[self.idx] = close
+            self.open_times[self.idx] = open_time
+            self.soma += close
+
+    def carregar(self, historico):
+        """
+        Mescla o histórico do REST [(open_time, close), ...] com o que o
+        stream já entregou (o stream prevalece por ser mais recente).
+        """
+        with self.lock:
+            por_open_time = dict(historico)
+            for i in range(self.count):
+                j = (self.idx - i) % self.tamanho
+                por_open_time[self.open_times[j]] = self.closes[j]
+
+            itens = sorted(por_open_time.items())[-self.tamanho:]
+
+            self.closes = [0.0] * self.tamanho
+            self.open_times = [0] * self.tamanho
+            for i, (open_time, close) in enumerate(itens):
+                self.open_times[i] = open_time
+                self.closes[i] = close
+
+            self.count = len(itens)
+            self.idx = self.count - 1 if itens else -1
+            self.soma = sum(self.closes[:self.count])
+
+            self.contiguos = min(1, self.count)
+            for i in range(self.count - 1, 0, -1):
+                if self.passo and self.open_times[i] - self.open_times[i - 1] != self.passo:
+                    break
+                self.contiguos += 1
+
+    def media(self, agora_ms=None):
+        """
+        MM da janela, ou None se incompleta, com buraco ou parada
+        (última vela não é a atual nem a anterior do timeframe).
+        """
+        with self.lock:
+            if self.count < self.tamanho or self.contiguos < self.tamanho:
+                return None
+            if self.passo:
+                agora_ms = agora_ms if agora_ms is not None else int(time.time() * 1000)
+                if self.open_times[self.idx] < agora_ms // self.passo * self.passo - self.passo:
+                    return None
+            return self.soma / self.tamanho
+
+    def ultimo_open_time(self):
+        with self.lock:
+            return self.open_times[self.idx] if self.count else None
+
+# ==========================================================
+# 📦 STORE (symbol, timeframe) -> KlineBuffer
+# ==========================================================
+_buffers = {}
+_intervalos = {}   # intervalo Binance ("15m") -> timeframe interno
+
+
+def buffer_klines(symbol, timeframe):
+    return _buffers.get((symbol, timeframe))
+
+
+def mm8_store(symbol, timeframe):
+    """
+    MM8 da memória ou None se o buffer ainda não foi aquecido, está parado ou tem buraco.
+    """
+    buf = _buffers.get((symbol, timeframe))
+    if not buf:
+        return None
+    return buf.media()
+
+
+def processar_kline(k):
+    timeframe = _intervalos.get(k["i"])
+    if timeframe is None:
+        return
+
+    buf = _buffers.get((k["s"], timeframe))
+    if buf is None:
+        return
+
+    buf.atualizar(int(k["t"]), float(k["c"]))
+
+# ==========================================================
+# 🔥 AQUECIMENTO (REST uma vez no startup)
+# ==========================================================
+def aquecer_buffer(symbol, timeframe, intervalo):
+    klines = binance_client.futures_klines(
+        symbol=symbol,
+        interval=intervalo,
+        limit=MM_PERIODO
+    )
+
+    _buffers[(symbol, timeframe)].carregar(
+        [(int(k[0]), float(k[4])) for k in klines]
+    )
+
+
+def aquecer_store(symbols, tf_map, workers=8):
+    tarefas = [
+        (symbol, timeframe, intervalo)
+        for symbol in symbols
+        for timeframe, intervalo in tf_map.items()
+    ]
+    _aquecer_tarefas(tarefas, workers)
+
+
+def _aquecer_tarefas(tarefas, workers=8):
+    inicio = time.monotonic()
+
+    def _aquecer(tarefa):
+        try:
+            aquecer_buffer(*tarefa)
+        except Exception as e:
+            print(f"[ERRO] Aquecer klines {tarefa[0]} {tarefa[1]}: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_aquecer, tarefas))
+
+    print(f"[KLINES] {len(tarefas)} buffers aquecidos em {time.monotonic() - inicio:.1f}s")
+
+# ==========================================================
+# 📡 STREAMS <symbol>@kline_<intervalo>
+# ==========================================================
+def processar_frame_kline(stream, texto):
+    data = loads(texto)
+    if data.get("e") == "kline":
+        processar_kline(data["k"])
+
+
+_conexoes = {}   # streams da conexão -> conexões já feitas
+
+
+def reaquecer_conexao(streams):
+    """
+    on_conectado da conexão de klines (no loop): na reconexão, recarrega pelo REST
+    os buffers daqueles streams numa thread. A 1ª conexão fica com o aquecer_store do startup.
+    """
+    chave = tuple(streams)
+    _conexoes[chave] = _conexoes.get(chave, 0) + 1
+    if _conexoes[chave] == 1:
+        return
+
+    tarefas = []
+    for stream in streams:
+        symbol, intervalo = stream.split("@kline_")
+        timeframe = _intervalos.get(intervalo)
+        if timeframe is not None:
+            tarefas.append((symbol.upper(), timeframe, intervalo))
+
+    print(f"[KLINES] Reconexão: reaquecendo {len(tarefas)} buffers")
+    threading.Thread(target=_aquecer_tarefas, args=(tarefas,), daemon=True).start()
+
+
+def registrar_buffers(symbols, tf_map):
+    for timeframe, intervalo in tf_map.items():
+        _intervalos[intervalo] = timeframe
+        for symbol in symbols:
+            _buffers.setdefault((symbol, timeframe), KlineBuffer(passo=intervalo_ms(intervalo)))
+
+
+def registrar_store_klines(gerenciador, symbols, tf_map):
+    """
+    Cria os buffers e assina os streams no gerenciador. O aquecimento
+    (aquecer_store) roda depois da conexão: o que chegar durante o REST
+    é mesclado em KlineBuffer.carregar.
+    """
+    symbols = sorted(symbols)
+    registrar_buffers(symbols, tf_map)
+
+    streams = [
+        f"{symbol.lower()}@kline_{intervalo}"
+        for symbol in symbols
+        for intervalo in tf_map.values()
+    ]
+    gerenciador.assinar(streams, processar_frame_kline, nome="klines", on_conectado=reaquecer_conexao)
@@ -0,0 +1,158 @@
+﻿# Arquivo - livro_ordens.py
+# Espelho local das ordens de ENTRADA abertas (ignora TP / SL / Trailing).
+# Semeado no startup com futures_get_open_orders, mantido pelos eventos ORDER_TRADE_UPDATE
+# e reconciliado periodicamente. Os limites de exposição leem exposicao_ordens, sem REST por sinal.
+# O WS pode entregar FILLED / CANCELED antes da resposta REST (comum em MARKET): os ids já
+# fechados ficam num conjunto limitado e a resposta atrasada (NEW) não reabre a ordem.
+# A reconciliação mescla em vez de limpar: o que foi registrado depois do início da consulta
+# REST (resposta de envio / evento NEW) fica, e o que o WS já fechou não volta pelo snapshot.
+
+import time
+import threading
+from collections import OrderedDict
+from config import binance_client, LIVRO_ORDENS_RECONCILIAR
+from exposicao import exposicao_ordens
+
+STATUS_ABERTOS = ("NEW", "PARTIALLY_FILLED")
+MAX_FECHADAS = 4096
+
+# ==========================================================
+# 📦 LIVRO order_id -> (symbol, positionSide)
+# ==========================================================
+_ordens = {}
+_abertas_em = {}              # order_id -> monotonic do registro
+_fechadas = OrderedDict()     # order_id já finalizado no WS (status final não volta a abrir)
+_lock = threading.Lock()
+
+
+def ordem_de_entrada(side, position_side, reduce_only=False, close_position=False):
+    """
+    Entrada = ordem que abre/aumenta posição:
+    BUY no LONG, SELL no SHORT (modo HEDGE) ou sem reduceOnly no modo BOTH.
+    """
+    if reduce_only or close_position:
+        return False
+    if position_side == "LONG":
+        return side == "BUY"
+    if position_side == "SHORT":
+        return side == "SELL"
+    return True
+
+
+def _abrir(order_id, symbol, position_side):
+    if order_id in _ordens or order_id in _fechadas:
+        return
+    _ordens[order_id] = (symbol, position_side)
+    _abertas_em[order_id] = time.monotonic()
+    exposicao_ordens.somar(symbol, position_side, 1)
+
+
+def _fechar(order_id):
+    _fechadas[order_id] = None
+    if len(_fechadas) > MAX_FECHADAS:
+        _fechadas.popitem(last=False)
+
+    _abertas_em.pop(order_id, None)
+    item = _ordens.pop(order_id, None)
+    if item:
+        exposicao_ordens.somar(item[0], item[1], -1)
+
+# ==========================================================
+# 🔢 ATUALIZAÇÃO
+# ==========================================================
+def aplicar_evento_ordem(o):
+    """
+    Aplica um ORDER_TRADE_UPDATE (EventoOrdem do decodificador_ws).
+    """
+    with _lock:
+        if o.status not in STATUS_ABERTOS:
+            _fechar(o.order_id)
+            return
+
+        if ordem_de_entrada(o.lado, o.side, o.reduce_only, o.close_position):
+            _abrir(o.order_id, o.symbol, o.side)
+
+
+def registrar_ordem_enviada(order):
+    """
+    Registra a resposta do futures_create_order sem esperar o evento do WS
+    (evita duas entradas passarem no limite durante uma rajada de sinais).
+    """
+    if order.get("status") not in STATUS_ABERTOS:
+        return
+
+    if not ordem_de_entrada(
+        order["side"],
+        order.get("positionSide"),
+        order.get("reduceOnly", False),
+        order.get("closePosition", False),
+    ):
+        return
+
+    with _lock:
+        _abrir(order["orderId"], order["symbol"], order.get("positionSide"))
+
+
+def semear_livro(open_orders, desde=None):
+    """
+    Reconstrói o livro a partir de um futures_get_open_orders.
+    desde = monotonic de quando a consulta começou: ordens registradas depois disso
+    ficam mesmo fora do snapshot; ids já fechados no WS não são reabertos.
+    """
+    with _lock:
+        novas = {}
+        for o in open_orders:
+            if o["status"] not in STATUS_ABERTOS or o["orderId"] in _fechadas:
+                continue
+            if not ordem_de_entrada(
+                o["side"],
+                o.get("positionSide"),
+                o.get("reduceOnly", False),
+                o.get("closePosition", False),
+            ):
+                continue
+            novas[o["orderId"]] = (o["symbol"], o.get("positionSide"))
+
+        if desde is not None:
+            for order_id, item in _ordens.items():
+                if order_id not in novas and _abertas_em.get(order_id, 0.0) >= desde:
+                    novas[order_id] = item
+
+        abertas_em = {order_id: _abertas_em.get(order_id, time.monotonic()) for order_id in novas}
+
+        _ordens.clear()
+        _abertas_em.clear()
+        exposicao_ordens.limpar()
+        for order_id, (symbol, position_side) in novas.items():
+            _abrir(order_id, symbol, position_side)
+        _abertas_em.update(abertas_em)
+
+
+def sincronizar_livro():
+    desde = time.monotonic()
+    semear_livro(binance_client.futures_get_open_orders(), desde)
+    print(f"[LIVRO] {len(_ordens)} ordens de entrada abertas")
+
+# ==========================================================
+# 🔎 CONSULTA
+# ==========================================================
+def contagem_ordens_entrada():
+    return exposicao_ordens.como_dict()
+
+# ==========================================================
+# 🔄 RECONCILIAÇÃO PERIÓDICA
+# ==========================================================
+def _loop_reconciliar():
+    while True:
+        time.sleep(LIVRO_ORDENS_RECONCILIAR)
+        try:
+            sincronizar_livro()
+        except Exception as e:
+            print(f"[ERRO] Reconciliar livro: {e}")
+
+
+def iniciar_reconciliacao_livro():
+    threading.Thread(
+        target=_loop_reconciliar,
+        daemon=True
+    ).start()
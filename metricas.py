@@ -0,0 +1,234 @@
+﻿# Arquivo - metricas.py
+# Registro de métricas em processo (Counter / Gauge / Histogram) no formato texto do Prometheus.
+# - atualização barata: um lock por métrica, sem I/O (seguro no loop de streams,
+#   no loop do Telethon e nas threads do Flask)
+# - métricas derivadas de estado existente (tamanho de dicts, profundidade de filas,
+#   frames por conexão) são coletadas só na leitura, via definir_coleta(func)
+# - exposto em /metrics pelo Flask (executorwsoket.py) ou por iniciar_servidor_metricas(porta)
+
+import bisect
+import inspect
+import threading
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIXO = "agulhadas_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_registro = []
+
+# ==========================================================
+# 🔢 TIPOS
+# ==========================================================
+def _escapar(valor):
+    # formato texto: \\, \" e \n dentro do valor do rótulo
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(nomes, valores, extra=None):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class _Metrica:
+
+    tipo = ""
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = PREFIXO + nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._coleta = None
+        self._lock = threading.Lock()
+        _registro.append(self)
+
+    def definir_coleta(self, func):
+        """
+        func() -> número (sem rótulos) ou {(valores dos rótulos): número},
+        chamada a cada leitura do /metrics.
+        """
+        self._coleta = func
+
+    def _amostras(self):
+        if self._coleta:
+            try:
+                valores = self._coleta()
+            except Exception as e:
+                print(f"[ERRO] Métrica {self.nome}: {e}")
+                return {}
+            return valores if isinstance(valores, dict) else {(): valores}
+
+        with self._lock:
+            return dict(self._valores)
+
+    def texto(self):
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        for rotulos, valor in sorted(self._amostras().items()):
+            linhas.append(f"{self.nome}{_formatar_rotulos(self.rotulos, rotulos)} {valor}")
+        return linhas
+
+
+class Contador(_Metrica):
+
+    tipo = "counter"
+
+    def inc(self, *rotulos, valor=1):
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + valor
+
+
+class Medidor(_Metrica):
+
+    tipo = "gauge"
+
+    def set(self, *rotulos, valor):
+        with self._lock:
+            self._valores[rotulos] = valor
+
+
+class Histograma(_Metrica):
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_MS):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(buckets)
+
+    def observar(self, valor, *rotulos):
+        i = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._valores.get(rotulos)
+            if serie is None:
+                # [contagem por bucket (+Inf no fim), soma, total]
+                serie = self._valores[rotulos] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def texto(self):
+        with self._lock:
+            series = {r: (list(s[0]), s[1], s[2]) for r, s in self._valores.items()}
+
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        for rotulos, (contagens, soma, total) in sorted(series.items()):
+            acumulado = 0
+            for limite, n in zip(self.buckets + ("+Inf",), contagens):
+                acumulado += n
+                le = _formatar_rotulos(self.rotulos, rotulos, f'le="{limite}"')
+                linhas.append(f"{self.nome}_bucket{le} {acumulado}")
+            base = _formatar_rotulos(self.rotulos, rotulos)
+            linhas.append(f"{self.nome}_sum{base} {soma}")
+            linhas.append(f"{self.nome}_count{base} {total}")
+        return linhas
+
+
+def gerar_texto():
+    linhas = []
+    for metrica in _registro:
+        linhas.extend(metrica.texto())
+    return "\n".join(linhas) + "\n"
+
+# ==========================================================
+# 📦 MÉTRICAS DO EXECUTOR
+# ==========================================================
+sinais_recebidos = Contador("sinais_recebidos_total", "Sinais interpretados", ("timeframe",))
+sinais_ignorados = Contador("sinais_ignorados_total", "Sinais descartados antes do envio", ("motivo",))
+ordens_enviadas = Contador("ordens_enviadas_total", "Ordens de entrada aceitas pela corretora", ("tipo",))
+ordens_erro = Contador("ordens_erro_total", "Falhas no envio de ordens de entrada")
+
+rest_chamadas = Contador("rest_chamadas_total", "Chamadas REST à Binance", ("metodo", "endpoint"))
+rest_erros = Contador("rest_erros_total", "Chamadas REST com exceção", ("endpoint",))
+rest_peso = Medidor("rest_peso_usado_1m", "X-MBX-USED-WEIGHT-1M da última resposta")
+rest_ordens_1m = Medidor("rest_ordens_1m", "X-MBX-ORDER-COUNT-1M da última resposta")
+
+ws_frames = Contador("ws_frames_total", "Frames recebidos por conexão (rate() = frames/s)", ("grupo",))
+fila_profundidade = Medidor("fila_profundidade", "Eventos aguardando nos workers do despacho", ("fila",))
+fila_eventos = Contador("fila_eventos_total", "Eventos do despacho por resultado", ("resultado",))
+dedupe_mensagens = Contador("dedupe_mensagens_total", "Mensagens do Telegram no cache de duplicatas", ("resultado",))
+estado_tamanho = Medidor("estado_tamanho", "Entradas nos dicts de estado do executor", ("tabela",))
+
+latencia_etapa = Histograma("latencia_etapa_ms", "Latência por etapa do sinal (tracing)", ("etapa",))
+
+# ==========================================================
+# 🌐 CLIENTE REST (python-binance)
+# ==========================================================
+def _endpoint(uri):
+    return urlparse(uri).path or uri
+
+
+def _peso(client):
+    resp = getattr(client, "response", None)
+    headers = getattr(resp, "headers", None)
+    if not headers:
+        return
+    peso = headers.get("X-MBX-USED-WEIGHT-1M")
+    if peso is not None:
+        rest_peso.set(valor=int(peso))
+    ordens = headers.get("X-MBX-ORDER-COUNT-1M")
+    if ordens is not None:
+        rest_ordens_1m.set(valor=int(ordens))
+
+
+def instrumentar_client(client):
+    """
+    Embrulha client._request (Client e AsyncClient): toda chamada REST passa por ele.
+    """
+    original = client._request
+
+    if inspect.iscoroutinefunction(original):
+        async def _request(method, uri, *args, **kwargs):
+            endpoint = _endpoint(uri)
+            rest_chamadas.inc(method.upper(), endpoint)
+            try:
+                return await original(method, uri, *args, **kwargs)
+            except Exception:
+                rest_erros.inc(endpoint)
+                raise
+            finally:
+                _peso(client)
+    else:
+        def _request(method, uri, *args, **kwargs):
+            endpoint = _endpoint(uri)
+            rest_chamadas.inc(method.upper(), endpoint)
+            try:
+                return original(method, uri, *args, **kwargs)
+            except Exception:
+                rest_erros.inc(endpoint)
+                raise
+            finally:
+                _peso(client)
+
+    client._request = _request
+    return client
+
+# ==========================================================
+# 🌐 SERVIDOR HTTP (sem Flask)
+# ==========================================================
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corpo = gerar_texto().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_servidor_metricas(porta):
+    servidor = ThreadingHTTPServer(("0.0.0.0", porta), _Handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+    print(f"[METRICAS] /metrics na porta {porta}")
+    return servidor
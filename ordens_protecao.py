@@ -0,0 +1,175 @@
+﻿# Arquivo - ordens_protecao.py
+# Envio das ordens de proteção (TP1 / TP2 / Trailing / Stop).
+# - LIMIT (TP1 / TP2): futures batchOrders, um único round trip por bracket (até 5 pernas)
+# - condicionais (STOP_MARKET / TRAILING_STOP_MARKET ...): a Binance só aceita no endpoint de algo
+#   orders (/fapi/v1/algoOrder); uma chamada por perna, em paralelo
+# Resultado por perna e retry só das pernas que falharam por erro transitório.
+# Cada perna leva um id fixo desde a 1ª tentativa (newClientOrderId / clientAlgoId): timeout / -1007
+# podem ter criado a ordem, e o reenvio com o mesmo id é recusado em vez de duplicar a perna.
+
+import time
+import uuid
+from decimal import Decimal
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from config import binance_client
+
+MAX_PERNAS_POR_LOTE = 5            # limite da Binance para /fapi/v1/batchOrders
+TENTATIVAS_LOTE = 3
+ESPERA_RETRY = 0.2                 # segundos
+
+# erros em que reenviar faz sentido (timeout / sobrecarga / status desconhecido)
+ERROS_TRANSITORIOS = {-1000, -1001, -1003, -1007, -1008}
+ERRO_CLIENT_ID_DUPLICADO = -4116
+
+# tipos que a Binance roteia para /fapi/v1/algoOrder (recusados no batchOrders)
+TIPOS_CONDICIONAIS = {"STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET"}
+
+_pool_algo = ThreadPoolExecutor(max_workers=4, thread_name_prefix="algo")
+
+
+def novo_client_id():
+    # dentro do padrão do newClientOrderId / clientAlgoId ([.A-Z:/a-z0-9_-]{1,36})
+    return f"pt-{uuid.uuid4().hex[:24]}"
+
+
+def condicional(perna):
+    return perna["type"] in TIPOS_CONDICIONAIS
+
+
+def _formatar(valor):
+    # batchOrders exige strings; evita notação científica (1e-05)
+    if isinstance(valor, float):
+        return format(Decimal(repr(valor)), "f")
+    if isinstance(valor, bool):
+        return "true" if valor else "false"
+    return str(valor)
+
+
+def _payload(perna):
+    return {k: _formatar(v) for k, v in perna.items() if not k.startswith("_")}
+
+
+def _erro(e):
+    return {"code": getattr(e, "code", -1000), "msg": str(e)}
+
+
+def _erro_transitorio(resultado):
+    return isinstance(resultado, dict) and resultado.get("code") in ERROS_TRANSITORIOS
+
+# ==========================================================
+# 📦 LIMIT (batchOrders)
+# ==========================================================
+def _enviar_lote(pernas):
+    """
+    Um request batchOrders. Exceção de rede vira erro transitório em todas as pernas.
+    """
+    try:
+        return binance_client.futures_place_batch_order(
+            batchOrders=[_payload(p) for p in pernas]
+        )
+    except Exception as e:
+        return [_erro(e) for _ in pernas]
+
+
+def _ordem_ja_criada(perna, resp):
+    """
+    -4116 num reenvio: uma tentativa anterior foi aceita. Busca a ordem pelo client id.
+    """
+    try:
+        return binance_client.futures_get_order(
+            symbol=perna["symbol"],
+            origClientOrderId=perna["newClientOrderId"]
+        )
+    except Exception as e:
+        print(f"[ERRO] Consulta {perna['newClientOrderId']} após -4116: {e}")
+        return resp
+
+
+def _enviar_em_lote(pernas):
+    resultados = [None] * len(pernas)
+    pendentes = list(range(len(pernas)))
+
+    for tentativa in range(TENTATIVAS_LOTE):
+        if not pendentes:
+            break
+        if tentativa:
+            time.sleep(ESPERA_RETRY * tentativa)
+
+        proximos = []
+        for i in range(0, len(pendentes), MAX_PERNAS_POR_LOTE):
+            lote = pendentes[i:i + MAX_PERNAS_POR_LOTE]
+            respostas = _enviar_lote([pernas[j] for j in lote])
+
+            for j, resp in zip(lote, respostas):
+                if tentativa and isinstance(resp, dict) and resp.get("code") == ERRO_CLIENT_ID_DUPLICADO:
+                    resp = _ordem_ja_criada(pernas[j], resp)
+                resultados[j] = resp
+                if _erro_transitorio(resp):
+                    proximos.append(j)
+
+        pendentes = proximos
+
+    return resultados
+
+# ==========================================================
+# ⏱ CONDICIONAIS (algoOrder)
+# ==========================================================
+def _algo_ja_criada(perna):
+    # reenvio: a tentativa anterior pode ter sido aceita (clientAlgoId único entre as abertas)
+    try:
+        resp = binance_client.futures_get_algo_order(symbol=perna["symbol"], clientAlgoId=perna["clientAlgoId"])
+    except Exception:
+        return None
+    return resp if isinstance(resp, dict) and resp.get("algoId") else None
+
+
+def _enviar_algo(perna):
+    resp = None
+    for tentativa in range(TENTATIVAS_LOTE):
+        if tentativa:
+            time.sleep(ESPERA_RETRY * tentativa)
+            criada = _algo_ja_criada(perna)
+            if criada:
+                return criada
+        try:
+            return binance_client.futures_create_algo_order(algoType="CONDITIONAL", **_payload(perna))
+        except Exception as e:
+            resp = _erro(e)
+            if not _erro_transitorio(resp):
+                return resp
+    return resp
+
+# ==========================================================
+# 🚀 ENVIO
+# ==========================================================
+def enviar_pernas(pernas):
+    """
+    Envia as pernas (LIMIT em lote, condicionais no algoOrder) e devolve [(perna, resultado)]
+    na mesma ordem. resultado = ordem criada (dict com orderId / algoId) ou {"code", "msg"}.
+    """
+    # id fixo por perna: o python-binance sortearia um novo a cada tentativa
+    for perna in pernas:
+        perna.setdefault("clientAlgoId" if condicional(perna) else "newClientOrderId", novo_client_id())
+
+    limites = [i for i, p in enumerate(pernas) if not condicional(p)]
+    algos = [i for i, p in enumerate(pernas) if condicional(p)]
+
+    futuros = [(i, _pool_algo.submit(_enviar_algo, pernas[i])) for i in algos]
+    resultados = [None] * len(pernas)
+    if limites:
+        for i, resp in zip(limites, _enviar_em_lote([pernas[i] for i in limites])):
+            resultados[i] = resp
+    for i, futuro in futuros:
+        resultados[i] = futuro.result()
+
+    agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for perna, resp in zip(pernas, resultados):
+        rotulo = perna.get("_rotulo", perna.get("type"))
+        if isinstance(resp, dict) and (resp.get("orderId") or resp.get("algoId")):
+            preco = perna.get("price", perna.get("triggerPrice", perna.get("activatePrice")))
+            print(f"{agora} [{rotulo}] {perna['symbol']} Enviado {preco} qty {perna['quantity']}")
+        else:
+            print(f"[ERRO] {rotulo} {perna['symbol']}: {resp}")
+
+    return list(zip(pernas, resultados))
@@ -0,0 +1,112 @@
+﻿# Arquivo - parser_sinais.py
+# Parser único das mensagens do grupo de sinais (AgulhadasRailway e appwebAgulhadas).
+# Uma passada por mensagem: regex pré-compilado + tabelas de timeframe / frase do sinal,
+# devolvendo o sinal de execução e o registro de log/encaminhamento juntos.
+# Saídas conferidas contra benchmarks/corpus_sinais.json (benchmarks/bench_parser.py).
+
+import re
+
+RE_MENSAGEM = re.compile(
+    r'(?P<exchange>\w+):(?P<symbol>[\w\.]+)\s+deu\s+'
+    r'(?P<signal>.+?)\s+'
+    r'(?:nos?|nas?)\s+'
+    r'(?P<timeframe>\d+\s*(?:minutos?|H))'
+    r'.*?\n+'
+    r'Preço:\s*(?P<price>.+)',
+    re.IGNORECASE | re.DOTALL
+)
+RE_NUMERO = re.compile(r'\d+(?:\.\d+)?')
+RE_SIMBOLO = re.compile(r'[A-Z0-9]+')
+
+# timeframe normalizado -> (timeframe do executor, tipo de ordem padrão)
+TIMEFRAMES = {
+    "15minutos": ("15m", "MARKET"),
+    "60minutos": ("1h", "MARKET"),
+    "1h": ("1h", "MARKET"),
+    "4h": ("4h", "LIMIT"),
+}
+
+# frase do sinal -> (side, força LIMIT); a ordem importa na busca por substring
+SINAIS = {
+    "alerta de compra": ("LONG", False),
+    "agulhada de compra": ("LONG", True),
+    "agulhada santa de compra": ("LONG", False),
+    "alerta de venda": ("SHORT", False),
+    "agulhada de venda": ("SHORT", True),
+    "agulhada santa de venda": ("SHORT", False),
+}
+
+
+def _lado(frase):
+    lado = SINAIS.get(frase)
+    if lado:
+        return lado
+    for chave, lado in SINAIS.items():
+        if chave in frase:
+            return lado
+    return None
+
+
+def interpretar_sinal(texto):
+    """
+    (sinal, registro) de uma mensagem, numa passada.
+    sinal: ordem para o executor (só BINANCE, timeframe e sinal conhecidos) ou None
+    registro: campos para log / encaminhamento (qualquer corretora) ou None
+    """
+    # grupos movimentados: descarta conversa sem custo de regex
+    if "preço:" not in texto.lower():
+        return None, None
+
+    match = RE_MENSAGEM.search(texto.strip().replace("\r", ""))
+    if not match:
+        return None, None
+
+    bruto = match.group("price")
+    numero = RE_NUMERO.search(bruto)
+    if not numero:
+        return None, None
+
+    price = float(numero.group())
+    frase = match.group("signal").lower()
+    timeframe = match.group("timeframe").lower().replace(" ", "")
+
+    registro = {
+        "exchange": match.group("exchange").upper(),
+        "symbol": match.group("symbol").replace(".P", "").upper(),
+        "signal": frase,
+        "timeframe": timeframe,
+        "price": price
+    }
+
+    # execução: só BINANCE (MEXC / BYBIT só encaminham) e preço na própria linha do "Preço:"
+    if not texto.startswith("BINANCE:") or "\n" in bruto[:numero.start()]:
+        return None, registro
+
+    simbolo = RE_SIMBOLO.match(match.group("symbol"))
+    tf = TIMEFRAMES.get(timeframe)
+    lado = _lado(frase)
+    if not simbolo or not tf or not lado:
+        return None, registro
+
+    timeframe_exec, order_type = tf
+    side, forca_limit = lado
+    if forca_limit:
+        order_type = "LIMIT"
+
+    sinal = {
+        "exchange": "BINANCE",
+        "symbol": simbolo.group(),
+        "side": side,
+        "order_type": order_type,
+        "timeframe": timeframe_exec,
+        "price": price
+    }
+    return sinal, registro
+
+
+def interpretar_mensagem(texto):
+    return interpretar_sinal(texto)[0]
+
+
+def parse_signal_message(text: str):
+    return interpretar_sinal(text)[1]
@@ -17,7 +17,8 @@ COLUMNS = [
     "status",
     "pnl",
     "roi",
-    "raw_message"
+    "raw_message",
+    "signal_id"
 ]
 
 
@@ -26,10 +27,33 @@ def get_log_filename():
     return os.path.join(LOG_DIR, f"trading_log_{data}.tsv")
 
 
+HEADER = "\t".join(COLUMNS) + "\n"
+
+# arquivos já conferidos neste processo (o header só é lido uma vez por arquivo)
+_conferidos = set()
+
+
+def _separar_header_antigo(arquivo):
+    # arquivo do dia criado com outras colunas: renomeia e começa um novo com o header atual
+    base, ext = os.path.splitext(arquivo)
+    n = 1
+    while os.path.exists(f"{base}.antigo{n}{ext}"):
+        n += 1
+    os.replace(arquivo, f"{base}.antigo{n}{ext}")
+    print(f"[LOG] Header diferente de COLUMNS em {arquivo} — movido para {base}.antigo{n}{ext}")
+
+
 def escrever_header_se_nao_existir(arquivo):
+    if arquivo not in _conferidos:
+        if os.path.exists(arquivo):
+            with open(arquivo, "r", encoding="utf-8") as f:
+                if f.readline() != HEADER:
+                    _separar_header_antigo(arquivo)
+        _conferidos.add(arquivo)
+
     if not os.path.exists(arquivo):
         with open(arquivo, "w", encoding="utf-8") as f:
-            f.write("\t".join(COLUMNS) + "\n")
+            f.write(HEADER)
 
 
 def log_event(
@@ -44,7 +68,8 @@ def log_event(
     status="",
     pnl="",
     roi="",
-    raw_message=""
+    raw_message="",
+    signal_id=""
 ):
     arquivo = get_log_filename()
     escrever_header_se_nao_existir(arquivo)
@@ -64,7 +89,8 @@ def log_event(
         status,
         str(pnl),
         str(roi),
-        raw_message.replace("\n", " ").replace("\r", " ")
+        raw_message.replace("\n", " ").replace("\r", " "),
+        signal_id or ""
     ]
 
     with open(arquivo, "a", encoding="utf-8") as f:
@@ -0,0 +1,101 @@
+﻿# Arquivo - supervisor_ws.py
+# Supervisor do user data stream: listenKey, keepalive e ressincronização.
+# O transporte (conexão, backoff com jitter) fica no gerenciador_streams; aqui:
+# - obtém um listenKey novo quando o atual expira/é rejeitado (em vez de reconectar num stream morto)
+# - a cada reconexão chama o callback de ressincronização (delta de posições / ordens)
+
+import time
+import threading
+from config import binance_client
+from decodificador_ws import listen_key_expirado
+
+KEEPALIVE_INTERVALO = 30 * 60      # Binance expira o listenKey em 60 min sem keepalive
+
+ERRO_LISTEN_KEY_INEXISTENTE = -1125
+
+
+class SupervisorUserStream:
+
+    def __init__(self, on_frame, on_reconectado=None):
+        self.on_frame = on_frame
+        self.on_reconectado = on_reconectado
+        self.listen_key = None
+        self.grupo = None
+        self.conexoes = 0
+        self._lock = threading.Lock()
+
+    # ======================================================
+    # 🔑 LISTEN KEY
+    # ======================================================
+    def _novo_listen_key(self):
+        resp = binance_client.futures_stream_get_listen_key()
+        # compatível com qualquer versão da lib
+        return resp["listenKey"] if isinstance(resp, dict) else resp
+
+    def invalidar_listen_key(self, motivo):
+        with self._lock:
+            self.listen_key = None
+        print(f"[WS] listenKey invalidado ({motivo}) — reconectando com chave nova")
+        if self.grupo:
+            self.grupo.reconectar()
+
+    def _validar_listen_key(self):
+        # na reconexão a chave pode ter vencido enquanto o stream esteve fora
+        if not self.listen_key:
+            return
+        try:
+            binance_client.futures_stream_keepalive(self.listen_key)
+        except Exception as e:
+            print(f"[WS] listenKey atual rejeitado: {e}")
+            self.listen_key = None
+
+    def obter_listen_key(self):
+        """
+        Chamado pelo gerenciador a cada (re)conexão (bloqueante, fora do loop).
+        """
+        if self.conexoes:
+            self._validar_listen_key()
+
+        if not self.listen_key:
+            self.listen_key = self._novo_listen_key()
+            print(f"[WS] listenKey obtido")
+
+        return self.listen_key
+
+    def _loop_keepalive(self):
+        while True:
+            time.sleep(KEEPALIVE_INTERVALO)
+            chave = self.listen_key
+            if not chave:
+                continue
+            try:
+                binance_client.futures_stream_keepalive(chave)
+            except Exception as e:
+                print(f"[ERRO] keepalive: {e}")
+                if getattr(e, "code", None) == ERRO_LISTEN_KEY_INEXISTENTE:
+                    self.invalidar_listen_key("keepalive rejeitado")
+
+    # ======================================================
+    # 📡 EVENTOS DA CONEXÃO
+    # ======================================================
+    def processar_frame(self, stream, message):
+        if listen_key_expirado(message):
+            self.invalidar_listen_key("listenKeyExpired")
+            return
+        return self.on_frame(stream, message)
+
+    def conectado(self):
+        self.conexoes += 1
+
+        # reconexão: busca o que aconteceu enquanto o stream esteve fora
+        if self.conexoes > 1 and self.on_reconectado:
+            threading.Thread(target=self.on_reconectado, daemon=True).start()
+
+    def registrar(self, gerenciador):
+        self.grupo = gerenciador.assinar_dinamico(
+            self.obter_listen_key,
+            self.processar_frame,
+            on_conectado=self.conectado,
+            nome="user_data"
+        )
+        threading.Thread(target=self._loop_keepalive, daemon=True).start()
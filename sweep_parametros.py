@@ -0,0 +1,233 @@
+﻿# Arquivo - sweep_parametros.py
+# Varredura dos parâmetros da estratégia (config_estrategia.PARAMETROS) sobre o backtest.py,
+# em grade ou amostragem aleatória, distribuída num pool de processos (um por núcleo).
+# - os sinais são preparados uma vez no processo principal e entregues a cada worker no initializer
+# - as klines são abertas via mmap em cada worker: as páginas ficam no page cache do SO,
+#   compartilhadas entre os processos (nenhum worker carrega sua própria cópia)
+# - cada configuração roda rodar_backtest + resumir; os resultados chegam conforme terminam
+#   e a tabela final é ordenada por --ordenar
+#
+# Uso:
+#   python sweep_parametros.py --grade LEVERAGE=20,25,50 --grade TP_PARCIAL_PERCENT=0.6,0.8,1.0
+#   python sweep_parametros.py --aleatorio 200 --faixa LEVERAGE=10:50 --faixa TRAILING_CALLBACK_RATE=0.3:2.0 --seed 7
+#   python sweep_parametros.py --grade MAX_LONGS=1,2,3 --grade MAX_SHORTS=3,5 --ordenar drawdown --csv sweep.csv
+
+import os
+import csv
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config_estrategia import ALLOWED_SYMBOLS, PARAMETROS, parametros_atuais
+from backfill_sinais import carregar_dataset, SAIDA_PADRAO as PASTA_SINAIS
+from backtest import (
+    PASTA_KLINES,
+    ARQUIVO_FILTROS,
+    HORIZONTE_DIAS,
+    carregar_klines,
+    carregar_specs,
+    preparar_sinais,
+    rodar_backtest,
+    resumir
+)
+
+# métrica -> maior é melhor
+ORDENACOES = {
+    "pnl": True,
+    "drawdown": False,
+    "acerto": True,
+    "profit_factor": True,
+    "trades": True,
+}
+
+# estado de cada worker (preenchido pelo initializer)
+_sinais = None
+_ignorados_preparo = None
+_klines = None
+_specs = None
+_horizonte = None
+
+# ==========================================================
+# 🧮 CONFIGURAÇÕES
+# ==========================================================
+def _converter(nome, texto):
+    return type(parametros_atuais()[nome])(texto)
+
+
+def _nome_valor(opcao, flag):
+    nome, _, valor = opcao.partition("=")
+    nome = nome.strip().upper()
+    if nome not in PARAMETROS or not valor:
+        raise argparse.ArgumentTypeError(f"{flag} inválido: {opcao} (use NOME=... com NOME em {', '.join(PARAMETROS)})")
+    return nome, valor
+
+
+def expandir_grade(grade):
+    """
+    {nome: [valores]} -> lista de parâmetros completos (produto cartesiano sobre os atuais).
+    """
+    nomes = list(grade)
+    return [parametros_atuais(**dict(zip(nomes, combinacao))) for combinacao in itertools.product(*grade.values())]
+
+
+def amostrar(faixas, n, seed=None):
+    """
+    {nome: (min, max)} -> n parâmetros completos com valores uniformes na faixa
+    (inteiros para os parâmetros inteiros, extremos inclusos).
+    """
+    rng = np.random.default_rng(seed)
+    padrao = parametros_atuais()
+    configs = []
+    for _ in range(n):
+        valores = {}
+        for nome, (minimo, maximo) in faixas.items():
+            if isinstance(padrao[nome], int):
+                valores[nome] = int(rng.integers(minimo, maximo + 1))
+            else:
+                valores[nome] = round(float(rng.uniform(minimo, maximo)), 4)
+        configs.append(parametros_atuais(**valores))
+    return configs
+
+# ==========================================================
+# ⚙️ WORKERS
+# ==========================================================
+def _iniciar_worker(sinais, ignorados_preparo, specs, symbols, pasta_klines, horizonte):
+    global _sinais, _ignorados_preparo, _klines, _specs, _horizonte
+    _sinais = sinais
+    _ignorados_preparo = ignorados_preparo
+    _specs = specs
+    _horizonte = horizonte
+    _klines = carregar_klines(symbols, pasta_klines)   # mmap: leitura compartilhada via page cache
+
+
+def _rodar(indice, prm):
+    inicio = time.monotonic()
+    trades, ignorados = rodar_backtest(_sinais, _klines, _specs, prm, _horizonte)
+    return indice, prm, resumir(trades, _ignorados_preparo + ignorados), time.monotonic() - inicio
+
+# ==========================================================
+# 📊 TABELA
+# ==========================================================
+def ordenar(resultados, metrica):
+    return sorted(resultados, key=lambda r: r[2][metrica], reverse=ORDENACOES[metrica])
+
+
+def _variaveis(configs):
+    # só as colunas que mudam entre as configurações
+    return [nome for nome in PARAMETROS if len({c[nome] for c in configs}) > 1] or list(PARAMETROS[:1])
+
+
+def _linha(posicao, prm, resumo, variaveis):
+    params = " ".join(f"{nome}={prm[nome]}" for nome in variaveis)
+    return (
+        f"{posicao:>4}  pnl {resumo['pnl']:>10.2f}  dd {resumo['drawdown']:>9.2f}  "
+        f"acerto {resumo['acerto'] * 100:>5.1f}%  pf {resumo['profit_factor']:>5.2f}  "
+        f"trades {resumo['trades']:>6}  | {params}"
+    )
+
+
+def gravar_resultados(caminho, resultados):
+    colunas = list(PARAMETROS) + ["ordens", "trades", "pnl", "drawdown", "acerto", "profit_factor", "taxas"]
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(colunas)
+        for _, prm, resumo, _ in resultados:
+            w.writerow([prm[c] for c in PARAMETROS] + [resumo[c] for c in colunas[len(PARAMETROS):]])
+
+# ==========================================================
+# 🖥 CLI
+# ==========================================================
+def main():
+    parser = argparse.ArgumentParser(description="Varredura paralela dos parâmetros da estratégia sobre o backtest")
+    parser.add_argument("--grade", action="append", default=[], metavar="NOME=v1,v2,...", help="valores de um parâmetro (produto entre as grades)")
+    parser.add_argument("--aleatorio", type=int, metavar="N", help="N configurações aleatórias nas --faixa")
+    parser.add_argument("--faixa", action="append", default=[], metavar="NOME=min:max")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--ordenar", choices=sorted(ORDENACOES), default="pnl")
+    parser.add_argument("--top", type=int, default=20, help="linhas da tabela final")
+    parser.add_argument("--csv", help="grava todas as configurações e métricas em CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sinais", default=PASTA_SINAIS, help="pasta do backfill_sinais.py")
+    parser.add_argument("--klines", default=PASTA_KLINES)
+    parser.add_argument("--filtros", default=ARQUIVO_FILTROS, help="cache do exchange info (tick / step)")
+    parser.add_argument("--horizonte-dias", type=float, default=HORIZONTE_DIAS)
+    parser.add_argument("--todas", action="store_true", help="não aplica ALLOWED_SYMBOLS (FILTER_SYMBOLS=False)")
+    args = parser.parse_args()
+
+    try:
+        grade = {}
+        for opcao in args.grade:
+            nome, valores = _nome_valor(opcao, "--grade")
+            grade[nome] = [_converter(nome, v) for v in valores.split(",")]
+        faixas = {}
+        for opcao in args.faixa:
+            nome, valores = _nome_valor(opcao, "--faixa")
+            minimo, _, maximo = valores.partition(":")
+            faixas[nome] = (_converter(nome, minimo), _converter(nome, maximo or minimo))
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.aleatorio:
+        if not faixas:
+            parser.error("--aleatorio precisa de pelo menos uma --faixa")
+        configs = amostrar(faixas, args.aleatorio, args.seed)
+    elif grade:
+        configs = expandir_grade(grade)
+    else:
+        parser.error("informe --grade ou --aleatorio com --faixa")
+
+    inicio = time.monotonic()
+    dataset = carregar_dataset(args.sinais)
+    symbols = sorted(set(np.unique(dataset["symbol"]).tolist()) | set(ALLOWED_SYMBOLS))
+    klines = carregar_klines(symbols, args.klines)
+    specs = carregar_specs(symbols, args.filtros)
+    sinais, ignorados_preparo = preparar_sinais(dataset, klines, specs, filtrar_symbols=not args.todas)
+
+    # dataset vazio ou nenhum sinal com klines / filtros: preparar_sinais devolve {}
+    n_sinais = len(sinais.get("ts", ()))
+    if not n_sinais:
+        print(f"[SWEEP] Nenhum sinal simulável em {args.sinais} ({len(dataset['ts'])} no dataset, descartes: {dict(ignorados_preparo)})")
+        return
+
+    print(
+        f"[SWEEP] {len(configs)} configurações | {n_sinais} sinais | {len(klines)} moedas | "
+        f"{args.workers} workers (preparo {time.monotonic() - inicio:.1f}s)"
+    )
+
+    variaveis = _variaveis(configs)
+    resultados = []
+    inicio = time.monotonic()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_iniciar_worker,
+        initargs=(sinais, ignorados_preparo, specs, sorted(klines), args.klines, args.horizonte_dias),
+    ) as pool:
+        futuros = [pool.submit(_rodar, i, prm) for i, prm in enumerate(configs)]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            posicao = next(i for i, r in enumerate(ordenar(resultados, args.ordenar), 1) if r is resultado)
+            _, prm, resumo, duracao = resultado
+            print(f"[{len(resultados)}/{len(configs)}] {duracao:5.1f}s  " + _linha(posicao, prm, resumo, variaveis))
+
+    decorrido = time.monotonic() - inicio
+    ranking = ordenar(resultados, args.ordenar)
+
+    print("")
+    print(f"ranking por {args.ordenar} (top {min(args.top, len(ranking))} de {len(ranking)})")
+    for posicao, (_, prm, resumo, _) in enumerate(ranking[:args.top], 1):
+        print(_linha(posicao, prm, resumo, variaveis))
+    print("")
+    print(f"✅ {len(configs)} configurações em {decorrido:.1f}s ({len(configs) / max(decorrido, 1e-9):.2f} configs/s)")
+
+    if args.csv:
+        gravar_resultados(args.csv, ranking)
+        print(f"resultados        : {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
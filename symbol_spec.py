@@ -0,0 +1,69 @@
+﻿# Arquivo - symbol_spec.py
+# Especificação compacta de cada moeda (tick / step / precisões) montada uma única vez.
+# Quantização por inteiros: sem formatar/parsear string a cada chamada e sem o erro
+# do floor(valor / passo) em float (ex.: 0.3 / 0.1 = 2.9999999999999996 -> 2).
+
+import math
+from decimal import Decimal
+
+# tolerância (em unidades da última casa) para ruído de float logo abaixo da fronteira
+TOLERANCIA = 1e-6
+
+
+def casas_decimais(passo):
+    """
+    Casas decimais de um tick/step ("0.00010" -> 4, 1e-05 -> 5, 1.0 -> 0).
+    """
+    d = Decimal(passo if isinstance(passo, str) else repr(float(passo))).normalize()
+    return max(0, -d.as_tuple().exponent)
+
+
+class Quantizador:
+    """
+    Arredonda para baixo no múltiplo de `passo`, em aritmética inteira na escala 10^casas.
+    """
+
+    __slots__ = ("passo", "casas", "escala", "passo_int")
+
+    def __init__(self, passo):
+        self.passo = float(passo)
+        self.casas = casas_decimais(passo)
+        self.escala = 10 ** self.casas
+        self.passo_int = round(self.passo * self.escala)
+
+    def __call__(self, valor):
+        unidades = math.floor(valor * self.escala + TOLERANCIA)
+        return (unidades // self.passo_int) * self.passo_int / self.escala
+
+
+class SymbolSpec:
+    """
+    Filtros de uma moeda + quantizadores de preço e quantidade.
+    """
+
+    __slots__ = ("symbol", "tick", "step", "price_precision", "qty_precision", "preco", "qtd")
+
+    def __init__(self, symbol, tick, step):
+        self.symbol = symbol
+        self.preco = Quantizador(tick)
+        self.qtd = Quantizador(step)
+        self.tick = self.preco.passo
+        self.step = self.qtd.passo
+        self.price_precision = self.preco.casas
+        self.qty_precision = self.qtd.casas
+
+    def __repr__(self):
+        return f"SymbolSpec({self.symbol!r}, tick={self.tick}, step={self.step})"
+
+
+# ==========================================================
+# 🔢 QUANTIZAÇÃO AVULSA (normalize_qty / normalize_price)
+# ==========================================================
+_quantizadores = {}
+
+
+def quantizar(valor, passo):
+    q = _quantizadores.get(passo)
+    if q is None:
+        q = _quantizadores[passo] = Quantizador(passo)
+    return q(valor)
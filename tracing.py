@@ -0,0 +1,299 @@
+﻿# Arquivo - tracing.py
+# Rastreamento de latência do sinal: recebimento no Telegram -> ack da corretora -> confirmação no WS.
+# Cada sinal ganha um signal_id (também enviado como newClientOrderId, assim o evento
+# ORDER_TRADE_UPDATE volta com o mesmo id) e um Trace com spans em relógio monotônico.
+# Ao finalizar, as durações entram nos histogramas por etapa (p50 / p95 / p99).
+
+import re
+import time
+import itertools
+import threading
+from collections import OrderedDict, deque
+from structured_logger import log_event
+from metricas import latencia_etapa
+
+ETAPAS = (
+    "parse",        # interpretar_mensagem
+    "filtro",       # moeda permitida
+    "validacao",    # vela / posição / exposição (local)
+    "preco",        # mark price + limite de preço
+    "config",       # alavancagem / margem
+    "filtros",      # tick / step
+    "mm8",
+    "pre_trade",    # leituras do pré-trade (concorrentes) até o snapshot
+    "envio",        # futures_create_order até o ack REST
+    "ws_ack",       # envio -> NEW no user data stream
+    "ws_fill",      # envio -> FILLED no user data stream (MARKET)
+    "total",        # recebimento -> confirmação no WS (só ordens aceitas)
+)
+
+STATUS_FINAIS = ("FILLED", "CANCELED", "EXPIRED", "REJECTED")
+
+AMOSTRAS_POR_ETAPA = 5000
+MAX_TRACES_ABERTOS = 500
+TRACE_TTL = 300      # segundos esperando o evento do WS antes de descartar
+
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+SIGNAL_ID_VALIDO = re.compile(r"[.A-Z:/a-z0-9_-]{1,36}")
+
+
+def _base36(n):
+    digitos = ""
+    while True:
+        n, resto = divmod(n, 36)
+        digitos = _BASE36[resto] + digitos
+        if not n:
+            return digitos
+
+
+# epoch em ms completo (não dá a volta): o contador recomeça em 1 a cada restart e não pode
+# colidir com uma LIMIT GTC ainda aberta de uma execução anterior (-4116)
+_contador = itertools.count(1)
+_prefixo = f"ag{_base36(int(time.time() * 1000))}"
+
+
+def novo_signal_id():
+    # curto e dentro do padrão do newClientOrderId ([.A-Z:/a-z0-9_-]{1,36})
+    return f"{_prefixo}-{next(_contador)}"
+
+# ==========================================================
+# 📊 HISTOGRAMAS
+# ==========================================================
+_amostras = {etapa: deque(maxlen=AMOSTRAS_POR_ETAPA) for etapa in ETAPAS}
+_lock_amostras = threading.Lock()
+
+
+def _percentil(ordenado, p):
+    if not ordenado:
+        return None
+    i = min(len(ordenado) - 1, int(round(p / 100 * (len(ordenado) - 1))))
+    return ordenado[i]
+
+
+def resumo_latencias():
+    """
+    {etapa: {"n", "p50", "p95", "p99"}} em ms, só etapas com amostras.
+    """
+    with _lock_amostras:
+        copia = {etapa: sorted(a) for etapa, a in _amostras.items() if a}
+
+    return {
+        etapa: {
+            "n": len(valores),
+            "p50": _percentil(valores, 50),
+            "p95": _percentil(valores, 95),
+            "p99": _percentil(valores, 99),
+        }
+        for etapa, valores in copia.items()
+    }
+
+
+def imprimir_resumo():
+    resumo = resumo_latencias()
+    if not resumo:
+        return
+    print("[TRACE] Latência por etapa (ms)        n      p50      p95      p99")
+    for etapa in ETAPAS:
+        r = resumo.get(etapa)
+        if r:
+            print(f"[TRACE]   {etapa:<28}{r['n']:>6} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f}")
+
+# ==========================================================
+# 🧵 TRACE
+# ==========================================================
+class Trace:
+
+    __slots__ = (
+        "signal_id", "symbol", "inicio", "spans", "enviado", "aguarda",
+        "aceito", "confirmado", "criado_em", "finalizado", "vinculado"
+    )
+
+    def __init__(self, signal_id, inicio=None):
+        self.signal_id = signal_id
+        self.symbol = ""
+        self.inicio = inicio if inicio is not None else time.monotonic()
+        self.spans = {}
+        self.enviado = None      # monotonic do envio do futures_create_order
+        self.aguarda = None      # status do WS que encerra o trace ("NEW" / "FILLED")
+        self.aceito = False      # ack REST recebido
+        self.confirmado = False  # evento do WS recebido (pode chegar antes do ack REST)
+        self.criado_em = time.monotonic()
+        self.finalizado = False
+        self.vinculado = False   # já entregue a um sinal pelo trace_do_sinal
+
+    def registrar(self, etapa, inicio, fim=None):
+        fim = fim if fim is not None else time.monotonic()
+        self.spans[etapa] = (fim - inicio) * 1000
+
+    def span(self, etapa):
+        return _Span(self, etapa)
+
+    def medido(self, etapa, func):
+        """
+        func embrulhada com o span (para o pool / tasks do pré-trade).
+        """
+        def _medido(*args):
+            inicio = time.monotonic()
+            try:
+                return func(*args)
+            finally:
+                self.registrar(etapa, inicio)
+        return _medido
+
+    def medido_async(self, etapa, func):
+        async def _medido(*args):
+            inicio = time.monotonic()
+            try:
+                return await func(*args)
+            finally:
+                self.registrar(etapa, inicio)
+        return _medido
+
+    def resumo(self):
+        return " ".join(f"{etapa}={ms:.1f}ms" for etapa, ms in self.spans.items())
+
+
+class _Span:
+
+    __slots__ = ("trace", "etapa", "inicio")
+
+    def __init__(self, trace, etapa):
+        self.trace = trace
+        self.etapa = etapa
+
+    def __enter__(self):
+        self.inicio = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.registrar(self.etapa, self.inicio)
+        return False
+
+# ==========================================================
+# 📌 TRACES ABERTOS (signal_id -> Trace)
+# ==========================================================
+_abertos = OrderedDict()
+_lock_abertos = threading.Lock()
+
+
+def iniciar_trace(signal_id=None, inicio=None):
+    trace = Trace(signal_id or novo_signal_id(), inicio)
+    with _lock_abertos:
+        _abertos[trace.signal_id] = trace
+        while len(_abertos) > MAX_TRACES_ABERTOS:
+            _abertos.popitem(last=False)
+    return trace
+
+
+def trace_do_sinal(sinal):
+    """
+    Trace do sinal (criado no recebimento); sinais de outras entradas
+    (Flask / replay) ganham um aqui.
+    O signal_id vira newClientOrderId: um id de fora só é aceito se estiver no padrão
+    da Binance e não estiver em uso por outro sinal; senão é gerado um novo.
+    """
+    signal_id = sinal.get("signal_id")
+    if not isinstance(signal_id, str) or not SIGNAL_ID_VALIDO.fullmatch(signal_id):
+        signal_id = None
+
+    with _lock_abertos:
+        trace = _abertos.get(signal_id)
+        if trace is not None and not trace.vinculado:
+            trace.vinculado = True
+        else:
+            if trace is not None:
+                signal_id = None
+            trace = None
+
+    if trace is None:
+        trace = iniciar_trace(signal_id)
+        trace.vinculado = True
+    sinal["signal_id"] = trace.signal_id
+    trace.symbol = sinal.get("symbol", "")
+    return trace
+
+
+def marcar_envio(trace, order_type):
+    """
+    Imediatamente antes do futures_create_order. O trace fica aberto esperando
+    o evento do WS (FILLED para MARKET; NEW para LIMIT, que pode levar horas).
+    """
+    trace.aguarda = "FILLED" if order_type == "MARKET" else "NEW"
+    trace.enviado = time.monotonic()
+
+
+def marcar_aceito(trace):
+    trace.aceito = True
+    if trace.confirmado:
+        finalizar(trace)
+
+
+def confirmar_ws(client_id, status):
+    """
+    Chamado pelo tratar_ordem com o client_id do ORDER_TRADE_UPDATE
+    (o signal_id, para ordens enviadas por este processo).
+    """
+    trace = _abertos.get(client_id)
+    if trace is None or trace.enviado is None:
+        return None
+
+    if status == "NEW":
+        trace.registrar("ws_ack", trace.enviado)
+    elif status == "FILLED":
+        trace.registrar("ws_fill", trace.enviado)
+
+    if status == trace.aguarda or status in STATUS_FINAIS:
+        trace.confirmado = True
+        if trace.aceito:
+            finalizar(trace)
+    return trace
+
+
+def finalizar(trace):
+    with _lock_abertos:
+        if trace.finalizado:
+            return
+        trace.finalizado = True
+        _abertos.pop(trace.signal_id, None)
+        _expirar()
+
+    if trace.aceito:
+        trace.registrar("total", trace.inicio)
+
+    with _lock_amostras:
+        for etapa, ms in trace.spans.items():
+            if etapa in _amostras:
+                _amostras[etapa].append(ms)
+
+    for etapa, ms in trace.spans.items():
+        latencia_etapa.observar(ms, etapa)
+
+    if trace.aceito:
+        log_event(
+            event_type="TRACE",
+            symbol=trace.symbol,
+            signal_id=trace.signal_id,
+            raw_message=trace.resumo()
+        )
+
+
+def _expirar():
+    # chamado com _lock_abertos
+    agora = time.monotonic()
+    while _abertos:
+        trace = next(iter(_abertos.values()))
+        if agora - trace.criado_em < TRACE_TTL:
+            break
+        _abertos.popitem(last=False)
+
+# ==========================================================
+# 🔄 RELATÓRIO PERIÓDICO
+# ==========================================================
+def _loop_relatorio(intervalo):
+    while True:
+        time.sleep(intervalo)
+        imprimir_resumo()
+
+
+def iniciar_relatorio_latencias(intervalo=900):
+    threading.Thread(target=_loop_relatorio, args=(intervalo,), daemon=True).start()